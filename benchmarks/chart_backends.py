@@ -0,0 +1,107 @@
+"""
+Line chart backends compared: import time, first render, render time
+percentiles, allocations and memory. Every backend runs in a fresh
+process, so the import time and the memory are its own.
+
+    python -m benchmarks.chart_backends --renders 50
+"""
+
+import argparse
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# matplotlib-reuse draws on one figure, as the render workers do
+BACKENDS = ("matplotlib", "matplotlib-reuse", "pillow")
+
+
+def _points(period: str) -> tuple[list, list]:
+    if period == "day":
+        start = datetime(2026, 10, 18)
+        dates = sorted(
+            start + timedelta(minutes=random.randint(0, 24 * 60 - 1)) for _ in range(20)
+        )
+        return dates, [random.randint(1, 10) for _ in dates]
+    dates = [datetime(2026, 10, 12) + timedelta(days=i) for i in range(7)]
+    return dates, [random.uniform(1, 10) for _ in dates]
+
+
+def measure(backend: str, period: str, renders: int) -> None:
+    """Runs in the child process, prints one row of the table."""
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started_at = time.perf_counter()
+    if backend == "pillow":
+        from src.vibe_tracker_bot.services.chart_pillow import draw_line_chart
+
+        def draw(*args):
+            return draw_line_chart(*args)
+
+    else:
+        from src.vibe_tracker_bot.services.chart_matplotlib import (
+            create_figure,
+            draw_chart,
+        )
+
+        figure = create_figure() if backend == "matplotlib-reuse" else None
+
+        def draw(*args):
+            return draw_chart(*args, figure)
+
+    import_time = time.perf_counter() - started_at
+
+    dates, values = _points(period)
+    args = (dates, values, "Mood Chart", period)
+    started_at = time.perf_counter()
+    size = len(draw(*args).getvalue())
+    first = time.perf_counter() - started_at
+
+    times = []
+    for _ in range(renders):
+        started_at = time.perf_counter()
+        draw(*args)
+        times.append(time.perf_counter() - started_at)
+    tracemalloc.start()
+    draw(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    p95 = statistics.quantiles(times, n=20)[18]
+    print(
+        f"{backend:17} {period:5} import {import_time * 1000:5.0f} ms  "
+        f"first {first * 1000:5.0f} ms  p50 {statistics.median(times) * 1000:5.1f} ms  "
+        f"p95 {p95 * 1000:5.1f} ms  alloc {peak / 2**20:4.1f} MB  "
+        f"RSS +{(rss - rss_before) / 1024:3.0f} MB  PNG {size / 1024:3.0f} KB",
+        flush=True,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--renders", type=int, default=50)
+    parser.add_argument("--backend", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--period", choices=("day", "week"), help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    if arguments.backend:
+        measure(arguments.backend, arguments.period, arguments.renders)
+    else:
+        for period in ("day", "week"):
+            for backend in BACKENDS:
+                subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "benchmarks.chart_backends",
+                        f"--renders={arguments.renders}",
+                        f"--backend={backend}",
+                        f"--period={period}",
+                    ],
+                    check=True,
+                )
@@ -0,0 +1,66 @@
+"""
+Shared setup of the benchmarks. They run against the database of DB_URL,
+with the same connection profile as the bot, so it must be migrated
+(`aerich upgrade`). Every run works with throwaway users and deletes them.
+
+Run from the repository root, e.g. `python -m benchmarks.import_history`.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from tortoise import Tortoise  # noqa: E402
+
+from src.vibe_tracker_bot.database.core import DB_URL, init_db  # noqa: E402
+from src.vibe_tracker_bot.database.models import User  # noqa: E402
+
+# Real user ids are positive, so a benchmark never touches a real user
+_FIRST_TELEGRAM_ID = -(10**12)
+
+
+@asynccontextmanager
+async def throwaway_users(count: int = 1, **fields) -> AsyncIterator[list[User]]:
+    """Creates users for one benchmark and deletes them with their logs."""
+    first = _FIRST_TELEGRAM_ID - random.randrange(10**9)
+    users = [
+        await User.create(telegram_id=first - i, **fields) for i in range(count)
+    ]
+    try:
+        yield users
+    finally:
+        await User.filter(id__in=[user.id for user in users]).delete()
+
+
+def report(name: str, count: int, seconds: float, unit: str = "rows") -> None:
+    rate = count / seconds if seconds else 0.0
+    print(f"{name}: {count} {unit} in {seconds:.2f}s, {rate:.0f} {unit}/s")
+
+
+class Timer:
+    def __enter__(self) -> "Timer":
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.seconds = time.perf_counter() - self.started_at
+
+
+def run(main: Callable[[], Awaitable[None]]) -> None:
+    """Runs a benchmark with the bot's database connections open."""
+
+    async def wrapper() -> None:
+        print(f"Database: {DB_URL.split('://', 1)[0]}")
+        await init_db()
+        try:
+            await main()
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(wrapper())
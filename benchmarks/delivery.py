@@ -0,0 +1,72 @@
+"""
+Reminder fan-out: sends one message to many chats through MessageDelivery
+against a fake Bot API with a fixed latency per request. Shows whether
+the workers keep up with the global rate limit and what the engine
+itself costs. No database or Telegram needed.
+
+    python -m benchmarks.delivery --recipients 10000 --rate 1000 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+
+from src.vibe_tracker_bot.services.delivery import (
+    DELIVERY_GLOBAL_RATE,
+    DELIVERY_WORKERS,
+    MessageDelivery,
+)
+
+
+class FakeSession(BaseSession):
+    """Answers every request after `latency` seconds."""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+        self.requests = 0
+
+    async def close(self) -> None:
+        pass
+
+    async def make_request(self, bot, method, timeout=None):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return True
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+
+async def main(args: argparse.Namespace) -> None:
+    session = FakeSession(args.latency_ms / 1000)
+    bot = Bot("42:BENCHMARK", session=session)
+    delivery = MessageDelivery(bot, workers=args.workers, global_rate=args.rate)
+
+    cpu_started_at = time.process_time()
+    report = await delivery.send(range(1, args.recipients + 1), "👋")
+    cpu = time.process_time() - cpu_started_at
+
+    # Upper bound from the limit and from workers waiting on the latency
+    ceiling = args.rate
+    if session.latency:
+        ceiling = min(ceiling, args.workers / session.latency)
+    print(
+        f"{report.sent} sent in {report.elapsed:.2f}s: {report.rate:.0f} msg/s, "
+        f"ceiling {ceiling:.0f} msg/s ({report.rate / ceiling:.0%})"
+    )
+    print(f"CPU: {cpu:.2f}s, {cpu / report.sent * 1e6:.0f} µs per message")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--recipients", type=int, default=10_000)
+    parser.add_argument("--rate", type=float, default=DELIVERY_GLOBAL_RATE)
+    parser.add_argument("--workers", type=int, default=DELIVERY_WORKERS)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,72 @@
+"""
+/import throughput and memory: generates a gzipped CSV like the one made
+by /export and imports it for a throwaway user, then imports it again to
+time the duplicate check.
+
+    python -m benchmarks.import_history --rows 200000 --chunk-size 1000
+    python -m benchmarks.import_history --trace-memory  # peak allocations
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import random
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from benchmarks.common import Timer, report, run, throwaway_users
+from src.vibe_tracker_bot.services import importer
+
+
+def write_history(path: Path, rows: int) -> None:
+    moment = datetime(2020, 1, 1, 8)
+    with gzip.open(path, "wb") as raw:
+        text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        writer = csv.writer(text)
+        writer.writerow(("time", "value", "note"))
+        for i in range(rows):
+            moment += timedelta(minutes=random.randint(30, 600))
+            note = f"заметка {i}" if i % 5 == 0 else ""
+            writer.writerow((moment.isoformat(" "), random.randint(1, 10), note))
+        text.close()
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "history.csv.gz"
+        write_history(path, args.rows)
+        print(f"File: {args.rows} rows, {path.stat().st_size / 2**20:.1f} MB gzipped")
+
+        async with throwaway_users(timezone="Europe/Berlin") as (user,):
+            # tracemalloc slows the import down several times
+            if args.trace_memory:
+                tracemalloc.start()
+            with Timer() as timer:
+                result = await importer.import_mood_logs(
+                    user, str(path), chunk_size=args.chunk_size
+                )
+            report(f"import, chunk {args.chunk_size}", result.imported, timer.seconds)
+            if args.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"Peak allocated: {peak / 2**20:.1f} MB")
+
+            with Timer() as timer:
+                again = await importer.import_mood_logs(
+                    user, str(path), chunk_size=args.chunk_size
+                )
+            report("re-import, all duplicates", again.duplicates, timer.seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=importer.IMPORT_CHUNK_SIZE)
+    parser.add_argument("--trace-memory", action="store_true")
+    arguments = parser.parse_args()
+    run(lambda: main(arguments))
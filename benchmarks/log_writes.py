@@ -0,0 +1,55 @@
+"""
+/log write throughput: a burst of concurrent logs (as after the evening
+reminder) written one transaction each, then through the group-commit
+MoodLogWriter.
+
+    python -m benchmarks.log_writes --logs 2000 --users 50
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.common import Timer, report, run, throwaway_users
+from src.vibe_tracker_bot.services.log_writer import MoodLogWriter
+from src.vibe_tracker_bot.services.summaries import record_mood_log
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with throwaway_users(args.users, timezone="Europe/Moscow") as users:
+
+        def burst(write):
+            return asyncio.gather(
+                *(
+                    write(users[i % len(users)], 1 + i % 10, None)
+                    for i in range(args.logs)
+                )
+            )
+
+        with Timer() as timer:
+            await burst(record_mood_log)
+        report("one transaction per log", args.logs, timer.seconds, "logs")
+
+        writer = MoodLogWriter(batch_delay_ms=args.delay_ms)
+        writer.start()
+        try:
+            with Timer() as timer:
+                await burst(writer.write)
+        finally:
+            await writer.stop()
+        report("group commit", args.logs, timer.seconds, "logs")
+        stats = writer.stats()
+        print(
+            f"Batches: {stats['batches']}, "
+            f"avg size {stats['batch_size_avg']:.1f}, max {stats['batch_size_max']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--logs", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--delay-ms", type=int, default=5)
+    arguments = parser.parse_args()
+    run(lambda: main(arguments))
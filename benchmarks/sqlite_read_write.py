@@ -0,0 +1,78 @@
+"""
+Reads under write load: /log writers and /stats readers run at the same
+time, first with reads on the separate read-only connection, then with
+reads sharing the writer's connection. Compare SQLite profiles by setting
+SQLITE_* variables, e.g. SQLITE_SYNCHRONOUS=FULL.
+
+    python -m benchmarks.sqlite_read_write --seconds 5 --writers 8 --readers 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from unittest import mock
+
+from tortoise import Tortoise
+
+from benchmarks.common import run, throwaway_users
+from src.vibe_tracker_bot.database import core
+from src.vibe_tracker_bot.services import stats
+from src.vibe_tracker_bot.services.summaries import record_mood_log
+
+
+async def load(users, args) -> tuple[int, list[float]]:
+    deadline = time.perf_counter() + args.seconds
+    written = 0
+    read_times: list[float] = []
+
+    async def writer(user) -> None:
+        nonlocal written
+        while time.perf_counter() < deadline:
+            await record_mood_log(user, 5, None)
+            written += 1
+
+    async def reader(user) -> None:
+        while time.perf_counter() < deadline:
+            started_at = time.perf_counter()
+            await stats.get_weekly_stats(user)
+            read_times.append(time.perf_counter() - started_at)
+
+    await asyncio.gather(
+        *(writer(users[i % len(users)]) for i in range(args.writers)),
+        *(reader(users[i % len(users)]) for i in range(args.readers)),
+    )
+    return written, read_times
+
+
+def print_result(name: str, seconds: float, written: int, read_times: list) -> None:
+    cuts = statistics.quantiles(read_times, n=100)
+    print(
+        f"{name:22}: {written / seconds:6.0f} writes/s, "
+        f"{len(read_times) / seconds:6.0f} reads/s, read p50 "
+        f"{cuts[49] * 1000:6.2f} ms, p99 {cuts[98] * 1000:6.2f} ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    if not core._is_sqlite(core.DB_URL):
+        print("Not SQLite: reads and writes share the pool either way")
+    async with throwaway_users(args.writers + args.readers) as users:
+        written, read_times = await load(users, args)
+        print_result("separate read conn", args.seconds, written, read_times)
+
+        default = Tortoise.get_connection("default")
+        with mock.patch.object(stats, "get_read_db", lambda: default):
+            written, read_times = await load(users, args)
+        print_result("shared conn", args.seconds, written, read_times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    arguments = parser.parse_args()
+    run(lambda: main(arguments))
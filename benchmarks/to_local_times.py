@@ -0,0 +1,60 @@
+"""
+UTC -> local time conversion of log timestamps, as done for charts and
+summaries: astimezone per item against the batch `to_local_times`, which
+looks offsets up by DST segment. The timestamps are spread over a year,
+so the batch crosses both transitions. No database needed.
+
+    python -m benchmarks.to_local_times --count 100000 --tz America/New_York
+"""
+
+import argparse
+import random
+import time
+from datetime import UTC, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from src.vibe_tracker_bot.services.timezones import to_local_times
+
+
+def _timestamps(count: int) -> list[datetime]:
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    year = 365 * 24 * 60 * 60
+    return [start + timedelta(seconds=random.randrange(year)) for _ in range(count)]
+
+
+def _per_item(timestamps: list[datetime], tz: ZoneInfo) -> list[datetime]:
+    return [ts.astimezone(tz).replace(tzinfo=None) for ts in timestamps]
+
+
+def main(count: int, tz_name: str) -> None:
+    tz = ZoneInfo(tz_name)
+    timestamps = _timestamps(count)
+    naive = np.array([ts.replace(tzinfo=None) for ts in timestamps], "datetime64[us]")
+    variants = (
+        ("astimezone per item", lambda: _per_item(timestamps, tz)),
+        ("to_local_times", lambda: to_local_times(timestamps, tz).tolist()),
+        ("to_local_times (datetime64 in)", lambda: to_local_times(naive, tz)),
+    )
+
+    expected = np.array(_per_item(timestamps, tz), "datetime64[us]")
+    for name, convert in variants:
+        started_at = time.perf_counter()
+        result = convert()
+        seconds = time.perf_counter() - started_at
+        assert np.array_equal(np.array(result, "datetime64[us]"), expected), name
+        print(
+            f"{name:31} {count} timestamps in {seconds * 1000:7.1f} ms, "
+            f"{count / seconds:10.0f}/s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--tz", default="Europe/Berlin")
+    arguments = parser.parse_args()
+    main(arguments.count, arguments.tz)
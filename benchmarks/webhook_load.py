@@ -0,0 +1,156 @@
+"""
+Webhook load test: posts updates like Telegram does and reports the
+latency percentiles of the answers, and of the processing when the
+server is started here.
+
+Without --url a local server is started with BoundedRequestHandler and a
+dispatcher whose handler takes --handler-ms, so the numbers show the cost
+of the webhook layer and the effect of UPDATE_CONCURRENCY. With --url the
+updates go to a running bot in webhook mode; use chat ids of test users.
+
+    python -m benchmarks.webhook_load --requests 5000 --concurrency 100
+    python -m benchmarks.webhook_load --url http://127.0.0.1:8080/webhook \\
+        --secret change-me --chat-id 123456
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+from aiogram import Bot, Dispatcher, types
+from aiogram.client.session.base import BaseSession
+from aiohttp import ClientSession, TCPConnector, web
+
+from src.vibe_tracker_bot.webhook import UPDATE_CONCURRENCY, BoundedRequestHandler
+
+_update_ids = itertools.count(1)
+
+
+class _NoApiSession(BaseSession):
+    """The local handler never calls the Bot API."""
+
+    async def close(self) -> None:
+        pass
+
+    async def make_request(self, bot, method, timeout=None):
+        raise RuntimeError("The benchmark handler must not call the Bot API")
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+
+def make_update(chat_id: int, text: str) -> dict:
+    sender = {"id": chat_id, "is_bot": False, "first_name": "Load"}
+    return {
+        "update_id": next(_update_ids),
+        "message": {
+            "message_id": next(_update_ids),
+            "from": sender,
+            "chat": {"id": chat_id, "first_name": "Load", "type": "private"},
+            "date": int(time.time()),
+            "text": text,
+        },
+    }
+
+
+def percentiles(name: str, seconds: list[float]) -> None:
+    if len(seconds) < 2:
+        return
+    cuts = statistics.quantiles(seconds, n=100)
+    print(
+        f"{name}: p50 {cuts[49] * 1000:.1f} ms, p90 {cuts[89] * 1000:.1f} ms, "
+        f"p99 {cuts[98] * 1000:.1f} ms, max {max(seconds) * 1000:.1f} ms"
+    )
+
+
+async def start_local_server(args, sent_at: dict, processed: list) -> web.AppRunner:
+    dispatcher = Dispatcher()
+
+    @dispatcher.message()
+    async def handle(message: types.Message) -> None:
+        await asyncio.sleep(args.handler_ms / 1000)
+        processed.append(time.perf_counter() - sent_at[message.message_id])
+
+    app = web.Application()
+    BoundedRequestHandler(
+        dispatcher=dispatcher,
+        bot=Bot("42:BENCHMARK", session=_NoApiSession()),
+        secret_token=args.secret,
+        max_concurrency=args.update_concurrency,
+    ).register(app, path="/webhook")
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    return runner
+
+
+async def main(args: argparse.Namespace) -> None:
+    sent_at: dict[int, float] = {}
+    processed: list[float] = []
+    runner = None
+    url = args.url
+    if not url:
+        runner = await start_local_server(args, sent_at, processed)
+        url = f"http://127.0.0.1:{args.port}/webhook"
+
+    headers = {"X-Telegram-Bot-Api-Secret-Token": args.secret}
+    answers: list[float] = []
+    errors = 0
+
+    async def post(session: ClientSession, update: dict) -> None:
+        nonlocal errors
+        started_at = time.perf_counter()
+        sent_at[update["message"]["message_id"]] = started_at
+        async with session.post(url, json=update, headers=headers) as response:
+            await response.read()
+        answers.append(time.perf_counter() - started_at)
+        if response.status != 200:
+            errors += 1
+
+    updates = [make_update(args.chat_id, args.text) for _ in range(args.requests)]
+    queue: asyncio.Queue = asyncio.Queue()
+    for update in updates:
+        queue.put_nowait(update)
+
+    async def client(session: ClientSession) -> None:
+        while not queue.empty():
+            await post(session, queue.get_nowait())
+
+    started_at = time.perf_counter()
+    connector = TCPConnector(limit=args.concurrency)
+    async with ClientSession(connector=connector) as session:
+        await asyncio.gather(*(client(session) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    if runner:
+        while len(processed) < len(updates):
+            await asyncio.sleep(0.01)
+        total = time.perf_counter() - started_at
+        await runner.cleanup()
+
+    print(
+        f"{len(updates)} updates in {elapsed:.2f}s: "
+        f"{len(updates) / elapsed:.0f} req/s, {errors} errors"
+    )
+    percentiles("Answer", answers)
+    if runner:
+        print(f"All processed after {total:.2f}s")
+        percentiles("Processed", processed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--url", help="webhook of a running bot")
+    parser.add_argument("--secret", default="benchmark")
+    parser.add_argument("--chat-id", type=int, default=1)
+    parser.add_argument("--text", default="/stats")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--handler-ms", type=float, default=20)
+    parser.add_argument("--update-concurrency", type=int, default=UPDATE_CONCURRENCY)
+    asyncio.run(main(parser.parse_args()))
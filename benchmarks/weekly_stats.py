@@ -0,0 +1,122 @@
+"""
+/stats for the last 7 days, three ways: every MoodLog of the week loaded
+as a model (the original code), SQL aggregates over the logs (the first
+rewrite: one aggregate query plus a GROUP BY for the latest moment of the
+extreme values), and the daily summaries that get_weekly_stats reads now.
+Runs for 10, 1k and 100k logs in the week of one user.
+
+    python -m benchmarks.weekly_stats --sizes 10 1000 --calls 200
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from tortoise.functions import Count, Max, Min, Sum
+
+from benchmarks.common import run, throwaway_users
+from src.vibe_tracker_bot.database.core import get_read_db
+from src.vibe_tracker_bot.database.models import MoodLog
+from src.vibe_tracker_bot.services.stats import get_weekly_stats
+from src.vibe_tracker_bot.services.summaries import rebuild_user_summaries
+from src.vibe_tracker_bot.services.timezones import get_timezone
+
+SIZES = (10, 1_000, 100_000)
+
+
+async def load_every_log(user, week_start):
+    logs = await MoodLog.filter(user=user, created_at__gte=week_start).order_by(
+        "-created_at"
+    )
+    values = [log.value for log in logs]
+    max_val, min_val = max(values), min(values)
+    best = next(log for log in logs if log.value == max_val)
+    worst = next(log for log in logs if log.value == min_val)
+    user_tz = get_timezone(user.timezone)
+    return (
+        sum(values) / len(values),
+        best.created_at.astimezone(user_tz),
+        worst.created_at.astimezone(user_tz),
+    )
+
+
+async def aggregate_logs(user, week_start):
+    base_query = MoodLog.filter(user=user, created_at__gte=week_start).using_db(
+        get_read_db()
+    )
+    totals = (
+        await base_query.annotate(
+            total=Sum("value"),
+            min_val=Min("value"),
+            max_val=Max("value"),
+            count=Count("id"),
+        ).values("total", "min_val", "max_val", "count")
+    )[0]
+    min_val, max_val = totals["min_val"], totals["max_val"]
+    # Most recent moment of the extreme values (at most 2 rows)
+    extremes = dict(
+        await base_query.filter(value__in=[min_val, max_val])
+        .group_by("value")
+        .annotate(last=Max("created_at"))
+        .values_list("value", "last")
+    )
+    user_tz = get_timezone(user.timezone)
+    return (
+        totals["total"] / totals["count"],
+        extremes[max_val].astimezone(user_tz),
+        extremes[min_val].astimezone(user_tz),
+    )
+
+
+async def read_summaries(user, week_start):
+    return await get_weekly_stats(user)
+
+
+async def measure(size: int, calls: int) -> None:
+    now = datetime.now(timezone.utc)
+    week_start = now - timedelta(days=7)
+    async with throwaway_users(timezone="Europe/Moscow") as (user,):
+        step = timedelta(days=7) / size
+        await MoodLog.bulk_create(
+            [
+                MoodLog(user=user, value=1 + i % 10, created_at=week_start + step * i)
+                for i in range(size)
+            ],
+            batch_size=1000,
+        )
+        await rebuild_user_summaries(user)
+        print(f"{size} logs in the week")
+
+        for name, query in (
+            ("every log as a model", load_every_log),
+            ("SQL aggregates", aggregate_logs),
+            ("daily summaries", read_summaries),
+        ):
+            times = []
+            for _ in range(calls):
+                started_at = time.perf_counter()
+                await query(user, week_start)
+                times.append(time.perf_counter() - started_at)
+            print(
+                f"  {name:21}: p50 {statistics.median(times) * 1000:8.2f} ms, "
+                f"max {max(times) * 1000:8.2f} ms"
+            )
+
+
+async def main(args: argparse.Namespace) -> None:
+    for size in args.sizes:
+        # Loading 100k models takes seconds, fewer calls keep the run short
+        await measure(size, max(3, min(args.calls, 100_000 // size)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument(
+        "--calls", type=int, default=200, help="calls per variant, fewer for 100k"
+    )
+    arguments = parser.parse_args()
+    run(lambda: main(arguments))
@@ -4,6 +4,11 @@ RUN_IN_TRANSACTION = True
 
 
 async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        return """
+        ALTER TABLE "users" ADD "reminder_morning_time" TIMETZ DEFAULT '09:00:00+00';
+        ALTER TABLE "users" ADD "reminder_evening_time" TIMETZ DEFAULT '20:00:00+00';
+        ALTER TABLE "users" ADD "reminders_enabled" BOOL NOT NULL DEFAULT False;"""
     return """
         ALTER TABLE "users" ADD "reminder_morning_time" TIME DEFAULT '09:00:00';
         ALTER TABLE "users" ADD "reminder_evening_time" TIME DEFAULT '20:00:00';
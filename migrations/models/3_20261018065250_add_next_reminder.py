@@ -0,0 +1,45 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        return """
+        ALTER TABLE "users" ADD "next_reminder_at" TIMESTAMPTZ;
+        CREATE INDEX "idx_users_next_re_174a11" ON "users" ("next_reminder_at");"""
+    return """
+        ALTER TABLE "users" ADD "next_reminder_at" TIMESTAMP;
+        CREATE INDEX "idx_users_next_re_174a11" ON "users" ("next_reminder_at");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_users_next_re_174a11";
+        ALTER TABLE "users" DROP COLUMN "next_reminder_at";"""
+
+
+MODELS_STATE = (
+    "eJztmf1v2jgYx/8VlJ86aVfRAC2bTicBpRu3Aqc27KadTpZJTIia2Cxx1rJe//fzY/LqJB"
+    "S60pWq0tTB82Lsj9++tm81j1nEDQ6HjFnnzNbe1241ij0iPqiutzUNLxapAwwcT90ollnI"
+    "Zba04mnAfWxy4ZhhNyDCZJHA9J0FdxgVVhq6LhiZKQIdaqemkDrfQoI4swmfE184/vlXmB"
+    "1qkRsSxF8XV2jmENfKVdex4LelHfHlQtomk8HpmYyEn5sik7mhR9PoxZLPGU3Cw9CxDiEH"
+    "fDahxMecWJlmQC2jJsemVY2FgfshSapqpQaLzHDoAgzt91lITWBQk78Ef5p/RFXLhCE0Gh"
+    "vosm8gpG3BzmQUuDuUA6jbu1W5KRBp1eAHeh87FweN4zcSAQu47UunxKXdyUTM8SpVQk8p"
+    "f8euaG0B9IDycs5JvIJa1PIhkGNDSjkdYTG/mNAOmIr6iv9+04+aJ81247jZFiGyoonlZA"
+    "32wciQdFOalPESmAa5qaAZxyswRRU3gBmNx+fCcg0oo//FgJK9IPjmgmH0uXMhB+2w80WO"
+    "Wm8Zec7How9xOBOLzmo5GvXOx12FtekTYIMwLxI/FR7ueKScej5TYW9FqYfxh30c1qKB1p"
+    "i6y2iUrOuawbB/aXSGf+X657Rj9MGj5/omth6sVpq0e5JCan8PjI81+Fr7Oh711fUoiTO+"
+    "alAnHHKGKLtG2MossLE1ppbr9TAgPtpua8ikPOb+8Hyn2z3bAey4s6vS3QBQFdGeMZ84Nv"
+    "1ElhLwQNQDU7Ns4YokxiQqZj+RptZ0TPr4OpEo2QEl2i5aTLhsfa9z2euc9jVJeIrNq2vs"
+    "WyiHGjxMZ4oliS26PN1TLZhiW8KBVkCds9RLBF/cG9VqDxr0qvReuNLjYpzaPvZKV8+uY1"
+    "dKPiXxcYTf/cx3L/ve6XqjcaLXG8ftVvPkpNWuJ/qv6FonBLuDD6AFc3tiURzCLJOfC/R7"
+    "c+xX711xzksQiWL1ukEuoTafi696q7WGaqwRRZSiN2L5qK98r7rwVRf6xAOofoAIBfplax"
+    "xjLsG0vO9L85UhMBUF7KrXE8vT7ifd8fg818PdgXr0mgy7/YuDI9m1IsjhFctbTBB5zKei"
+    "OiieJMphuHL6VRZQNRM3nIUPWQK1+rv39br49wv2eJgNuflVOrfSNbBdUAOQAFOpvH/Id/"
+    "Jz/aMW8Cv6R6+/tP4BWj8Y3UoeZHMeJA8etFZpE6O3K+55gdCqb6APWvVK9OBSbujIDUfJ"
+    "SN5eI5TlP4JSuH8OPKU+3hNdEEMqCIPCDUf1gTx7Ws48eSjKIUo9+3RBXCxpFru9+LyyZ+"
+    "qw6vrjbpeXFh3iO+ZcK7m2iDxv111c4DTm2dxcVJ6jNz0+RzP9uZ+ef/LRZM2TlFDh0RTb"
+    "dB/MpDzdNrjfx2SYVFsQjsJfIN2j+iYiQ0RV0pU+5RKCUU5oibr483I8qrh9SFNUQeGYvP"
+    "ZfzXWCfXxjXQMXYKx/F1SfABWBAAV0y540nvIG/u5/IxKxQA=="
+)
@@ -0,0 +1,43 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        return """
+        ALTER TABLE "users" ADD "is_blocked" BOOL NOT NULL DEFAULT False;"""
+    return """
+        ALTER TABLE "users" ADD "is_blocked" INT NOT NULL DEFAULT 0;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "users" DROP COLUMN "is_blocked";"""
+
+
+MODELS_STATE = (
+    "eJztmf1v2jgYx/8VlJ86aVfRAC2bTicBpRu3Aqc27KadTpZJTIia2Cxx1rJe//fzY/LqJB"
+    "S60pWq0tTB8+LYn8cvX5xbzWMWcYPDIWPWObO197VbjWKPiA+q621Nw4tF6gADx1M3imUW"
+    "cpktrXgacB+bXDhm2A2IMFkkMH1nwR1GhZWGrgtGZopAh9qpKaTOt5AgzmzC58QXjn/+FW"
+    "aHWuSGBPHXxRWaOcS1ct11LHi2tCO+XEjbZDI4PZOR8LgpMpkbejSNXiz5nNEkPAwd6xBy"
+    "wGcTSnzMiZUZBvQyGnJsWvVYGLgfkqSrVmqwyAyHLsDQfp+F1AQGNfkk+NP8I+paJgyh0d"
+    "hAl30DIW0LdiajwN2hHEDd3q3aTYFIqwYP6H3sXBw0jt9IBCzgti+dEpd2JxMxx6tUCT2l"
+    "/B27YrQF0APKyzkn8Qpq0cuHQI4NKeV0hsX8YkI7YCr6K/77TT9qnjTbjeNmW4TIjiaWkz"
+    "XYByND0k1pUsZLYBrkpoJmHK/AFF3cAGY0H58LyzWgjP4XA1r2guCbC4bR586FnLTDzhc5"
+    "a71l5Dkfjz7E4UxsOqvtaNQ7H3cV1qZPgA3CvEj8VHi445Fy6vlMhb0VpR7GH/ZxWosBWm"
+    "PqLqNZsq40g2H/0ugM/8rV57Rj9MGj52oTWw9WO01anqSR2t8D42MNvta+jkd9dT9K4oyv"
+    "GvQJh5whyq4RtjIbbGyNqeWqHgbER9sdDZmUxzwfnu9yu+c4gBN3dlV6GgCqItoz5hPHpp"
+    "/IUgIeiH5gapZtXJHEmETN7CfS1JrOSR9fJxIlO6HE2MWICZej73Uue53TviYJT7F5dY19"
+    "C+VQg4fpTLEksUWXp3uqBVNsSzgwCuhzlnqJ4IurUa32YECvSu+FKz0u5qntY6909+w6dq"
+    "XkUxIfR/jdz3z3su+drjcaJ3q9cdxuNU9OWu16ov+KrnVCsDv4AFowdyYWxSGsMvm5QL83"
+    "x3712RXnvASRKHavG+QSavO5+Kq3WmuoxhpRRCl6I5aP+sr3qgtfdaFPPIDqB4hQoF+2xz"
+    "HmEkzLa1+ar0yBqWhgV1VPLE97nnTH4/NchbsD9afXZNjtXxwcydKKIIdXbG8xQeQxn4ru"
+    "oHiRKD+GK5dfZQNVK3HDVfiQLVCrv3tfr4t/v+CMh9WQW1+layvdA9sFNQAJsJTK60O+k5"
+    "+rj9rAr6iPXn9p9QFaPxjdSh5kcx4kDx60V2kTo7cr7nmB0KpvoA9a9Ur04FJu6MgNR8lM"
+    "3l4jlOU/glK4fw08pT7eE10QQ1orDJwATV1mXm2tCPKJr1LgHilQuFWqvgTJ3lBkXjMptY"
+    "lSzz5dEBfLcRbLUHyltWeKvOrK6W6XF0Ud4jvmXCu5Koo8b9ddFuE05tncFlXeXWx6ZRHt"
+    "rs/9xuInX1SteQ0ofvlES2xT7ZFJeTrpsd9XE7CotiAchb9Aukf1TYSdiKqkK33KxQ+jnN"
+    "ASRffn5XhUceOTpqgizjF57b+a6wT7+F57DVyAkTvmC+9i1deuiiiDBrrbHfiPf5jd/Q94"
+    "YCeW"
+)
@@ -0,0 +1,75 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        return """
+        CREATE TABLE IF NOT EXISTS "reminder_outbox" (
+    "id" UUID NOT NULL PRIMARY KEY,
+    "slot" VARCHAR(16) NOT NULL,
+    "scheduled_utc" TIMESTAMPTZ NOT NULL,
+    "status" VARCHAR(7) NOT NULL,
+    "claim_token" UUID,
+    "created_at" TIMESTAMPTZ NOT NULL,
+    "updated_at" TIMESTAMPTZ NOT NULL,
+    "user_id" UUID NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_reminder_ou_user_id_f3596a" UNIQUE ("user_id", "slot", "scheduled_utc")
+);
+CREATE INDEX IF NOT EXISTS "idx_reminder_ou_status_ea79b9" ON "reminder_outbox" ("status", "scheduled_utc");
+COMMENT ON COLUMN "reminder_outbox"."status" IS 'PENDING: pending\nSENDING: sending\nSENT: sent\nFAILED: failed\nEXPIRED: expired';
+COMMENT ON TABLE "reminder_outbox" IS 'One row per reminder occurrence (user + slot + scheduled moment).';"""
+    return """
+        CREATE TABLE IF NOT EXISTS "reminder_outbox" (
+    "id" CHAR(36) NOT NULL PRIMARY KEY,
+    "slot" VARCHAR(16) NOT NULL,
+    "scheduled_utc" TIMESTAMP NOT NULL,
+    "status" VARCHAR(7) NOT NULL /* PENDING: pending\nSENDING: sending\nSENT: sent\nFAILED: failed\nEXPIRED: expired */,
+    "claim_token" CHAR(36),
+    "created_at" TIMESTAMP NOT NULL,
+    "updated_at" TIMESTAMP NOT NULL,
+    "user_id" CHAR(36) NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_reminder_ou_user_id_f3596a" UNIQUE ("user_id", "slot", "scheduled_utc")
+) /* One row per reminder occurrence (user + slot + scheduled moment). */;
+CREATE INDEX IF NOT EXISTS "idx_reminder_ou_status_ea79b9" ON "reminder_outbox" ("status", "scheduled_utc");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "reminder_outbox";"""
+
+
+MODELS_STATE = (
+    "eJztW2lv2zgQ/SuEPiXYNHCcw2mxKGAnTuttYheJshs0KQRaYmzCEulKVI52+9+XQ+uwKM"
+    "lHbnsNFLE0nKHINyTnccj+MjzuEDfYPOHcOeY94wP6ZTDsEfmgF20gAw+HaQEIBO66kS53"
+    "LJf3lBR3A+FjW8iCa+wGRIocEtg+HQrKmZSy0HVByG2pSFkvFYWM/giJJXiPiD7xZcHldy"
+    "mmzCF3JIhfhwPrmhLXyTSXOvBtJbfE/VDJzs9bh0dKEz7XtWzuhh5LtYf3os9Zoh6G1NkE"
+    "GyjrEUZ8LIgz1g1oZdTlWDRqsRQIPyRJU51U4JBrHLoAhvHndchswACpL8GfnY9R08bULK"
+    "vdMa2zpmlZxhzY2ZwB7pQJAOrX71G9KSBKasAHDj7XT9e299YVBDwQPV8VKriM38oQCzwy"
+    "VaCnKN9gV/Y2B3SLiWKcE30NatnKh4AcC1KU0xEW4xcj9AyYyvbKn3fVrZ3azv723s6+VF"
+    "ENTSS1CbC32qZCN0WTcVEApknuStCM9TUwZRNnADMaj28FywlAmc0LE2r2guCHC4L23/VT"
+    "NWhP6hdq1Hr3Uclxp/0pVudy0RktR+2D405Dw9r2CWBjYZFH/FCWCOqRYtSzlhr2TmS6GT"
+    "8s4rCWHXQ6zL2PRskk17ROmmdm/eRrxj+HdbMJJdWMb2Lp2milSd2TVIL+aZmfEbyib512"
+    "U1+PEj3zmwFtwqHgFuO3FnbGFthYGqOW8XoYEN+aLzSMmTxlfHi7021KOICIez0ojAYAVR"
+    "7aI+4T2mNfyL0CuCXbgZldtHBFFOM8qmYxIU2l6Zj08W1CUcYHlOy77DERqvcH9bOD+mHT"
+    "UAh3sT24xb5jZaCGEl7lmiTRzRd5VU+XYIZ7ChzoBbQ5Qv2UeACc3wlFl98VUT9NYyID9C"
+    "Ndi6fK03ig0WEE+fwWDYmP4goQt+3Q94kcMWgNoEN/oMDlAn7sPnFClzjI4x5hYn3T0Bz1"
+    "+BqvmNknaDTEUOpa5OEBCRBhUhwS+TFEHeINZTxmYgNh5iDbxdSDAgwNuGJrQ8IceH/3EQ"
+    "Wjx3VEA1ksa3UoQIBdFA4hbmyggCN+Q3xXAgw2gtqD4Ipx6MTQpTYOECOyHEncKfxKdowC"
+    "6a20k+KW2kQBUkCiL5OpCh1Xv3HPrVDYxneNZV9KToFFGJRorgj4qxHw2H9ZnA/62C/GOd"
+    "Z/EGV8ayuuXMzuLJewnujL1629CRDHjHFLJx8xl6yqoixHzA71OWlizngJmeKCMMMYk4nU"
+    "MF3h8nOpyUIvR16y3k6sX25mGVFImXPFMr4224et9qcPKLK/YmexJBiTmOpVXLGjeuu4eQ"
+    "gtoHI4X7HmxdfWKQjI3ZD6xNGj7iyTddLGOJ6rtdKpWtNnqoq2MsQNCJsn6mhmjwg/i7Ob"
+    "nhpsVnvk//keWXHQh3g9a7ny+lvxekH8i1q/yoysMiOrzMiUzIhCvSAfEnujPAsCHVqdgS"
+    "35FlzIcdrzsVe4ejZor/QwTDN8miOx6Zg//4HY+2p1e7tWrWzv7e/u1Gq7+5XkZCxfNGkn"
+    "0Gh9glOyTEzMH5vBLFPPOfTL8yDjNstwfJbdXVV3d2fYX0mt0h2WKlvtBpabF86yG4gTyo"
+    "FFGKBftMZx7hLMin1faK8Nga6s4Lm8nkheNp40Op3jjIcbLf1Q+vyk0Txd21KulUpUlCxv"
+    "yVGKx30mm2PFk0S7JlA6/UorKJuJM87ChyyBRuX9h0pF/nuFGA+zITO/CudWugbu59gAGM"
+    "BUKvYPuSGP849ewWv4p1pZNv8AWj85m4sejNu8YEL33Dx4LtyzBGG3MgM/2K2UQg9F2t0l"
+    "ciesZCTPzxGK7J+AKUyfAy/JjxeEF8x0XkIDq+tyezA3I8garqjAFCqQyyqVJ0HGMxRjF3"
+    "A130SmR19OiYtVP/NuyF/2XTBGXpZyKo7c6SWVh2OVvx2zLJA9Z26tTnxq942C7FpUsjEp"
+    "v4ZTnTeTYCtN98ya5YkC0ltP8jzy1vOEO+VysxjNtFnp2pjJEl5seZZsDkyqORCO1JcQ3a"
+    "3KLFxYapVfHKrk2LD8IlwFzCP811mnXZIkS0103kttgf5FLg0W8T9JTAAXwMgwo9zFfv0O"
+    "v8ZjoYLGfBzp6YPZ7/8AZEweCA=="
+)
@@ -0,0 +1,48 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX "idx_mood_logs_user_id_c365f1" ON "mood_logs" ("user_id", "created_at");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_mood_logs_user_id_c365f1";"""
+
+
+MODELS_STATE = (
+    "eJztW/tPGzkQ/les/YnqKArhEVqdKiUQ2lwhQbDcVS3Vytk1iZVdO931QijH/34eZ9+PPI"
+    "AAyUWqSDKe8drfeDyfZ917zeEWsb2tU86tE97TPqJ7jWGHyC/Zpk2k4eEwbgCBwF070OWW"
+    "YfOekuKuJ1xsCtlwjW2PSJFFPNOlQ0E5k1Lm2zYIuSkVKevFIp/RXz4xBO8R0SeubPjxU4"
+    "ops8iIePDzh+Z7xDWoBU8yXYIFsQwstJ+gNxwY15TYVmoeY1UlN8TdUMkuL1tHx0oTxtE1"
+    "TG77Dou1h3eiz1mk7vvU2gIbaOsRRlx4bGJ+MPwAi1A0nooUCNcn0RysWGCRa+zbgJL257"
+    "XPTAAHqSfBn91PwdASaobR7ujGRVM3DG0OUE3OwCGUCUDw/mHcbwyIkmrwgMMv9fONnf13"
+    "CgLuiZ6rGhVc2oMyxAKPTZU3YpRvsC1nmwO6xUQxzpF+Bmo5yseAHApilOOlF+IXIrQATO"
+    "V45cf76vZubfdgZ3/3QKqogUaS2gTYW21doRujybgoAFMnoxI0Q/0MmHKIM4AZrMe3guUE"
+    "oPTmNx16djzvlw2C9t/1c7VoT+vf1Kp17oKWk077c6jO5W403qfahyedRgbrxCaSQ/xItg"
+    "jqkGLU05YZ7K3AdCv8sozLWk7Q6jD7Llglk1zTOm1e6PXTs5R/jup6E1qqKd+E0o3xThO7"
+    "J+oE/dPSvyD4ib532s3sfhTp6d81GBP2BTcYvzWwldhgQ2mIWsrriSwya2pImDxnfni74T"
+    "YlHUDGvR4UZgOAKg/tMXcJ7bGv5E4B3JLjwMws2rgC7nEZdLOckMbSeE26+DaiKMkFJecu"
+    "Z0yEmv1h/eKwftTUFMJdbA5usWsZKaihhVd5RhLp5pucqpOVYIZ7ChyYBYw5QP2cOACc2/"
+    "FFl4+KOGFGYyI1dANdg8fK0wii1mEEufwWDYmLwg4QN03fdYlcMWgDoEN/IM/mAj7MPrF8"
+    "m1jI4Q5h4t2WlnHU03u8YnqfoPESQ7FrkYMHxEOESbFP5MMQtYgzlPmYiU2EmYVMG1MHGj"
+    "AM4IptDAmz4Pf7T8gbf32HqCebZa8WBQiwjfwh5I1N5HHEb4hrS4DBRlBz4F0xDpMY2tTE"
+    "HmJEtiOJO4VPSZuRJ70VT1LcUpMoQArY9Y8oVGHi6jOcueELc0yrU/RbxqzwvRLNNQF/NQ"
+    "Ie+i+N82Efu8U4h/qPooxvbceVm9nIsAnrib78ub0/AeKQMW5nyUfIJauqKc0R00t9TpqY"
+    "M15BprgkzDDEZCI1jHe4fCw1me/kyEva25H1y0WWFqSUOXcs7azZPmq1P39Egf0VuwglXk"
+    "Kiq5/iih3XWyfNIxgBlcv5ijW/nbXOQUBGQ+oSK5t1ZwnWSQfjMFZrpaFay0aqyrYyxQ0I"
+    "myfrZMyekH6W5zQ9Ndmsz8j/8zOy4qCP8Xracu31t+L1gvwXjH5dGVlXRtaVkSmVEYV6QT"
+    "0k9EZ5FQQmtPiXY+sj+KsewYVcpz0XO4W7Z4P2Sl+GZQyf55XYdMwX/0LsQ7W6s1OrVnb2"
+    "D/Z2a7W9g0r0ZizfNOkk0Gh9hrdkqZyYf20GUaa+59Avr4MkbVbh9Vn6dFXd25vhfCW1Sk"
+    "9Yqm19GlhtXjjLaSAsKHsGYYB+0R7HuU0wK/Z9oX1mCXRlB4vyeiR52XzS6HROUh5utLIv"
+    "pS9PG83zjW3lWqlERcn2Fr1KcbjL5HCMMEgy1wRKw6+0g7JInDEKH7MFapUPHysV+e8Vcj"
+    "xEQyq+CmMr3gMPcmwADCCUiv1DbsjT/JPt4DX8U62smn8Ard+czUUPkjYvWNC91A8XhXua"
+    "IOxVZuAHe5VS6KEpc3eJjIQRreT5OUKR/TMwhekx8JL8eEl4wUzvS6hndG1uDuZmBGnDNR"
+    "WYQgVyVaXyIkiyQpG4mZvxTWB6/PWc2FjNM++G/C3gJWPkZSWn4swdX1J5PFb52zGrAtki"
+    "a2t14lKzrxVU14KWzUn1NRzrvJkCW2m5Z9YqT5CQ3nqR54m3nifcKZeHxSDSZqVrCZMVvN"
+    "iykGoOBNUcCAfqK4judmUWLiy1yi8OVXJsWD4RrgLmEf7rotMuKZLFJlneS02B/kU29Zbx"
+    "P0lMABfASDGj3MX+7B3+DI+FDhrzcaTnT2YP/wGu/iaL"
+)
@@ -0,0 +1,80 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        return """
+        CREATE TABLE IF NOT EXISTS "daily_mood_summaries" (
+    "id" UUID NOT NULL PRIMARY KEY,
+    "local_date" DATE NOT NULL,
+    "count" INT NOT NULL,
+    "total" INT NOT NULL,
+    "min_value" INT NOT NULL,
+    "max_value" INT NOT NULL,
+    "first_at" TIMESTAMPTZ NOT NULL,
+    "last_at" TIMESTAMPTZ NOT NULL,
+    "user_id" UUID NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_daily_mood__user_id_fc5328" UNIQUE ("user_id", "local_date")
+);
+COMMENT ON TABLE "daily_mood_summaries" IS 'Per-user daily rollup of MoodLog values. `local_date` is the day in the';"""
+    return """
+        CREATE TABLE IF NOT EXISTS "daily_mood_summaries" (
+    "id" CHAR(36) NOT NULL PRIMARY KEY,
+    "local_date" DATE NOT NULL,
+    "count" INT NOT NULL,
+    "total" INT NOT NULL,
+    "min_value" INT NOT NULL,
+    "max_value" INT NOT NULL,
+    "first_at" TIMESTAMP NOT NULL,
+    "last_at" TIMESTAMP NOT NULL,
+    "user_id" CHAR(36) NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_daily_mood__user_id_fc5328" UNIQUE ("user_id", "local_date")
+) /* Per-user daily rollup of MoodLog values. `local_date` is the day in the */;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "daily_mood_summaries";"""
+
+
+MODELS_STATE = (
+    "eJztW21T2zgQ/isafzmYo0wIr+3cdCaQtM0VEgbCXaek4wpbCRpsKbVlINfrfz+t4veXJA"
+    "YCJOcZhtirXVl6VrKeXck/NZubxHI3m5ha4xPOzXPPtrEz1t6hnxrDNpEXhTobSMOjUaQB"
+    "AoGvLGVkgrZuS3XdVfqUKAV85QoHG0LqDLDlEikyiWs4dCQoZ2B5Spw3nkscpKpADrcsb4"
+    "T4AMGzj/kQ3WLLI+4m+m5xA1u6iQX5jqiLxDWRNmNEGVzCw0xuyKdRNnzCevsMKvlNiqlN"
+    "/uGMbKKLEeiavgJyJW5IdpK5sp+yUwi7iNwSZ4wYuUMWH24gl/eZK7BwEWYmMq6xIy8H3J"
+    "GlbCibOCIO5aaLHIJNJJ8hW3sHQmjHJvTMY/SHR3TBh0Q+0pH9u7zUoGFQGLVf+/ZN3lNm"
+    "knsJv1SC29GNPqDEMhNOpiZYKrkuxiMlu7hoNz8oTcDySje45dks0h6NxTVnobrnUXMTbK"
+    "BsSBhxAJWYo5lnWf74CESTfkiBcDwSNtWMBCYZYM+C4aL9MfDYBFD1JPi3895vWkxN1zvd"
+    "nn7e6um6lhld0ITUwPBFBmcwMikTANTPX5N6I0CUVIMHHH1qnK1t760rCLgrho4qVHBpv5"
+    "QhFnhiqkCPUI55JoN2U0rz0U5apVAHMQzFzaC8LPKBIII+mpgBqAFszwt0s9FrKUAjAA3u"
+    "MZHFrs1EPnShfgo1OpEuAqvagoCSjZU/b+pbO/s7B9t7Owcw00EUSvanYNnu9FJQCi6wVQ"
+    "LKUL+CMg2lTZmuVo8ScCZsng/SBc7kJ0cV35dHNW5ToZqD6oA6rtBxzku06a8k+cjG7aYt"
+    "QXCxhDBPwbDXPmmd9xonp1C97bo/rGBxgpK6ko5T0rUJPeCS6k74cFgJ+rvd+4TgFn3tdl"
+    "ppEhHq9b5q0CbsCa4zfqdjM45JIA5ECRdb+EEejplVDn7VDgair5dj7DGTp6Ttr9epM1g6"
+    "BEKDm1ySHoRRSWg/cIfQIftMxgrgNsRvzMhbZ/x4+cKvZjkhjaRaGIs5+C6MHOMDSvZd9p"
+    "gI1fujxvlRoyl5OyB8hY2bO+yYegJqKOF1npKEutkiu26nJZjhoQIHegFt9lH3g3ktJ4ER"
+    "FG1My1uojIWM0edLVhSjmhOgp0LxyziEhoz05RCB1++3KkZ/0Ri9LOWs6OY0usl4Xq6jR+"
+    "4L0Az0U2DKJs4Bpj8eXwuW0yhH60svwTY6fzXO1KA9aXxZTzCO427nY6Ae0Y3O0XH3MJ0c"
+    "iV4iJalf0nIF2Z8GmdQus8b+KFkSNugP6IoMVmSwIoPlyeAZsQE4p+uJK36fxwlTGlOpoe"
+    "Pr6jxSnrmb1Y1t3gQVIG4YnuMQOWLQmtqS+h25FhfwY1wT07OIiWxuEybWNzP7WI+usc96"
+    "1wRNhhiKXItsfENcRJgUe0Q+DFGT2CO5HjOxMdmnsjC1oQBDA/psbUSYCfdv3iN3crkOG2"
+    "YYajUpQIAt5KndMdjzQvyWOJYEGGwENW7cPuPQiZFFDewiBrtkSOJO4TfcSgs7Ke6oQWZv"
+    "f0HH1W/Qc90TRmYn7FKDDTjPLdCsCPiLEfDAf0mcj66xk49zoP8gyvja3rgqg20RNhTX8n"
+    "ZrbwrEAWPcSpOPgEvWVVGSIyaHekmamDFeQaa4JMxwrjxh9IbLzqUW8+wMeUl6O7R+vpml"
+    "+UtKyTeWdtrqNNudj++Qb99n54HEjUl66lb02YdG+7jVhBZQOZz7rPXltH0GAnI/og4x06"
+    "vuPJN1WmAczNX9wqm6n56parWVS9wNYWVWnZTZI5af5YmmZy42VYz8P4+RJye0HuD1pGXl"
+    "9dfi9Zz1z299lRmpMiNVZmRGZkShnpMPCbxRnAWBDi1+c6wKwV80BBdynA4dbOe+PQ/psP"
+    "iQYNLwabbEZmO++A2xt/X69vZ+vba9d7C7s7+/e1ALd8ayRdMigcP2R9glS6yJ2W0zmGXq"
+    "OoN+cR4kbrMK22fJ6Kq+uztHfCW1CiMsVVZFA6vNC+eJBoKEsqsTBujnveM4twhm+b7PtU"
+    "8NgStZwaK8Hkqedz057HaPEx4+bKc3pS9ODltna1vKtVKJioLXW7iVYnOHyebowSRJHRMo"
+    "nH6FFRTNxDln4UNegVrt7btaTf69wBoPsyExv3LnVvQOPMiwATCAqZTvH3JLHuefdAUv4Z"
+    "96bdX8E3x7VoYexG2eMaF70TtaFO5JgrBbm4Mf7NYKoYei1Nklci/0cCSX5wh59k/AFGbP"
+    "gefkx0vCC+baL6GufmVx46Y0I0gaVlRgBhXIZJWKkyCRcyZfFCc+Jk55yK/gw+czYmHV26"
+    "wzpnzMvGQEvSgDlfyGKn6c+eFwxY5OryJKOSd7Ho5V9kjRqkC2yIRkgzjUuNZyUpJ+yca0"
+    "pCSOdF5NVrIwRzZvasxfxV97ZuyRR8WnHMSXEbY/0+bluDGTFTwNtJAUGEyqEgj76iuI7l"
+    "ZtngBCahWftqplQgj5RDg/mUX4z/NupyCzGJmkgwVqCPQvsqi7jF+WTAEXwEjQyczXEOkP"
+    "H1LkHyo4LEcsn34x+/UfIQ/4OA=="
+)
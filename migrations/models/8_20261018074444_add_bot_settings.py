@@ -0,0 +1,69 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        return """
+        CREATE TABLE IF NOT EXISTS "bot_settings" (
+    "key" VARCHAR(64) NOT NULL PRIMARY KEY,
+    "value" TEXT NOT NULL,
+    "updated_at" TIMESTAMPTZ NOT NULL
+);
+COMMENT ON TABLE "bot_settings" IS 'Key-value state of the bot shared by all replicas.';"""
+    return """
+        CREATE TABLE IF NOT EXISTS "bot_settings" (
+    "key" VARCHAR(64) NOT NULL PRIMARY KEY,
+    "value" TEXT NOT NULL,
+    "updated_at" TIMESTAMP NOT NULL
+) /* Key-value state of the bot shared by all replicas. */;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "bot_settings";"""
+
+
+MODELS_STATE = (
+    "eJztXHtPGzkQ/yrW/nNUByiEZ6tTpQBpmyuQCsJd1abaOrsmsdi107W3kOv1u5/H+36FhB"
+    "IguZUqkoxnvPZvbM/L2x+Gy23iiM1DLi+IlJQNjVfoh8GwS9SXktZ1ZODxOGkDgsQDR7MP"
+    "uDRFwKgb8EBID1tStV1hRxBFsomwPDqWlDOQeE8mG9+x4xMkJJYE8SskRwSpjpAYYY/YaD"
+    "BB2HGQR8YOtbDYhH5tbqmOg8Heo4s+a28ONzXXCItRJGFx18XMRg4VEjlY/RGESSQ56hGH"
+    "DD3s6of7jH7ziSn5kCgpTw3h8xdFpswmt0REP8fX5hUljp2B85pMoAfdYMrJWBOP1CDfaF"
+    "aY2cC0uOO7LMU+nsgRZzG/mjlQh4QRT83XToHLfMcJdRGRgtEqgvR8Eg/TTgg2ucK+AyoC"
+    "6WAICc0wzbNuz7xo90zTKKgvkkipIyRZnIHqKZNCI+DiW9MhbChH6ufezs/gOQkQARc88K"
+    "/W+dG71vna3s4LeCBX6ydYXGdhS1M3/dRdYImDTjTuCdB6PRSh7pFbWQ51LPAwYEeEBO1k"
+    "/T8C3FPg7bU/9qBnV4hvThrWtdPWR424OwlbTrpnbyP2lBqOTrqHGv4Ebn9sAzgmlkXMj1"
+    "WLpC4pxz0rmQPfDkU3oy9LqArDI9juMmcS7rhpqumcti96rdMPGf0ct3ptaGlmdBNR1/Zy"
+    "uyTuBP3d6b1D8BN96p61NbxcyKGnn5jw9T4ZMCbsS24yfmNiO41RRI5GD0fb1XVqzwFhgK"
+    "3rG+zZZqGFN3kVb7HJbbp5CmZ4qHUG4MIwQ4N0jKkzOeXcvvDVme1NyoxWgWeq6bKB23QV"
+    "uyk0PyUzmrAPxNvwBfGQ7gJ53HH8MdgUePYJHyJ9tohN9NXhFnZMWMxfERXa5th4giiDrw"
+    "W79kD99hl08psiqw30D2dkE10Gmy5kQELhprSLmVDzVJNCWCDynXgTxMgNcvhwHQneZ2Bd"
+    "BQIDaSmLpb5ecU+1sqEa4ph4lNsCwWJH6hlqtDdAhHFUGc3PBgwMGpPxG19mNaXULh41l5"
+    "ed4/JjJuDOHS++T+1NkFmMOTX+uPJZAKh+EvzZeW08/pGvT/ft4KBIHwF66tPtaEozpQd7"
+    "OdpZqWmH+hIe6FOAhkM5Zxkt7rMSo9hhFX5IzJ9DjQbURWDVWJTlG8IINppbO/s7B9t7Ow"
+    "ew04EUU/anYNk56+WglFxiZw4oY/4ayjyULmVmhYtcCWdG5vEgXaRr9tCoqhhnblTTMjWq"
+    "JaheUU/Ie0QWabkVjCuWN47QpIyKIddyDw2nxGoFP2sFg6Nvzuexp0Qe0m1/vkq9w0svBN"
+    "5ZdIvQvuEeoUP2nkw0wB2I35hVZmfCePky7GY5IU2oRhyLefgmjhzTC0rNXc2YyCD92ro4"
+    "ah0rv/1pMhlhMG+UJDCipvVpeQudsVAx+mzJimpU785qf05DaKlIP8zbfalj9CeN0ed1OW"
+    "t3c5q7yXhZrqO6cBDx36tuEK7H54LlY5cNUofInK5fVnIFvb8lLRuEC7p2BmtnsHYG53cG"
+    "z4kLwHldXw74bZlPmOOY6hp6Ia/JE+Y7q1ndVPEm6gBxy/I9j6gVg9Z0Sep3JBwu4cMaEd"
+    "t3iI1c7hImXxTvZ/xyj33WGxEULDGUqBa5+JoIRJgi+0Q9DFGbuGNlj5lcD+pUDqYuNGAY"
+    "QJ+tjQmz4ffGa7jaAV9fQMEMQ682BQiwg4KSNNS8EP9OPEcBDDKSWteiz7gX3yNBDKpkSO"
+    "FO4TMupcWTlDfUIneXv2Di+jOauelLq1AJ+2xAAc4XFZy1A/5kDnikv1mv9UT8K3HVJHuz"
+    "Z2tvhps9W3nnI7nZA01ZHzG71Od0EwvCK+gpLolnOFOeMDnhinupzXy34LxktR1LP97OMk"
+    "KTMueJZXxonx13zt6+QqF8n11EFJGi9PRP2WdvWp2T9jGMgKrl3Gftjx8650Agt2PqETtv"
+    "dWfZrNMC42iv7ldu1f38TtXWVpm4a8LmsTo5sV8wP8sTTd9pbOoY+X8eI9cXKldM61UXKu"
+    "vMSJ0ZqTMjxl2ZEY16ST4k0kZ1FgQmtPjiWB2CP2kILsMXdEpPz0M6rL4kmBV8mJLY075q"
+    "ExTEXjab29v7zcb23sHuzv7+7kEjrowVm6ZFAoedt1Aly9jEYtkMdpn+XkC/Og+SllmF8l"
+    "k2umru7s4QXymuyghLt9XRwGr7hbNEA1FCWZiEAfplZxznDsGsXPel8rklMFAdLErrMeVx"
+    "7clht3uS0fBhJ1+Uvjw9bJ+vbWnVKiYqK463uJTico+p4ZjRJsldE6jcfpUdVO3EGXfhfY"
+    "5Ao/HyVaOh/j2BjYfdkNlfpXsrOQMPCt4ACMBWKtcP+U5+TT/5Dp5CP83GquknevdsHvcg"
+    "LfOICd3L3tGicM86CLuNGfyD3UYl9NCUu7tEbqUZr+T5fYQy+QfwFO7eA4/pHy+JXzBTvY"
+    "QKc+Bw63pujyArWLsCd7gCc7z1nCgneKM48zJxTkNhB2/enxMH69kWlTHlZeYlc9CrMlDZ"
+    "d6jS15nvD1fq6vQqolRys+f+WBWvFK0KZItMSLaIR62RUZKSDFvWpyUlccLzbLKSlTmyWV"
+    "NjoRV/7pmxX7wqPuUivoqww502q4+bElnB20ALSYHBppoD4ZB9BdHdaswSQCiu6ttWjUII"
+    "oZ4I9yeLCP950T2ryCwmIvlggVoS/av/P60lRHsKuABGxp0svA2Rf/Eh5/xDB4fzOZYPb8"
+    "x+/gcYNCAH"
+)
@@ -0,0 +1,61 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        return """
+        ALTER TABLE "reminder_outbox" ADD "claimed_at" TIMESTAMPTZ;"""
+    return """
+        ALTER TABLE "reminder_outbox" ADD "claimed_at" TIMESTAMP;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "reminder_outbox" DROP COLUMN "claimed_at";"""
+
+
+MODELS_STATE = (
+    "eJztXP9P2zgU/1es/HJMx6pSvm46TSrQ7XoDOkG5m7ZOmZu4bYRjd7Ez6O32v5+fkzTfS8"
+    "tooVUkBO3ze7bzebbfN4cfhsttQkXtmMsrIqXDhsZr9MNg2CXqQ0HrNjLweBy3AUHiPtXs"
+    "fS5NETDqBtwX0sOWVG0DTAVRJJsIy3PG0uEMJN6TycvvmPoECYklQXyA5Igg1RESI+wRG/"
+    "UnCFOKPDKmjoVFDfq1uaU6Dib7gC56rFUb1jTXCItRJGFx18XMRtQRElGsfgnCJJIcdQkl"
+    "Qw+7enCfOd98Yko+JErKU1P4/EWRHWaTOyKir+Mbc+AQaqfgvCET6EE3mHIy1sQTNcm3mh"
+    "WerG9anPouS7CPJ3LE2ZRfPTlQh4QRTz2vnQCX+ZSGuohIwWwVQXo+mU7Tjgk2GWCfgopA"
+    "OphCTDNM86LTNa9aXdM0cuqLJBLqCEkWZ6B6h0mhEXDxnUkJG8qR+nqw9zMYJwYi4IIB/2"
+    "5envzZvNw62HsBA3K1foLFdRG2NHTTT90FljjoROMeA63XQx7qLrmTxVBPBR4H7IgQox2v"
+    "/xXAPQPebutjF3p2hfhGk7BunTc/asTdSdhy1rl4F7En1HBy1jnW8Mdw+2MbwDGxzGN+ql"
+    "qk45Ji3NOSGfDtULQWfVhDVRgewXaH0Um442appn3euuo2zz+k9HPa7LagpZHSTUTdOsjs"
+    "kmkn6J92908EX9GnzkVLw8uFHHp6xJiv+8mAOWFfcpPxWxPbSYwicjR7ONoGN4k9B4Q+tm"
+    "5usWebuRbe4GW8+Sa34WYpmOGh1hmAC9MMDdIpdujknHP7yldntjcpMlo5npmmywZu01Xs"
+    "ptD8DpnThH0g3ktfEA/pLpDHKfXHYFNg7DM+RPpsETX0lXILUxMW81fkCG1zbDxBDoOPOb"
+    "v2SP32GHTymyKrDfQvZ6SGroNNFzIgoXBT2sVMqOdUD4WwQOQ78SaIkVtE+XAbCd5jYF0F"
+    "AgNpKYulPg64p1rZUE1xTDyH2wLBYkdqDDXbWyDCPMqM5mcDJgaN8fyNL/OaUsfOHzXX1+"
+    "3T4mMm4M4cL77v2DWQWY45Nf4Y+CwAVI8Ev/beGKs/8vXpvhscFMkjQD/6bDua0EzhwV6M"
+    "dlpq1qG+hgf6DKDhUM5YRov7rMAotlmJHzLlz6DmBNRlYFVfluUbwgxeNnb2DveOdg/2jm"
+    "CnA2lKOZyBZfuim4FSconpAlBO+Ssos1C6DjNLXORSOFMyq4N0ma7ZY6OqYpyFUU3KVKgW"
+    "oDpwPCEfEFkk5TYwrljfOEKTUiqGXMsDNJwQqxT8rBUMjr65mMeeEHlMt/35KvUeLz0XeK"
+    "fRzUP7lnvEGbL3ZKIBbkP8xqwiOxPGy9dhN+sJaUw1prGYh2+nkWNyQalnV09MZJB+bV6d"
+    "NE+V3/40mYwwmDcKEhhR0/asvIXOWKgYfb5kRTmq92e1PychtFSkH+btvlQx+pPG6Iu6nJ"
+    "W7OcvdZLwo11FeOIj4H1Q3CNfjc8Fy1WWDxCGyoOuXltxA729Nywbhgq6cwcoZrJzBxZ3B"
+    "S+ICcF7Hl31+V+QTZjhmuoZeyGvymPnealYnUbyJOkDcsnzPI2rFoC1dkvodCcol/LFGxP"
+    "YpsZHLXcLki/z9jF/usce6I4KCJYZi1SIX3xCBCFNkn6jBkGMTd6zsMZPbQZ2KYseFBgwT"
+    "6LGtMWE2fH/5Bq52wMcXUDDD0KvtAASYoqAkDTUvxL8TjyqAQUY61o3oMe5N75EgBlUyJN"
+    "U04jqaGqiGTgl1dAENOlcTVTsYcfWsr6OZUDKQUH4LZ6FvqCDLw0I9ux4JJMnd2PGIvR2O"
+    "oy+j4KF69PsraoCl/huBafrSyhXXPhtQ0/NFCWfl0z+ZTx/pb96bQhH/RtxeSV8W2jmY47"
+    "LQTtafiS8LQVPa7Uwv9QU9z5zwBjqfa+JszpV6jE+4/F5qMd/N+UNpbU+lV7ezjNBKLXhi"
+    "GR9aF6fti3evUSjfY1cRRSQoXf1V9tjbZvusdQozcNRy7rHWxw/tSyCEdidryOfZrLNi7W"
+    "ivHpZu1cPsTtUGXJm4G8IWsToZsV8wP+sToN9rbDKoPizsTkk+wsm3Pviu3cFXJVfKz6wN"
+    "Tq5UN3E3TOtlN3GrlFqVUqtSasZ9KTWNekEiLdJGefoMHmj5VdUq0fKkiRYZvtlVeHoeO8"
+    "Py26VpwceppT7tO1pBJfVVo7G7e9io7x4c7e8dHu4f1acl1XzTrHjvuP0Oyqspm5ivt8Iu"
+    "059z6Jdnu5Iym1B3TcfQjf39OaJoxVUaR+u2qtS62X7hPNFAVG4RJmGAftEZxzklmBXrvl"
+    "A+swT6qoNlaX1KWa09Oe50zlIaPm5nbzNcnx+3Lrd2tGoVkyNLjrdpDc7lHlPTMaNNkrlf"
+    "Urr9Sjso24lLzLwY9Vev63X18wQ2HnZDan8V7q34DDzKeQMgAFupWD/kO/k1/WQ7eAr9NO"
+    "qbpp/opcVF3IOkzArT9tfdk2XhnnYQ9utz+Af79VLooSlz6Y3cSXO6khf3EYrkV5IdXqV/"
+    "vCZ+wVzJYUeYfcqtm4U9grRg5Qrc4wos8Lp8rJzgVfTUW+gZDYUdvH1/SSjWT5tXxoy34N"
+    "fMQS/LQKVfvkveg384XIk795uIUsGVsIdjlb+LtimQLTMh2SSeY42MgpRk2LI9KymJY55n"
+    "k5UszZHNmxoLrfhzz4z94jsGM97gUBF2uNPm9XETIht452spKTDYVAsgHLJvILo79XkCCM"
+    "VVfqeungsh1Ihw8TaP8F9XnYuSzGIskg0WHEui//Q/YltDtGeAC2Ck3MncazTZN2Yyzj90"
+    "cLyYY/n4xuzn/6th16A="
+)
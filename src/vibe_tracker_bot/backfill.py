@@ -0,0 +1,33 @@
+"""
+Fills daily_mood_summaries from existing mood logs.
+Run once after applying the migration (from the project root):
+
+    python -m src.vibe_tracker_bot.backfill
+"""
+
+import asyncio
+import logging
+from dotenv import load_dotenv
+
+# Load environment variables before DB_URL is read
+load_dotenv()
+
+from src.vibe_tracker_bot.database.core import init_db, close_db  # noqa: E402
+from src.vibe_tracker_bot.services.summaries import backfill_summaries  # noqa: E402
+
+
+async def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    await init_db()
+    try:
+        processed = await backfill_summaries()
+        logging.info(f"Daily summaries rebuilt for {processed} users")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,4 @@
+from enum import Enum
 from tortoise import fields, models
 import datetime
 
@@ -13,8 +14,15 @@ class User(models.Model):
     reminder_morning_time = fields.TimeField(null=True, default=datetime.time(9, 0))
     reminder_evening_time = fields.TimeField(null=True, default=datetime.time(20, 0))
     timezone = fields.CharField(max_length=50, default="UTC")
+    # UTC moment of the next reminder, kept up to date so the scheduler
+    # only has to fetch users that are due instead of scanning everyone
+    next_reminder_at = fields.DatetimeField(null=True, index=True)
+    # Set when Telegram reports that the user blocked the bot
+    is_blocked = fields.BooleanField(default=False)
 
     mood_logs: fields.ReverseRelation["MoodLog"]
+    reminder_outbox: fields.ReverseRelation["ReminderOutbox"]
+    daily_summaries: fields.ReverseRelation["DailyMoodSummary"]
 
     class Meta:
         table = "users"
@@ -31,3 +39,83 @@ class MoodLog(models.Model):
 
     class Meta:
         table = "mood_logs"
+        # Every stats/chart query filters by user and a created_at range
+        indexes = (("user_id", "created_at"),)
+
+
+class DailyMoodSummary(models.Model):
+    """
+    Per-user daily rollup of MoodLog values. `local_date` is the day in the
+    user's timezone. Updated in the same transaction as every new log, so
+    stats and charts for longer periods read one row per day.
+    """
+
+    id = fields.UUIDField(pk=True)
+    user = fields.ForeignKeyField(
+        "models.User", related_name="daily_summaries", on_delete=fields.CASCADE
+    )
+    local_date = fields.DateField()
+    count = fields.IntField(default=0)
+    total = fields.IntField(default=0)
+    min_value = fields.IntField()
+    max_value = fields.IntField()
+    first_at = fields.DatetimeField()
+    last_at = fields.DatetimeField()
+
+    class Meta:
+        table = "daily_mood_summaries"
+        unique_together = (("user", "local_date"),)
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+    EXPIRED = "expired"
+
+
+class ReminderOutbox(models.Model):
+    """
+    One row per reminder occurrence (user + slot + scheduled moment).
+    The unique constraint makes enqueueing idempotent, and claiming a row
+    (pending -> sending) is a conditional update, so overlapping ticks
+    or replicas never take the same row. Delivery is at most once: a row
+    left in sending by a crashed tick is expired, never sent again.
+    """
+
+    id = fields.UUIDField(pk=True)
+    user = fields.ForeignKeyField(
+        "models.User", related_name="reminder_outbox", on_delete=fields.CASCADE
+    )
+    slot = fields.CharField(max_length=16)
+    scheduled_utc = fields.DatetimeField()
+    status = fields.CharEnumField(OutboxStatus, default=OutboxStatus.PENDING)
+    claim_token = fields.UUIDField(null=True)
+    # UTC moment of the claim, tells stuck sending rows from live ones
+    claimed_at = fields.DatetimeField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "reminder_outbox"
+        unique_together = (("user", "slot", "scheduled_utc"),)
+        indexes = (("status", "scheduled_utc"),)
+
+
+class BotSetting(models.Model):
+    """
+    Key-value state of the bot shared by all replicas.
+    E.g. the hash of the command list last sent to Telegram.
+    """
+
+    key = fields.CharField(max_length=64, pk=True)
+    value = fields.TextField()
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "bot_settings"
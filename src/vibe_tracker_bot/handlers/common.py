@@ -1,12 +1,14 @@
 from aiogram import Router, types
 from aiogram.filters import CommandStart
 from src.vibe_tracker_bot.database.models import User
+from src.vibe_tracker_bot.services.reminders import refresh_next_reminder
+from src.vibe_tracker_bot.services.user_cache import remember_user
 
 router = Router()
 
 
 @router.message(CommandStart())
-async def cmd_start(message: types.Message):
+async def cmd_start(message: types.Message, user: User | None):
     if not message.from_user:
         return
 
@@ -14,14 +16,19 @@ async def cmd_start(message: types.Message):
     username = message.from_user.username
 
     # Create user if not exists
-    user, created = await User.get_or_create(
-        telegram_id=telegram_id, defaults={"username": username}
-    )
+    created = False
+    if user is None:
+        user, created = await User.get_or_create(
+            telegram_id=telegram_id, defaults={"username": username}
+        )
+        remember_user(user)
 
-    # If user existed but username changed, update it
-    if not created and user.username != username:
+    # If user existed but username changed or they unblocked the bot, update it
+    if not created and (user.username != username or user.is_blocked):
         user.username = username
-        await user.save()
+        user.is_blocked = False
+        refresh_next_reminder(user)
+        await user.save(update_fields=["username", "is_blocked", "next_reminder_at"])
 
     await message.answer(
         f"Привет, {message.from_user.first_name}! 👋\n\n"
@@ -29,6 +36,8 @@ async def cmd_start(message: types.Message):
         "<b>Доступные команды:</b>\n"
         "📝 /log — отметить своё состояние\n"
         "📊 /stats — статистика за неделю\n"
-        "📈 /moodchart — график настроения",
+        "📈 /moodchart — график настроения\n"
+        "📦 /export — выгрузить историю\n"
+        "📥 /import — загрузить историю из CSV",
         parse_mode="HTML",
     )
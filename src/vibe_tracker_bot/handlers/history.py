@@ -0,0 +1,191 @@
+import logging
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from aiogram import F, Router, exceptions, types
+from aiogram.filters import Command
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.types import FSInputFile, InlineKeyboardButton, InlineKeyboardMarkup
+
+from src.vibe_tracker_bot.database.models import User
+from src.vibe_tracker_bot.services.charts import invalidate_chart_cache
+from src.vibe_tracker_bot.services.export import EXPORT_FORMATS, export_mood_logs
+from src.vibe_tracker_bot.services.importer import (
+    IMPORT_MAX_FILE_SIZE,
+    ImportFormatError,
+    ImportResult,
+    import_mood_logs,
+)
+
+router = Router()
+logger = logging.getLogger(__name__)
+
+# Telegram ids of users whose export is being prepared, one at a time per user
+_exports_in_progress: set[int] = set()
+# Same for imports
+_imports_in_progress: set[int] = set()
+
+# Telegram limits edits of a message, import progress is updated this often
+IMPORT_PROGRESS_INTERVAL = 3.0
+
+
+class HistoryState(StatesGroup):
+    waiting_for_import_file = State()
+
+
+def get_export_format_keyboard() -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(text="📄 CSV", callback_data="export:csv"),
+                InlineKeyboardButton(text="🧾 JSON", callback_data="export:json"),
+            ]
+        ]
+    )
+
+
+@router.message(Command("export"))
+async def cmd_export(message: types.Message, user: User | None):
+    if not user:
+        await message.answer("Пожалуйста, сначала выполните команду /start")
+        return
+    await message.answer(
+        "В каком формате выгрузить историю?", reply_markup=get_export_format_keyboard()
+    )
+
+
+@router.callback_query(F.data.startswith("export:"))
+async def process_export(callback: types.CallbackQuery, user: User | None):
+    fmt = callback.data.split(":", 1)[1]
+    if not user or fmt not in EXPORT_FORMATS or not callback.message:
+        await callback.answer()
+        return
+    if user.telegram_id in _exports_in_progress:
+        await callback.answer("Файл уже готовится, подожди немного ⏳")
+        return
+
+    _exports_in_progress.add(user.telegram_id)
+    try:
+        await callback.message.edit_text("Готовлю файл... ⏳")
+        await callback.answer()
+
+        filename = f"vibe_history_{date.today():%Y%m%d}.{fmt}.gz"
+        # Written to disk chunk by chunk and uploaded from there,
+        # so a long history never sits in memory
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / filename
+            with path.open("wb") as output:
+                count = await export_mood_logs(user, output, fmt)
+
+            if not count:
+                await callback.message.edit_text(
+                    "Пока нечего выгружать. Начни с /log!"
+                )
+                return
+
+            await callback.message.answer_document(
+                FSInputFile(path, filename=filename),
+                caption=(
+                    f"Твоя история: {count} записей 📦\n"
+                    f"Время указано в часовом поясе {user.timezone}."
+                ),
+            )
+        try:
+            await callback.message.delete()
+        except Exception:
+            # Ignore if message cannot be deleted (already deleted or too old)
+            pass
+    except Exception as e:
+        logger.error(f"Error in process_export: {e}", exc_info=True)
+        await callback.message.answer("Не удалось выгрузить историю, попробуй позже 🙏")
+    finally:
+        _exports_in_progress.discard(user.telegram_id)
+
+
+@router.message(Command("import"))
+async def cmd_import(message: types.Message, state: FSMContext, user: User | None):
+    if not user:
+        await message.answer("Пожалуйста, сначала выполните команду /start")
+        return
+    await state.set_state(HistoryState.waiting_for_import_file)
+    await message.answer(
+        "Пришли CSV-файл с колонками time, value, note (заметка необязательна).\n"
+        "Время — в формате 2025-01-31 21:30, в твоём часовом поясе "
+        f"({user.timezone}). Оценки — от 1 до 10.\n"
+        "Подойдёт и файл из /export."
+    )
+
+
+@router.message(HistoryState.waiting_for_import_file, F.document)
+async def process_import_file(
+    message: types.Message, state: FSMContext, user: User | None
+):
+    if not user:
+        await state.clear()
+        await message.answer("Пожалуйста, сначала выполните команду /start")
+        return
+    document = message.document
+    if document.file_size and document.file_size > IMPORT_MAX_FILE_SIZE:
+        await message.answer(
+            f"Файл слишком большой, максимум {IMPORT_MAX_FILE_SIZE // 2**20} МБ. "
+            "Сожми его в .gz или раздели на части."
+        )
+        return
+    if user.telegram_id in _imports_in_progress:
+        await message.answer("Предыдущий файл ещё загружается, подожди немного ⏳")
+        return
+
+    await state.clear()
+    _imports_in_progress.add(user.telegram_id)
+    progress = await message.answer("Загружаю файл... ⏳")
+    last_update = time.monotonic()
+    # Updated after every committed chunk, tells what is saved if import fails
+    result = ImportResult()
+
+    async def show_progress(current: ImportResult) -> None:
+        nonlocal last_update, result
+        result = current
+        if time.monotonic() - last_update < IMPORT_PROGRESS_INTERVAL:
+            return
+        last_update = time.monotonic()
+        try:
+            await progress.edit_text(f"Загружено записей: {current.imported}... ⏳")
+        except exceptions.TelegramBadRequest:
+            pass
+
+    try:
+        # Read from disk chunk by chunk, so a big file never sits in memory
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "import"
+            await message.bot.download(document, destination=path)
+            result = await import_mood_logs(user, str(path), show_progress)
+    except ImportFormatError as e:
+        text = (
+            f"Не получилось прочитать файл: {e}.\n"
+            "Нужен CSV с колонками time, value, note — как в файле из /export."
+        )
+        if result.imported:
+            text += f"\nДо ошибки сохранено записей: {result.imported}"
+        await progress.edit_text(text)
+        return
+    except Exception as e:
+        logger.error(f"Error in process_import_file: {e}", exc_info=True)
+        await progress.edit_text(
+            f"Не удалось загрузить историю, сохранено записей: {result.imported}. "
+            "Попробуй позже 🙏"
+        )
+        return
+    finally:
+        _imports_in_progress.discard(user.telegram_id)
+        invalidate_chart_cache(user.telegram_id)
+
+    text = f"✅ Загружено записей: {result.imported}"
+    if result.duplicates:
+        text += f"\nУже были в истории и пропущены: {result.duplicates}"
+    if result.skipped:
+        text += f"\nПропущено строк с ошибками: {result.skipped}"
+        text += "".join(f"\n• {error}" for error in result.errors)
+    await progress.edit_text(text)
@@ -1,6 +1,5 @@
 from datetime import datetime
 import logging
-import pytz
 from aiogram import Router, F, types, exceptions
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
@@ -8,23 +7,17 @@ from aiogram.fsm.state import State, StatesGroup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from src.vibe_tracker_bot.database.models import User
+from src.vibe_tracker_bot.services.charts import invalidate_chart_cache
+from src.vibe_tracker_bot.services.reminders import refresh_next_reminder
+from src.vibe_tracker_bot.services.summaries import rebuild_user_summaries
+from src.vibe_tracker_bot.services.timezones import (
+    resolve_timezone,
+    suggest_timezones,
+)
 
 router = Router()
 logger = logging.getLogger(__name__)
 
-COMMON_TIMEZONES = {
-    "moscow": "Europe/Moscow",
-    "msk": "Europe/Moscow",
-    "warsaw": "Europe/Warsaw",
-    "poland": "Europe/Warsaw",
-    "minsk": "Europe/Minsk",
-    "kiev": "Europe/Kyiv",
-    "kyiv": "Europe/Kyiv",
-    "london": "Europe/London",
-    "utc": "UTC",
-    "gmt": "UTC",
-}
-
 
 class RemindersState(StatesGroup):
     waiting_for_morning_time = State()
@@ -33,8 +26,7 @@ class RemindersState(StatesGroup):
 
 
 @router.message(Command("reminders"))
-async def cmd_reminders(message: types.Message):
-    user = await User.get_or_none(telegram_id=message.from_user.id)
+async def cmd_reminders(message: types.Message, user: User | None):
     if not user:
         await message.answer("Пожалуйста, сначала выполните команду /start")
         return
@@ -85,14 +77,14 @@ async def show_reminders_menu(
 
 
 @router.callback_query(F.data == "toggle_reminders")
-async def toggle_reminders(callback: types.CallbackQuery):
-    user = await User.get_or_none(telegram_id=callback.from_user.id)
+async def toggle_reminders(callback: types.CallbackQuery, user: User | None):
     if not user:
         await callback.answer("Пользователь не найден", show_alert=True)
         return
 
     user.reminders_enabled = not user.reminders_enabled
-    await user.save()
+    refresh_next_reminder(user)
+    await user.save(update_fields=["reminders_enabled", "next_reminder_at"])
     await show_reminders_menu(callback.message, user, is_edit=True)
     await callback.answer(
         f"Напоминания {'включены' if user.reminders_enabled else 'выключены'}"
@@ -118,7 +110,7 @@ async def set_evening_start(callback: types.CallbackQuery, state: FSMContext):
 
 
 async def validate_and_save_time(
-    message: types.Message, state: FSMContext, field_name: str
+    message: types.Message, state: FSMContext, user: User | None, field_name: str
 ):
     try:
         time_obj = datetime.strptime(message.text, "%H:%M").time()
@@ -128,13 +120,13 @@ async def validate_and_save_time(
         )
         return
 
-    user = await User.get_or_none(telegram_id=message.from_user.id)
     if not user:
         await message.answer("Пользователь не найден. Введите /start")
         return
 
     setattr(user, field_name, time_obj)
-    await user.save()
+    refresh_next_reminder(user)
+    await user.save(update_fields=[field_name, "next_reminder_at"])
 
     await state.clear()
     await message.answer("Время обновлено!")
@@ -142,13 +134,17 @@ async def validate_and_save_time(
 
 
 @router.message(RemindersState.waiting_for_morning_time)
-async def process_morning_time(message: types.Message, state: FSMContext):
-    await validate_and_save_time(message, state, "reminder_morning_time")
+async def process_morning_time(
+    message: types.Message, state: FSMContext, user: User | None
+):
+    await validate_and_save_time(message, state, user, "reminder_morning_time")
 
 
 @router.message(RemindersState.waiting_for_evening_time)
-async def process_evening_time(message: types.Message, state: FSMContext):
-    await validate_and_save_time(message, state, "reminder_evening_time")
+async def process_evening_time(
+    message: types.Message, state: FSMContext, user: User | None
+):
+    await validate_and_save_time(message, state, user, "reminder_evening_time")
 
 
 @router.callback_query(F.data == "set_timezone")
@@ -163,37 +159,25 @@ async def set_timezone_start(callback: types.CallbackQuery, state: FSMContext):
 
 
 @router.message(RemindersState.waiting_for_timezone)
-async def process_timezone(message: types.Message, state: FSMContext):
-    tz_input = message.text.strip().lower()
-
-    # Try common aliases first
-    tz_name = COMMON_TIMEZONES.get(tz_input)
-
-    if not tz_name:
-        # Try exact match case-insensitive search in all_timezones
-        for tz in pytz.all_timezones:
-            if tz.lower() == tz_input:
-                tz_name = tz
-                break
-
-    # If still not found, try to parse as-is
-    if not tz_name:
-        try:
-            pytz.timezone(message.text.strip())
-            tz_name = message.text.strip()
-        except pytz.UnknownTimeZoneError:
-            pass
+async def process_timezone(
+    message: types.Message, state: FSMContext, user: User | None
+):
+    tz_name = resolve_timezone(message.text or "")
 
     if not tz_name:
-        # Try to find something ending with the input (e.g. user types "New_York")
-        candidates = [tz for tz in pytz.all_timezones if tz_input in tz.lower()]
-        if len(candidates) == 1:
-            tz_name = candidates[0]
-        elif len(candidates) > 1:
-            # Ambiguous match, treat as not found to force user to be more specific
-            tz_name = None
+        suggestions = suggest_timezones(message.text or "")
+        if suggestions:
+            builder = InlineKeyboardBuilder()
+            for suggestion in suggestions:
+                builder.button(text=suggestion, callback_data=f"tz:{suggestion}")
+            builder.adjust(1)
+            await message.answer(
+                "Не нашёл точного совпадения. Возможно, вы имели в виду один "
+                "из этих часовых поясов? Или введите название ещё раз.",
+                reply_markup=builder.as_markup(),
+            )
+            return
 
-    if not tz_name:
         await message.answer(
             "Не удалось определить часовой пояс. "
             "Пожалуйста, попробуйте указать город на английском (например: Warsaw) "
@@ -201,17 +185,37 @@ async def process_timezone(message: types.Message, state: FSMContext):
         )
         return
 
-    # Final validation
-    try:
-        pytz.timezone(tz_name)
-    except pytz.UnknownTimeZoneError:
-        await message.answer("Ошибка валидации часового пояса. Попробуйте еще раз.")
+    await apply_timezone(message, state, user, tz_name)
+
+
+@router.callback_query(F.data.startswith("tz:"))
+async def process_timezone_choice(
+    callback: types.CallbackQuery, state: FSMContext, user: User | None
+):
+    # Buttons come from suggest_timezones, but the data is still user input
+    tz_name = resolve_timezone(callback.data.split(":", 1)[1])
+    if not tz_name:
+        await callback.answer("Неизвестный часовой пояс", show_alert=True)
         return
 
-    user = await User.get_or_none(telegram_id=message.from_user.id)
+    try:
+        await callback.message.edit_reply_markup(reply_markup=None)
+    except exceptions.TelegramBadRequest:
+        pass
+    await apply_timezone(callback.message, state, user, tz_name)
+    await callback.answer()
+
+
+async def apply_timezone(
+    message: types.Message, state: FSMContext, user: User | None, tz_name: str
+):
     if user:
         user.timezone = tz_name
-        await user.save()
+        refresh_next_reminder(user)
+        await user.save(update_fields=["timezone", "next_reminder_at"])
+        # Local days shift with the timezone, daily summaries must follow
+        await rebuild_user_summaries(user)
+        invalidate_chart_cache(user.telegram_id)
         await message.answer(f"Часовой пояс установлен: {tz_name}")
         await show_reminders_menu(message, user)
     else:
@@ -5,12 +5,24 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, BufferedInputFile
 
-from ..database.models import User, MoodLog
+from ..database.models import User
 from ..services.stats import get_weekly_stats
-from ..services.charts import generate_mood_chart
+from ..services.chart_renderer import ChartQueueFull
+from ..services.log_writer import mood_log_writer
+from ..services.user_cache import remember_user
+from ..services.charts import (
+    forget_chart_file_id,
+    get_chart_file_id,
+    invalidate_chart_cache,
+    prepare_mood_chart,
+    remember_chart_file_id,
+    render_mood_chart,
+)
 
 tracking_router = Router()
 
+CHART_BUSY_TEXT = "Сейчас рисую много графиков, попробуй ещё раз через пару секунд 🙏"
+
 
 class TrackingState(StatesGroup):
     waiting_for_note = State()
@@ -58,6 +70,14 @@ def get_skip_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+CHART_PERIOD_NAMES = {
+    "day": "сегодня",
+    "week": "последние 7 дней",
+    "month": "последние 30 дней",
+    "year": "последний год",
+}
+
+
 def get_chart_type_keyboard() -> InlineKeyboardMarkup:
     """Creates buttons for chart period selection."""
     return InlineKeyboardMarkup(
@@ -65,7 +85,11 @@ def get_chart_type_keyboard() -> InlineKeyboardMarkup:
             [
                 InlineKeyboardButton(text="📅 За день", callback_data="chart:day"),
                 InlineKeyboardButton(text="🗓 За неделю", callback_data="chart:week"),
-            ]
+            ],
+            [
+                InlineKeyboardButton(text="🟩 За месяц", callback_data="chart:month"),
+                InlineKeyboardButton(text="🟩 За год", callback_data="chart:year"),
+            ],
         ]
     )
 
@@ -94,9 +118,9 @@ async def cmd_log(message: types.Message, state: FSMContext):
 
 
 @tracking_router.message(Command("stats"))
-async def cmd_stats(message: types.Message):
+async def cmd_stats(message: types.Message, user: User | None):
     """Shows weekly statistics."""
-    stats = await get_weekly_stats(message.from_user.id)
+    stats = await get_weekly_stats(user) if user else None
 
     if not stats or stats["count"] == 0:
         await message.answer(
@@ -146,7 +170,7 @@ async def process_open_chart_menu(callback: types.CallbackQuery):
 
 
 @tracking_router.callback_query(F.data.startswith("chart:"))
-async def process_chart_selection(callback: types.CallbackQuery):
+async def process_chart_selection(callback: types.CallbackQuery, user: User | None):
     """Handles chart period selection and sends the graph."""
     try:
         period = callback.data.split(":")[1]
@@ -161,18 +185,32 @@ async def process_chart_selection(callback: types.CallbackQuery):
             await callback.answer()
             return
 
-        # Generate chart
-        chart_buf = await generate_mood_chart(callback.from_user.id, period)
-
-        if not chart_buf:
+        # Check the data first, the image itself may be already on Telegram side
+        chart = await prepare_mood_chart(user, period) if user else None
+        chart_buf = None
+        file_id = None
+        if chart:
+            file_id = get_chart_file_id(chart.key)
+            if not file_id:
+                try:
+                    chart_buf = await render_mood_chart(chart)
+                except ChartQueueFull:
+                    await safe_edit_text(
+                        callback.message,
+                        CHART_BUSY_TEXT,
+                        reply_markup=get_chart_type_keyboard(),
+                    )
+                    await callback.answer()
+                    return
+
+        if not file_id and not chart_buf:
             await safe_edit_text(
                 callback.message,
                 "Недостаточно данных для графика за этот период. 😔\nПопробуй /log!",
             )
             return
 
-        period_name = "сегодня" if period == "day" else "последние 7 дней"
-        photo = BufferedInputFile(chart_buf.read(), filename=f"chart_{period}.png")
+        caption = f"Твой график настроения за {CHART_PERIOD_NAMES[period]} 📊"
 
         # Delete the "Drawing..." message and send photo
         try:
@@ -181,9 +219,31 @@ async def process_chart_selection(callback: types.CallbackQuery):
             # Ignore if message cannot be deleted (already deleted or too old)
             pass
 
-        await callback.message.answer_photo(
-            photo=photo, caption=f"Твой график настроения за {period_name} 📊"
-        )
+        if file_id:
+            try:
+                await callback.message.answer_photo(photo=file_id, caption=caption)
+                await callback.answer()
+                return
+            except TelegramBadRequest:
+                # file_id is no longer valid, upload the image again
+                forget_chart_file_id(chart.key)
+                try:
+                    chart_buf = await render_mood_chart(chart)
+                except ChartQueueFull:
+                    # "Рисую график..." is deleted already, answer anew
+                    await callback.message.answer(
+                        CHART_BUSY_TEXT, reply_markup=get_chart_type_keyboard()
+                    )
+                    await callback.answer()
+                    return
+                if not chart_buf:
+                    await callback.answer()
+                    return
+
+        photo = BufferedInputFile(chart_buf.read(), filename=f"chart_{period}.png")
+        sent = await callback.message.answer_photo(photo=photo, caption=caption)
+        if sent.photo:
+            remember_chart_file_id(chart.key, sent.photo[-1].file_id)
         await callback.answer()
     except Exception as e:
         import logging
@@ -214,35 +274,43 @@ async def process_rating(callback: types.CallbackQuery, state: FSMContext):
 
 
 @tracking_router.message(TrackingState.waiting_for_note)
-async def process_note(message: types.Message, state: FSMContext):
+async def process_note(message: types.Message, state: FSMContext, user: User | None):
     """Handles the text note."""
     data = await state.get_data()
     rating = data.get("rating")
     note = message.text
 
-    user, _ = await User.get_or_create(
-        telegram_id=message.from_user.id,
-        defaults={"username": message.from_user.username},
-    )
+    if user is None:
+        user, _ = await User.get_or_create(
+            telegram_id=message.from_user.id,
+            defaults={"username": message.from_user.username},
+        )
+        remember_user(user)
 
-    await MoodLog.create(user=user, value=rating, note=note)
+    await mood_log_writer.write(user, rating, note)
+    invalidate_chart_cache(message.from_user.id)
 
     await state.clear()
     await message.answer("✅ Запись сохранена!")
 
 
 @tracking_router.callback_query(F.data == "skip_note", TrackingState.waiting_for_note)
-async def process_skip_note(callback: types.CallbackQuery, state: FSMContext):
+async def process_skip_note(
+    callback: types.CallbackQuery, state: FSMContext, user: User | None
+):
     """Handles skipping the note."""
     data = await state.get_data()
     rating = data.get("rating")
 
-    user, _ = await User.get_or_create(
-        telegram_id=callback.from_user.id,
-        defaults={"username": callback.from_user.username},
-    )
+    if user is None:
+        user, _ = await User.get_or_create(
+            telegram_id=callback.from_user.id,
+            defaults={"username": callback.from_user.username},
+        )
+        remember_user(user)
 
-    await MoodLog.create(user=user, value=rating, note=None)
+    await mood_log_writer.write(user, rating, None)
+    invalidate_chart_cache(callback.from_user.id)
 
     await state.clear()
     await safe_edit_text(
@@ -0,0 +1,154 @@
+import json
+import logging
+import os
+import queue
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# "text" (default) or "json", one object per line
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+# Per-logger levels, e.g. "aiogram.event=WARNING,tortoise=INFO"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# Max warnings/errors from one line of code per interval, the rest is dropped
+LOG_REPEAT_LIMIT = int(os.getenv("LOG_REPEAT_LIMIT", "10"))
+LOG_REPEAT_INTERVAL = float(os.getenv("LOG_REPEAT_INTERVAL", "60"))
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Added to every record, so the lines of one update can be found together
+CONTEXT_FIELDS = ("update_id", "user_id", "handler", "duration")
+
+_log_context: ContextVar[dict] = ContextVar("log_context", default={})
+
+
+@contextmanager
+def log_context(**fields):
+    """Adds fields to every record logged inside the block."""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name, value in _log_context.get().items():
+            if not hasattr(record, name):
+                setattr(record, name, value)
+        return True
+
+
+class _Window:
+    __slots__ = ("started_at", "count", "suppressed")
+
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+        self.count = 0
+        self.suppressed = 0
+
+
+class RepeatedMessageFilter(logging.Filter):
+    """
+    Limits warnings and errors coming from the same line of code, e.g. one
+    failure per user when a whole reminder batch fails. The messages are
+    f-strings, so they are grouped by call site rather than by text.
+    The number of dropped messages is added to the next one let through.
+    """
+
+    def __init__(
+        self, limit: int = LOG_REPEAT_LIMIT, interval: float = LOG_REPEAT_INTERVAL
+    ):
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self._windows: dict[tuple, _Window] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.limit <= 0:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window.started_at >= self.interval:
+            suppressed = window.suppressed if window else 0
+            window = self._windows[key] = _Window(now)
+            if suppressed:
+                record.msg = (
+                    f"{record.getMessage()} "
+                    f"(+{suppressed} similar messages suppressed)"
+                )
+                record.args = None
+
+        window.count += 1
+        if window.count <= self.limit:
+            return True
+        window.suppressed += 1
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in CONTEXT_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                data[name] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _LoopQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue stays in this process, so the record is passed as is
+        # (the default implementation formats it here, on the event loop)
+        return record
+
+
+def _parse_levels(spec: str) -> dict[str, str]:
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.strip().partition("=")
+        if name and level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging() -> QueueListener:
+    """
+    Log calls only put records into a queue. Formatting and writing to
+    stderr happen in the listener's thread, off the event loop.
+    The caller must stop the returned listener to flush the queue.
+    """
+    output = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _LoopQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    queue_handler.addFilter(RepeatedMessageFilter())
+
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL.upper())
+    for name, level in _parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    listener = QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    return listener
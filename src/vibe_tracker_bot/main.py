@@ -1,76 +1,224 @@
 import asyncio
+import hashlib
+import json
 import logging
 import os
-from aiogram import Bot, Dispatcher
-from aiogram.types import BotCommand
-from dotenv import load_dotenv
 
-from src.vibe_tracker_bot.database.core import init_db, close_db
-from src.vibe_tracker_bot.handlers import common, tracking, reminders
-from src.vibe_tracker_bot.middlewares.event_logging import LoggingMiddleware
-from src.vibe_tracker_bot.services.scheduler import start_scheduler
+# Imported first, so the time spent in the imports below is measured
+from src.vibe_tracker_bot.startup_profile import startup_profile
 
-# Load environment variables
+from aiogram import Bot, Dispatcher  # noqa: E402
+from aiogram.fsm.storage.redis import RedisStorage  # noqa: E402
+from aiogram.types import BotCommand  # noqa: E402
+from dotenv import load_dotenv  # noqa: E402
+from redis.asyncio import Redis  # noqa: E402
+from tortoise import Tortoise  # noqa: E402
+
+# Load environment variables before modules read their settings at import
 load_dotenv()
 
+from src.vibe_tracker_bot.database.core import init_db, close_db  # noqa: E402
+from src.vibe_tracker_bot.database.models import BotSetting  # noqa: E402
+from src.vibe_tracker_bot.handlers import (  # noqa: E402
+    common,
+    history,
+    reminders,
+    tracking,
+)
+from src.vibe_tracker_bot.logging_setup import setup_logging  # noqa: E402
+from src.vibe_tracker_bot.middlewares.event_logging import (  # noqa: E402
+    LoggingMiddleware,
+)
+from src.vibe_tracker_bot.middlewares.user_context import (  # noqa: E402
+    UserMiddleware,
+)
+from src.vibe_tracker_bot.services.chart_renderer import (  # noqa: E402
+    chart_render_service,
+)
+from src.vibe_tracker_bot.services.leader import (  # noqa: E402
+    Lease,
+    LocalLease,
+    RedisLease,
+)
+from src.vibe_tracker_bot.services.log_writer import mood_log_writer  # noqa: E402
+from src.vibe_tracker_bot.services.metrics import (  # noqa: E402
+    instrument_db_client,
+    set_ready,
+    start_metrics_server,
+)
+from src.vibe_tracker_bot.services.scheduler import start_scheduler  # noqa: E402
+from src.vibe_tracker_bot.webhook import (  # noqa: E402
+    on_webhook_startup,
+    run_webhook,
+)
+
+startup_profile.mark("imports")
+
+# "polling" (default) or "webhook", see webhook.py for its settings
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+# Needed when running several replicas: shared FSM states and scheduler leadership
+REDIS_URL = os.getenv("REDIS_URL", "")
+# Log the duration of every startup step, not only the total
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "0") == "1"
+# Time from start to taking updates, a warning is logged when it is exceeded
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "10"))
+
+
+BOT_COMMANDS = [
+    BotCommand(command="start", description="Начать работу"),
+    BotCommand(command="log", description="Отметить вайб"),
+    BotCommand(command="stats", description="Статистика"),
+    BotCommand(command="moodchart", description="График настроения"),
+    BotCommand(command="reminders", description="Напоминания"),
+    BotCommand(command="export", description="Выгрузить историю"),
+    BotCommand(command="import", description="Загрузить историю из CSV"),
+]
+
+
+def _commands_hash(commands: list[BotCommand]) -> str:
+    data = json.dumps([command.model_dump() for command in commands], sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
 
 async def set_commands(bot: Bot):
-    """Sets the bot's command list."""
-    commands = [
-        BotCommand(command="start", description="Начать работу"),
-        BotCommand(command="log", description="Отметить вайб"),
-        BotCommand(command="stats", description="Статистика"),
-        BotCommand(command="moodchart", description="График настроения"),
-        BotCommand(command="reminders", description="Напоминания"),
-    ]
-    await bot.set_my_commands(commands)
-
-
-async def on_startup(dispatcher: Dispatcher, bot: Bot):
+    """
+    Sets the bot's command list. Its hash is kept in the DB, so restarts
+    and other replicas skip the API call while the list is unchanged
+    (delete the bot_settings row to send it again).
+    """
+    key = f"commands_hash:{bot.id}"
+    commands_hash = _commands_hash(BOT_COMMANDS)
+    stored = await BotSetting.get_or_none(key=key)
+    if stored and stored.value == commands_hash:
+        logging.info("Bot commands are up to date")
+        return
+
+    await bot.set_my_commands(BOT_COMMANDS)
+    await BotSetting.update_or_create(key=key, defaults={"value": commands_hash})
+    logging.info("Bot commands updated")
+
+
+async def on_startup(dispatcher: Dispatcher, bot: Bot, scheduler_lease: Lease):
     logging.info("Starting up...")
-    await init_db()
-    # Start scheduler after DB is ready
-    start_scheduler(bot)
+    # Worker processes import and warm up the chart backend in the background
+    chart_render_service.start()
+    # The metrics server (and the readiness probe) doesn't need the DB and
+    # starts meanwhile. Tortoise keeps its state in a context variable, so
+    # init_db itself runs in this task, not in a child one.
+    metrics_task = asyncio.ensure_future(
+        startup_profile.run("metrics_server", start_metrics_server())
+    )
+    await startup_profile.run("init_db", init_db())
+    dispatcher["metrics_runner"] = await metrics_task
+    instrument_db_client(Tortoise.get_connection("default"))
+    mood_log_writer.start()
+    # Both only need the DB, the command list also waits for Telegram
+    _, dispatcher["scheduler"] = await asyncio.gather(
+        startup_profile.run("set_commands", set_commands(bot)),
+        startup_profile.run("scheduler", start_scheduler(bot, scheduler_lease)),
+    )
+
 
+async def on_ready():
+    """Last startup hook: the DB is up and the bot is registered."""
+    set_ready(True)
+    startup_profile.ready(STARTUP_BUDGET_SECONDS, detailed=STARTUP_PROFILE)
 
-async def on_shutdown(dispatcher: Dispatcher):
+
+async def on_shutdown(dispatcher: Dispatcher, scheduler_lease: Lease):
     logging.info("Shutting down...")
+    # Stop receiving traffic before anything is torn down
+    set_ready(False)
+    # No tick may start after this: it would take the lease again or run
+    # after the DB is closed
+    scheduler = dispatcher.workflow_data.get("scheduler")
+    if scheduler:
+        scheduler.shutdown(wait=False)
+        # AsyncIOScheduler stops in a loop callback, let it run
+        await asyncio.sleep(0)
+    # Let another replica take over reminders without waiting for expiry
+    await scheduler_lease.release()
+    # Commit logs still waiting in the queue before the DB is closed
+    await mood_log_writer.stop()
+    chart_render_service.shutdown()
     await close_db()
+    metrics_runner = dispatcher.workflow_data.get("metrics_runner")
+    if metrics_runner:
+        await metrics_runner.cleanup()
 
 
-async def main():
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    )
+def create_dispatcher() -> Dispatcher:
+    """
+    Without REDIS_URL FSM states live in memory and this process always runs
+    the scheduler. With it, states are shared between replicas and only the
+    replica holding the Redis lease sends reminders.
+    """
+    if not REDIS_URL:
+        dp = Dispatcher()
+        dp["scheduler_lease"] = LocalLease()
+        return dp
 
-    bot_token = os.getenv("BOT_TOKEN")
-    if not bot_token:
-        logging.error("BOT_TOKEN is not set in environment variables")
-        return
+    redis = Redis.from_url(REDIS_URL)
+    dp = Dispatcher(storage=RedisStorage(redis=redis))
+    dp["scheduler_lease"] = RedisLease(redis)
+    return dp
 
-    bot = Bot(token=bot_token)
-    dp = Dispatcher()
 
+async def _record_first_update(handler, event, data):
+    try:
+        return await handler(event, data)
+    finally:
+        startup_profile.update_processed()
+
+
+def setup_dispatcher(dp: Dispatcher) -> None:
+    """Registers middlewares and routers (routers can be attached only once)."""
     # Register middlewares
+    dp.update.outer_middleware(_record_first_update)
     dp.message.middleware(LoggingMiddleware())
     dp.callback_query.middleware(LoggingMiddleware())
+    dp.message.middleware(UserMiddleware())
+    dp.callback_query.middleware(UserMiddleware())
 
     # Register routers
     dp.include_router(common.router)
     dp.include_router(tracking.tracking_router)
     dp.include_router(reminders.router)
+    dp.include_router(history.router)
+
+
+async def main():
+    # Configure logging, records are written from a background thread
+    log_listener = setup_logging()
+    try:
+        await run_bot()
+    finally:
+        log_listener.stop()
+
+
+async def run_bot():
+    bot_token = os.getenv("BOT_TOKEN")
+    if not bot_token:
+        logging.error("BOT_TOKEN is not set in environment variables")
+        return
+
+    bot = Bot(token=bot_token)
+    dp = create_dispatcher()
+    setup_dispatcher(dp)
 
     # Register startup/shutdown hooks
     dp.startup.register(on_startup)
+    if BOT_MODE == "webhook":
+        dp.startup.register(on_webhook_startup)
+    dp.startup.register(on_ready)
     dp.shutdown.register(on_shutdown)
 
-    logging.info("Bot started")
+    logging.info(f"Bot started in {BOT_MODE} mode")
     try:
-        # Set commands on startup
-        await set_commands(bot)
-        await dp.start_polling(bot)
+        if BOT_MODE == "webhook":
+            await run_webhook(dp, bot)
+        else:
+            await dp.start_polling(bot)
     except Exception as e:
         logging.error(f"An error occurred: {e}")
     finally:
@@ -1,12 +1,33 @@
+import os
+import random
 import time
 import logging
 from typing import Callable, Dict, Any, Awaitable
 
 from aiogram import BaseMiddleware
-from aiogram.types import TelegramObject
+from aiogram.types import CallbackQuery, TelegramObject
+
+from ..logging_setup import log_context
+from ..services.metrics import (
+    callbacks_total,
+    handler_duration,
+    handler_errors_total,
+    updates_total,
+)
 
 logger = logging.getLogger(__name__)
 
+# Share of handled events written to the log, slow ones are always logged
+LOG_EVENT_SAMPLE_RATE = float(os.getenv("LOG_EVENT_SAMPLE_RATE", "1.0"))
+SLOW_HANDLER_SECONDS = float(os.getenv("SLOW_HANDLER_SECONDS", "1.0"))
+
+
+def _handler_name(data: Dict[str, Any]) -> str:
+    # Set by aiogram for inner middlewares: the handler chosen by the filters
+    handler = data.get("handler")
+    callback = getattr(handler, "callback", None)
+    return getattr(callback, "__name__", "unknown")
+
 
 class LoggingMiddleware(BaseMiddleware):
     async def __call__(
@@ -15,36 +36,54 @@ class LoggingMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        start_time = time.time()
-
-        # Process the event
-        result = await handler(event, data)
+        event_name = event.__class__.__name__
+        handler_name = _handler_name(data)
 
-        # Calculate duration
-        duration = time.time() - start_time
+        updates_total.labels(event_name).inc()
+        if isinstance(event, CallbackQuery):
+            # "rate:7" -> "rate", so the label set stays small
+            prefix = (event.data or "").split(":", 1)[0]
+            callbacks_total.labels(prefix).inc()
 
         # Get event info
-        event_name = event.__class__.__name__
         user_id = "unknown"
 
         # Try to extract user_id safely
         # "from_user" exists on Message, CallbackQuery, InlineQuery, etc.
         if hasattr(event, "from_user") and event.from_user:
             user_id = event.from_user.id
-        elif (
-            hasattr(event, "message")
-            and hasattr(event.message, "from_user")
-            and event.message.from_user
+
+        update = data.get("event_update")
+        with log_context(
+            update_id=getattr(update, "update_id", None),
+            user_id=user_id,
+            handler=handler_name,
         ):
-            # Fallback for events that might not have from_user directly
-            pass
-
-        # Log if slow (> 1s)
-        if duration > 1.0:
-            logger.warning(
-                f"SLOW HANDLER: {event_name} from {user_id} took {duration:.2f}s"
-            )
-        else:
-            logger.info(f"Handled {event_name} from {user_id} in {duration:.2f}s")
+            start_time = time.perf_counter()
+            try:
+                # Process the event
+                result = await handler(event, data)
+            except Exception:
+                handler_errors_total.labels(handler_name).inc()
+                raise
+            finally:
+                # Calculate duration
+                duration = time.perf_counter() - start_time
+                handler_duration.labels(handler_name).observe(duration)
+
+            extra = {"duration": round(duration, 4)}
+            # Log if slow
+            if duration > SLOW_HANDLER_SECONDS:
+                logger.warning(
+                    f"SLOW HANDLER: {handler_name} ({event_name} from {user_id}) "
+                    f"took {duration:.2f}s",
+                    extra=extra,
+                )
+            elif random.random() < LOG_EVENT_SAMPLE_RATE:
+                logger.info(
+                    f"Handled {event_name} from {user_id} by {handler_name} "
+                    f"in {duration:.3f}s",
+                    extra=extra,
+                )
 
         return result
@@ -0,0 +1,23 @@
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from src.vibe_tracker_bot.services.user_cache import get_user
+
+
+class UserMiddleware(BaseMiddleware):
+    """
+    Resolves the bot's User for the sender once per update and passes it
+    to handlers as `user` (None if the user hasn't run /start yet).
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        from_user = data.get("event_from_user")
+        data["user"] = await get_user(from_user.id) if from_user else None
+        return await handler(event, data)
@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    Small in-process LRU cache with per-entry TTL.
+    Optionally limits total size of stored values (e.g. bytes of PNG images)
+    using the `sizeof` callback. Keeps hit/miss counters for monitoring.
+    Not thread-safe: meant to be used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        max_items: int,
+        ttl: float,
+        max_size: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ):
+        self.max_items = max_items
+        self.ttl = ttl
+        self.max_size = max_size
+        self.sizeof = sizeof or (lambda value: 0)
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        # key -> (expires_at, value)
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        size = self.sizeof(value)
+        if self.max_size is not None and size > self.max_size:
+            # Would evict everything else and still not fit
+            return
+
+        if key in self._data:
+            self._remove(key)
+
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._size += size
+        self._evict()
+
+    def discard(self, key: Hashable) -> None:
+        if key in self._data:
+            self._remove(key)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Removes all entries whose key matches the predicate."""
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._size = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "items": len(self._data),
+            "size": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, value = self._data.pop(key)
+        self._size -= self.sizeof(value)
+
+    def _evict(self) -> None:
+        while len(self._data) > self.max_items or (
+            self.max_size is not None and self._size > self.max_size
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
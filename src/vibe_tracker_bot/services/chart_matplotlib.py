@@ -0,0 +1,150 @@
+import io
+from datetime import date, timedelta
+
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .charts import HEATMAP_PERIODS
+
+FIGURE_SIZE = (10, 6)
+# A year is a 7-cell high strip, a full-height figure would be mostly empty
+YEAR_HEATMAP_SIZE = (10, 3)
+
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def create_figure() -> Figure:
+    fig = Figure(figsize=FIGURE_SIZE, dpi=100)
+    FigureCanvasAgg(fig)  # Attach canvas
+    return fig
+
+
+def draw_chart(
+    dates: list, values: list, title: str, period: str, fig: Figure | None = None
+) -> io.BytesIO:
+    """
+    Synchronous function to draw chart using matplotlib (OO interface).
+    A pre-created figure can be passed to be reused (it is cleared first).
+    """
+    # Create figure and axes directly (Stateless approach)
+    if fig is None:
+        fig = create_figure()
+    else:
+        fig.clear()
+        fig.set_size_inches(FIGURE_SIZE)
+
+    if period in HEATMAP_PERIODS:
+        _draw_heatmap(fig, dates, values, title, period)
+        return _to_png(fig)
+
+    ax = fig.add_subplot(111)
+
+    # Plot data
+    ax.plot(
+        dates,
+        values,
+        marker="o",
+        linestyle="-",
+        color="#4CAF50",
+        linewidth=2,
+        markersize=8,
+    )
+
+    # Customize axes
+    ax.set_title(title, fontsize=14, pad=10)
+    ax.set_ylabel("Vibe Level", fontsize=12)
+    ax.set_ylim(0, 11)  # 0 to 11 to show 1 and 10 clearly
+    ax.set_yticks(range(1, 11))
+    ax.grid(True, linestyle="--", alpha=0.7)
+
+    # Format Date Axis
+    if period == "day":
+        date_fmt = mdates.DateFormatter("%H:%M")
+        ax.xaxis.set_major_formatter(date_fmt)
+        # Ensure we see some hours if few points
+        ax.xaxis.set_major_locator(mdates.HourLocator(interval=2))
+    else:
+        date_fmt = mdates.DateFormatter("%d.%m")
+        ax.xaxis.set_major_formatter(date_fmt)
+        ax.xaxis.set_major_locator(mdates.DayLocator())
+
+    # A single moment makes matplotlib autoscale to years, keep a sane range
+    if len(set(dates)) == 1:
+        pad = timedelta(hours=1) if period == "day" else timedelta(days=1)
+        ax.set_xlim(dates[0] - pad, dates[0] + pad)
+
+    fig.autofmt_xdate()
+    return _to_png(fig)
+
+
+def _to_png(fig: Figure) -> io.BytesIO:
+    # Save to buffer using FigureCanvasAgg
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    buf.seek(0)
+
+    # No need to plt.close(fig) as we didn't use the global state
+    return buf
+
+
+def _calendar_grid(dates: list, values: list) -> tuple[np.ndarray, date]:
+    """
+    Lays consecutive daily values out as weeks x weekdays, NaN where there
+    is no value. Returns the grid and the Monday of its first week.
+    """
+    first_monday = dates[0] - timedelta(days=dates[0].weekday())
+    offsets = np.arange(len(dates)) + dates[0].weekday()
+    grid = np.full((offsets[-1] // 7 + 1, 7), np.nan)
+    grid[offsets // 7, offsets % 7] = values
+    return grid, first_monday
+
+
+def _draw_heatmap(
+    fig: Figure, dates: list, values: list, title: str, period: str
+) -> None:
+    """
+    Calendar of daily averages: one cell per day, empty days left grey.
+    A month reads like a calendar page (a row per week), a year like
+    a contribution graph (a column per week).
+    """
+    grid, first_monday = _calendar_grid(dates, values)
+    cmap = colormaps["RdYlGn"].with_extremes(bad="#EEEEEE")
+    ax = fig.add_subplot(111)
+
+    if period == "year":
+        fig.set_size_inches(YEAR_HEATMAP_SIZE)
+        image = ax.imshow(grid.T, cmap=cmap, vmin=1, vmax=10)
+        ax.set_yticks(range(7), WEEKDAY_NAMES)
+        # Month name over the week with the 1st day of the month
+        weeks = [
+            week
+            for week in range(grid.shape[0])
+            if (first_monday + timedelta(weeks=week, days=6)).day <= 7
+        ]
+        ax.set_xticks(
+            weeks,
+            [
+                (first_monday + timedelta(weeks=week, days=6)).strftime("%b")
+                for week in weeks
+            ],
+        )
+        fig.colorbar(
+            image, ax=ax, orientation="horizontal", label="Vibe Level", aspect=60
+        )
+    else:
+        image = ax.imshow(grid, cmap=cmap, vmin=1, vmax=10)
+        ax.set_xticks(range(7), WEEKDAY_NAMES)
+        ax.xaxis.tick_top()
+        ax.set_yticks([])
+        for day in dates:
+            week, weekday = divmod((day - first_monday).days, 7)
+            ax.text(weekday, week, day.strftime("%d.%m"), ha="center", va="center")
+        fig.colorbar(image, ax=ax, label="Vibe Level")
+
+    ax.set_title(title, fontsize=14, pad=10)
+    ax.tick_params(length=0)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
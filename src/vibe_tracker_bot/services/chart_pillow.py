@@ -0,0 +1,156 @@
+import io
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Same canvas as the matplotlib figure (10x6 inches at 100 dpi)
+WIDTH, HEIGHT = 1000, 600
+DPI = 100
+# Drawn at a larger size and scaled down: Pillow lines are not antialiased
+SUPERSAMPLE = 2
+
+# Plot area margins: left, top, right, bottom
+MARGINS = (125, 72, 100, 120)
+
+LINE_COLOR = "#4CAF50"
+GRID_COLOR = "#C8C8C8"
+TEXT_COLOR = "#000000"
+LINE_WIDTH = 3
+MARKER_RADIUS = 5.5
+
+Y_MIN, Y_MAX = 0, 11
+
+
+@lru_cache(maxsize=None)
+def _font(points: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.load_default(size=round(points * DPI / 72) * SUPERSAMPLE)
+
+
+def _x_ticks(start: datetime, end: datetime, period: str) -> list[datetime]:
+    """Every 2 hours for a day, every midnight otherwise (as in matplotlib)."""
+    step = timedelta(hours=2) if period == "day" else timedelta(days=1)
+    tick = datetime.combine(start.date(), time())
+    ticks = []
+    while tick <= end:
+        if tick >= start:
+            ticks.append(tick)
+        tick += step
+    return ticks
+
+
+def _x_range(dates: list, period: str) -> tuple[datetime, datetime]:
+    start, end = min(dates), max(dates)
+    if start == end:
+        # A single moment, keep a sane range around it
+        pad = timedelta(hours=1) if period == "day" else timedelta(days=1)
+        return start - pad, end + pad
+    # Matplotlib adds 5% on both sides
+    pad = (end - start) * 0.05
+    return start - pad, end + pad
+
+
+def _dashed_line(draw: ImageDraw.ImageDraw, start, end, dash: float, width: int):
+    (x0, y0), (x1, y1) = start, end
+    length = max(abs(x1 - x0), abs(y1 - y0))
+    position = 0.0
+    while position < length:
+        a = position / length
+        b = min(position + dash, length) / length
+        segment = (
+            x0 + (x1 - x0) * a,
+            y0 + (y1 - y0) * a,
+            x0 + (x1 - x0) * b,
+            y0 + (y1 - y0) * b,
+        )
+        draw.line(segment, fill=GRID_COLOR, width=width)
+        position += dash * 2
+
+
+def _rotated_text(
+    image: Image.Image, text: str, font, anchor_xy: tuple, angle: float
+) -> None:
+    """Pastes text rotated around its right end, which stays at anchor_xy."""
+    left, top, right, bottom = font.getbbox(text)
+    label = Image.new("RGBA", (right + 2, bottom + 2), (255, 255, 255, 0))
+    ImageDraw.Draw(label).text((0, 0), text, font=font, fill=TEXT_COLOR)
+    rotated = label.rotate(angle, expand=True, resample=Image.BICUBIC)
+    x, y = anchor_xy
+    if angle == 90:
+        position = (x - rotated.width // 2, y - rotated.height // 2)
+    else:
+        position = (x - rotated.width, y)
+    image.paste(rotated, (int(position[0]), int(position[1])), rotated)
+
+
+def draw_line_chart(dates: list, values: list, title: str, period: str) -> io.BytesIO:
+    """
+    Line chart with markers drawn directly with Pillow, laid out like the
+    matplotlib one: same size, colors, axis ranges and tick labels.
+    Needs a fraction of matplotlib's render time and memory.
+    """
+    s = SUPERSAMPLE
+    image = Image.new("RGB", (WIDTH * s, HEIGHT * s), "white")
+    draw = ImageDraw.Draw(image)
+
+    left, top, right, bottom = (m * s for m in MARGINS)
+    plot_right, plot_bottom = WIDTH * s - right, HEIGHT * s - bottom
+
+    x_start, x_end = _x_range(dates, period)
+    x_span = (x_end - x_start).total_seconds()
+
+    def to_x(moment: datetime) -> float:
+        return left + (moment - x_start).total_seconds() / x_span * (plot_right - left)
+
+    def to_y(value: float) -> float:
+        return plot_bottom - (value - Y_MIN) / (Y_MAX - Y_MIN) * (plot_bottom - top)
+
+    tick_font = _font(10)
+
+    # Grid and y axis labels
+    for value in range(1, 11):
+        y = to_y(value)
+        _dashed_line(draw, (left, y), (plot_right, y), 5 * s, s)
+        draw.text(
+            (left - 8 * s, y), str(value), font=tick_font, fill=TEXT_COLOR, anchor="rm"
+        )
+
+    # Grid and rotated x axis labels
+    label_format = "%H:%M" if period == "day" else "%d.%m"
+    for tick in _x_ticks(x_start, x_end, period):
+        x = to_x(tick)
+        _dashed_line(draw, (x, top), (x, plot_bottom), 5 * s, s)
+        _rotated_text(
+            image, tick.strftime(label_format), tick_font, (x, plot_bottom + 6 * s), 30
+        )
+
+    # Frame
+    draw.rectangle((left, top, plot_right, plot_bottom), outline=TEXT_COLOR, width=s)
+
+    # Data
+    points = [(to_x(moment), to_y(value)) for moment, value in zip(dates, values)]
+    if len(points) > 1:
+        draw.line(points, fill=LINE_COLOR, width=LINE_WIDTH * s, joint="curve")
+    radius = MARKER_RADIUS * s
+    for x, y in points:
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=LINE_COLOR)
+
+    # Title and y axis label
+    draw.text(
+        ((left + plot_right) / 2, top - 12 * s),
+        title,
+        font=_font(14),
+        fill=TEXT_COLOR,
+        anchor="md",
+    )
+    _rotated_text(
+        image, "Vibe Level", _font(12), (left - 42 * s, (top + plot_bottom) / 2), 90
+    )
+
+    # Box averaging is enough for the supersampled image and 10x faster
+    # than LANCZOS. Fast compression: Telegram recompresses photos anyway.
+    image = image.reduce(SUPERSAMPLE)
+    buf = io.BytesIO()
+    image.save(buf, format="PNG", compress_level=1)
+    buf.seek(0)
+    return buf
@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Hashable
+
+from src.vibe_tracker_bot.services.metrics import chart_render_duration, registry
+
+logger = logging.getLogger(__name__)
+
+# 0 workers means rendering in the default thread executor (no process pool)
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", "2"))
+# Max renders waiting or running at once, the rest is rejected
+CHART_RENDER_QUEUE_SIZE = int(os.getenv("CHART_RENDER_QUEUE_SIZE", "16"))
+
+# Figure reused by all renders of a worker process
+_worker_figure = None
+
+
+class ChartQueueFull(Exception):
+    """Raised when too many charts are being rendered already."""
+
+
+def _init_worker() -> None:
+    """
+    Runs once in every worker process: imports the chart backend and draws
+    a dummy chart so fonts, caches and the figure are ready before the first
+    request. The Pillow backend needs no figure.
+    """
+    global _worker_figure
+    from src.vibe_tracker_bot.services.charts import CHART_BACKEND, _draw_chart
+
+    if CHART_BACKEND != "pillow":
+        from src.vibe_tracker_bot.services.chart_matplotlib import create_figure
+
+        _worker_figure = create_figure()
+    now = datetime.now()
+    _draw_chart([now - timedelta(hours=1), now], [5, 6], "", "day", _worker_figure)
+
+
+def _render_in_worker(dates: list, values: list, title: str, period: str) -> bytes:
+    from src.vibe_tracker_bot.services.charts import _draw_chart
+
+    return _draw_chart(dates, values, title, period, _worker_figure).getvalue()
+
+
+def _render_in_thread(dates: list, values: list, title: str, period: str) -> bytes:
+    from src.vibe_tracker_bot.services.charts import _draw_chart
+
+    return _draw_chart(dates, values, title, period).getvalue()
+
+
+def _warm_up_thread() -> None:
+    now = datetime.now()
+    _render_in_thread([now - timedelta(hours=1), now], [5, 6], "", "day")
+
+
+def _log_warm_up_error(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception():
+        logger.error(f"Chart backend warm-up failed: {future.exception()!r}")
+
+
+class ChartRenderService:
+    """
+    Renders charts in a dedicated process pool, so CPU-bound matplotlib work
+    doesn't compete with the event loop for the GIL.
+    Limits the number of queued renders and merges identical requests
+    that are already in flight.
+    """
+
+    def __init__(
+        self,
+        workers: int = CHART_RENDER_WORKERS,
+        queue_size: int = CHART_RENDER_QUEUE_SIZE,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor: ProcessPoolExecutor | None = None
+        self._warm_up: asyncio.Future | None = None
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+        # Metrics
+        self.rendered = 0
+        self.rejected = 0
+        self.deduplicated = 0
+        self.restarts = 0
+        self.render_time_total = 0.0
+        self.render_time_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._in_flight)
+
+    def start(self) -> None:
+        if self._executor or self._warm_up:
+            return
+        if self.workers <= 0:
+            # Import the chart backend in the background, so neither startup
+            # nor the first chart waits for it
+            self._warm_up = asyncio.get_running_loop().run_in_executor(
+                None, _warm_up_thread
+            )
+            # Nobody awaits it, errors would only show up on the first chart
+            self._warm_up.add_done_callback(_log_warm_up_error)
+            return
+        self._executor = self._create_executor()
+        logger.info(f"Chart render pool started with {self.workers} workers")
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        # Spawn workers right away instead of on the first request
+        for _ in range(self.workers):
+            executor.submit(time.sleep, 0)
+        return executor
+
+    def _replace_broken_executor(self, broken: ProcessPoolExecutor) -> None:
+        # Renders that failed together replace the pool only once
+        if self._executor is not broken:
+            return
+        logger.warning("Chart render pool is broken (a worker died), restarting it")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._create_executor()
+        self.restarts += 1
+
+    def shutdown(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def render(
+        self, key: Hashable, dates: list, values: list, title: str, period: str
+    ) -> bytes:
+        """
+        Returns PNG bytes of the chart. Raises ChartQueueFull when overloaded.
+        Requests with the same key share one render.
+        """
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.deduplicated += 1
+            return await asyncio.shield(in_flight)
+
+        if len(self._in_flight) >= self.queue_size:
+            self.rejected += 1
+            raise ChartQueueFull()
+
+        future = asyncio.ensure_future(self._run(dates, values, title, period))
+        self._in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._in_flight.pop(key, None)
+            else:
+                # Caller was cancelled, others may still wait for the result
+                future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+    async def _run(self, dates: list, values: list, title: str, period: str):
+        started_at = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        if self._executor:
+            executor = self._executor
+            try:
+                image = await loop.run_in_executor(
+                    executor, _render_in_worker, dates, values, title, period
+                )
+            except BrokenProcessPool:
+                # A worker was killed (e.g. out of memory). The pool refuses
+                # all work after that, so start a new one and retry once.
+                self._replace_broken_executor(executor)
+                image = await loop.run_in_executor(
+                    self._executor, _render_in_worker, dates, values, title, period
+                )
+        else:
+            image = await asyncio.to_thread(
+                _render_in_thread, dates, values, title, period
+            )
+
+        duration = time.perf_counter() - started_at
+        chart_render_duration.observe(duration)
+        self.rendered += 1
+        self.render_time_total += duration
+        self.render_time_max = max(self.render_time_max, duration)
+        return image
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "rendered": self.rendered,
+            "rejected": self.rejected,
+            "deduplicated": self.deduplicated,
+            "restarts": self.restarts,
+            "render_time_avg": (
+                self.render_time_total / self.rendered if self.rendered else 0.0
+            ),
+            "render_time_max": self.render_time_max,
+        }
+
+
+chart_render_service = ChartRenderService()
+
+registry.gauge(
+    "bot_chart_render_queue_depth",
+    "Chart renders waiting or running",
+    lambda: chart_render_service.queue_depth,
+)
+registry.gauge(
+    "bot_chart_render_requests",
+    "Chart render requests: rendered, served by an identical render in "
+    "flight, or rejected because the queue was full",
+    lambda: {
+        "rendered": chart_render_service.rendered,
+        "deduplicated": chart_render_service.deduplicated,
+        "rejected": chart_render_service.rejected,
+    },
+    ["result"],
+)
+registry.gauge(
+    "bot_chart_render_pool_restarts",
+    "Render pools replaced after a worker died",
+    lambda: chart_render_service.restarts,
+)
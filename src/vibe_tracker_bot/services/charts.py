@@ -1,80 +1,132 @@
-import asyncio
 import io
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_agg import FigureCanvasAgg
-import matplotlib.dates as mdates
-from datetime import datetime, timedelta
-import pytz
-from ..database.models import MoodLog, User
+import os
+from dataclasses import dataclass
+from typing import Any
+import numpy as np
+from datetime import date, datetime, time, timedelta, timezone
+from tortoise.functions import Count, Max, Sum
 
+from ..database.core import get_read_db
+from ..database.models import DailyMoodSummary, MoodLog, User
+from .cache import TTLCache
+from .chart_renderer import chart_render_service
+from .metrics import register_cache
+from .timezones import get_timezone, to_local_times
+from .user_cache import get_user
 
-def _draw_chart(dates: list, values: list, title: str, period: str) -> io.BytesIO:
+# Periods drawn from daily summaries: number of local days in the window
+SUMMARY_PERIOD_DAYS = {"week": 7, "month": 30, "year": 365}
+# Summary periods drawn as a calendar of daily averages instead of a line
+HEATMAP_PERIODS = {"month", "year"}
+
+SUMMARY_TITLES = {
+    "week": "Average Mood (Last 7 Days)",
+    "month": "Mood Heatmap (Last 30 Days)",
+    "year": "Mood Heatmap (Last 12 Months)",
+}
+
+# "matplotlib" or "pillow": Pillow draws line charts several times faster,
+# heatmaps are always drawn with matplotlib
+CHART_BACKEND = os.getenv("CHART_BACKEND", "matplotlib")
+
+CHART_CACHE_TTL = int(os.getenv("CHART_CACHE_TTL", "600"))
+CHART_CACHE_MAX_ITEMS = int(os.getenv("CHART_CACHE_MAX_ITEMS", "256"))
+CHART_CACHE_MAX_BYTES = int(os.getenv("CHART_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Rendered PNG bytes keyed by (telegram_id, period, window date, count,
+# last log time, timezone). A new log changes the key, so stale images
+# are never served, and invalidation only frees memory early.
+_chart_cache: TTLCache[bytes] = TTLCache(
+    max_items=CHART_CACHE_MAX_ITEMS,
+    ttl=CHART_CACHE_TTL,
+    max_size=CHART_CACHE_MAX_BYTES,
+    sizeof=len,
+)
+
+
+# Telegram file_id of an already uploaded chart, keyed the same way.
+# Sending by file_id skips the upload of the PNG entirely.
+CHART_FILE_ID_TTL = int(os.getenv("CHART_FILE_ID_TTL", str(24 * 60 * 60)))
+CHART_FILE_ID_MAX_ITEMS = int(os.getenv("CHART_FILE_ID_MAX_ITEMS", "10000"))
+
+_file_id_cache: TTLCache[str] = TTLCache(
+    max_items=CHART_FILE_ID_MAX_ITEMS, ttl=CHART_FILE_ID_TTL
+)
+register_cache("chart_images", _chart_cache)
+register_cache("chart_file_ids", _file_id_cache)
+
+
+def get_chart_file_id(key: tuple) -> str | None:
+    return _file_id_cache.get(key)
+
+
+def remember_chart_file_id(key: tuple, file_id: str) -> None:
+    _file_id_cache.set(key, file_id)
+
+
+def forget_chart_file_id(key: tuple) -> None:
+    _file_id_cache.discard(key)
+
+
+def invalidate_chart_cache(telegram_id: int) -> None:
+    """Drops cached charts of the user (call after the user logs something)."""
+    _chart_cache.discard_where(lambda key: key[0] == telegram_id)
+    _file_id_cache.discard_where(lambda key: key[0] == telegram_id)
+
+
+def _draw_chart(
+    dates: list, values: list, title: str, period: str, fig: Any = None
+) -> io.BytesIO:
     """
-    Synchronous function to draw chart using matplotlib (OO interface).
-    Run this in a separate thread to avoid blocking the event loop.
+    Synchronous function to draw chart with the configured backend.
+    Run this in a separate thread or process to avoid blocking the event loop.
+    Backends are imported on the first render, in the rendering pool:
+    matplotlib alone takes most of a second to import.
+    A pre-created matplotlib figure can be passed to be reused.
     """
-    # Create figure and axes directly (Stateless approach)
-    fig = Figure(figsize=(10, 6), dpi=100)
-    FigureCanvasAgg(fig)  # Attach canvas
-    ax = fig.add_subplot(111)
-
-    # Plot data
-    ax.plot(
-        dates,
-        values,
-        marker="o",
-        linestyle="-",
-        color="#4CAF50",
-        linewidth=2,
-        markersize=8,
-    )
+    if CHART_BACKEND == "pillow" and period not in HEATMAP_PERIODS:
+        from .chart_pillow import draw_line_chart
 
-    # Customize axes
-    ax.set_title(title, fontsize=14, pad=10)
-    ax.set_ylabel("Vibe Level", fontsize=12)
-    ax.set_ylim(0, 11)  # 0 to 11 to show 1 and 10 clearly
-    ax.set_yticks(range(1, 11))
-    ax.grid(True, linestyle="--", alpha=0.7)
+        return draw_line_chart(dates, values, title, period)
 
-    # Format Date Axis
-    if period == "day":
-        date_fmt = mdates.DateFormatter("%H:%M")
-        ax.xaxis.set_major_formatter(date_fmt)
-        # Ensure we see some hours if few points
-        ax.xaxis.set_major_locator(mdates.HourLocator(interval=2))
-    else:
-        date_fmt = mdates.DateFormatter("%d.%m")
-        ax.xaxis.set_major_formatter(date_fmt)
-        ax.xaxis.set_major_locator(mdates.DayLocator())
+    from .chart_matplotlib import draw_chart
 
-    fig.autofmt_xdate()
+    return draw_chart(dates, values, title, period, fig)
 
-    # Save to buffer using FigureCanvasAgg
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png")
-    buf.seek(0)
 
-    # No need to plt.close(fig) as we didn't use the global state
-    return buf
+@dataclass
+class ChartRequest:
+    """Everything needed to render a chart, plus the key of its data version."""
 
+    user: User
+    period: str
+    title: str
+    user_tz: Any
+    start_time_utc: datetime
+    key: tuple
+    # First local day of the window, for charts built from daily summaries
+    start_date: date | None = None
 
-async def generate_mood_chart(user_id: int, period: str) -> io.BytesIO | None:
+    @property
+    def end_date(self) -> date | None:
+        """Last local day of the window (today), for summary charts."""
+        if self.start_date is None:
+            return None
+        return self.start_date + timedelta(days=SUMMARY_PERIOD_DAYS[self.period] - 1)
+
+
+async def prepare_mood_chart(user: User, period: str) -> ChartRequest | None:
     """
-    Generates a mood chart for the specified period ('day' or 'week').
-    Returns a BytesIO object containing the image, or None if no data.
+    Resolves the time window for the specified period
+    ('day', 'week', 'month' or 'year')
+    and checks whether there is any data.
+    Returns None if there is nothing to draw.
     """
-    user = await User.get_or_none(telegram_id=user_id)
-    if not user:
-        return None
-
     # Resolve User Timezone
-    try:
-        user_tz = pytz.timezone(user.timezone)
-    except (pytz.UnknownTimeZoneError, AttributeError):
-        user_tz = pytz.utc
+    user_tz = get_timezone(user.timezone)
 
     # Current UTC time
-    now_utc = datetime.now(pytz.utc)
+    now_utc = datetime.now(timezone.utc)
     # Current User time
     now_user = now_utc.astimezone(user_tz)
 
@@ -82,43 +134,153 @@ async def generate_mood_chart(user_id: int, period: str) -> io.BytesIO | None:
         # Start of today in USER's timezone
         start_of_day_user = now_user.replace(hour=0, minute=0, second=0, microsecond=0)
         # Convert back to UTC for DB filtering
-        # Note: We assume DB stores Naive UTC or Aware UTC.
-        # Tortoise usually stores naive UTC if not configured otherwise.
-        start_time_utc = start_of_day_user.astimezone(pytz.utc)
+        start_time_utc = start_of_day_user.astimezone(timezone.utc)
 
         title = "Mood Chart (Today)"
-    elif period == "week":
-        # Last 7 days relative to now
-        start_time_utc = now_utc - timedelta(days=7)
-        title = "Mood Chart (Last 7 Days)"
+    elif period in SUMMARY_PERIOD_DAYS:
+        # Whole local days, today included, read from daily summaries
+        start_date = now_user.date() - timedelta(days=SUMMARY_PERIOD_DAYS[period] - 1)
+        start_of_day_user = datetime.combine(start_date, time(), user_tz)
+        start_time_utc = start_of_day_user.astimezone(timezone.utc)
+        title = SUMMARY_TITLES[period]
     else:
         return None
 
-    # Filter logs. Tortoise might expect naive datetime if fields are naive.
-    # Using naive UTC for safety with SQLite default
-    start_time_naive = start_time_utc.replace(tzinfo=None)
+    # Cheap aggregate query tells whether the data changed since the last render
+    if period in SUMMARY_PERIOD_DAYS:
+        version = (
+            await DailyMoodSummary.filter(user=user, local_date__gte=start_date)
+            .using_db(get_read_db())
+            .annotate(count=Sum("count"), last=Max("last_at"))
+            .values("count", "last")
+        )[0]
+    else:
+        start_date = None
+        version = (
+            await MoodLog.filter(user=user, created_at__gte=start_time_utc)
+            .using_db(get_read_db())
+            .annotate(count=Count("id"), last=Max("created_at"))
+            .values("count", "last")
+        )[0]
+    if not version["count"]:
+        return None
 
-    logs = await MoodLog.filter(user=user, created_at__gte=start_time_naive).order_by(
-        "created_at"
+    key = (
+        user.telegram_id,
+        period,
+        start_time_utc.date(),
+        version["count"],
+        version["last"],
+        user.timezone,
+    )
+    return ChartRequest(
+        user=user,
+        period=period,
+        title=title,
+        user_tz=user_tz,
+        start_time_utc=start_time_utc,
+        key=key,
+        start_date=start_date,
     )
 
-    if not logs:
+
+async def render_mood_chart(chart: ChartRequest) -> io.BytesIO | None:
+    """
+    Returns PNG image of the chart, from cache if the data didn't change.
+    Returns None if the data disappeared in the meantime.
+    """
+    cached = _chart_cache.get(chart.key)
+    if cached is not None:
+        return io.BytesIO(cached)
+
+    if chart.period in HEATMAP_PERIODS:
+        dates, values = await _load_calendar_days(chart)
+    elif chart.start_date is not None:
+        dates, values = await _load_daily_averages(chart)
+    else:
+        dates, values = await _load_raw_points(chart)
+
+    if not dates:
         return None
 
-    # Prepare data for plotting
-    dates = []
-    values = []
+    # Run blocking plotting code in the rendering pool
+    image = await chart_render_service.render(
+        chart.key, dates, values, chart.title, chart.period
+    )
+    _chart_cache.set(chart.key, image)
+    return io.BytesIO(image)
+
 
-    for log in logs:
-        # log.created_at is likely naive UTC from DB
-        created_at = log.created_at
-        if created_at.tzinfo is None:
-            created_at = pytz.utc.localize(created_at)
+async def _load_daily_averages(chart: ChartRequest) -> tuple[list, list]:
+    """One point per day (on the day's tick) with the day's average value."""
+    days = (
+        await DailyMoodSummary.filter(
+            user=chart.user, local_date__gte=chart.start_date
+        )
+        .using_db(get_read_db())
+        .order_by("local_date")
+        .values_list("local_date", "total", "count")
+    )
+
+    dates = [datetime.combine(local_date, time()) for local_date, _, _ in days]
+    values = [total / count for _, total, count in days]
+    return dates, values
+
+
+async def _load_calendar_days(chart: ChartRequest) -> tuple[list, list]:
+    """
+    Every day of the window with its average, NaN for days without logs.
+    Reads one summary row per day, so the cost doesn't grow with the logs.
+    """
+    days = (
+        await DailyMoodSummary.filter(
+            user=chart.user,
+            local_date__gte=chart.start_date,
+            local_date__lte=chart.end_date,
+        )
+        .using_db(get_read_db())
+        .values_list("local_date", "total", "count")
+    )
+    if not days:
+        return [], []
 
-        # Convert to user timezone for display
-        local_time = created_at.astimezone(user_tz)
-        dates.append(local_time)
-        values.append(log.value)
+    local_dates, totals, counts = zip(*days)
+    index = np.array([(day - chart.start_date).days for day in local_dates])
+    averages = np.full((chart.end_date - chart.start_date).days + 1, np.nan)
+    averages[index] = np.array(totals) / np.array(counts)
 
-    # Run blocking plotting code in a separate thread
-    return await asyncio.to_thread(_draw_chart, dates, values, title, period)
+    dates = [chart.start_date + timedelta(days=i) for i in range(len(averages))]
+    return dates, averages.tolist()
+
+
+async def _load_raw_points(chart: ChartRequest) -> tuple[list, list]:
+    """Every log of the window, in the user's local time."""
+    rows = (
+        await MoodLog.filter(user=chart.user, created_at__gte=chart.start_time_utc)
+        .using_db(get_read_db())
+        .order_by("created_at")
+        .values_list("created_at", "value")
+    )
+    if not rows:
+        return [], []
+
+    created_at, values = zip(*rows)
+    # Naive local times: matplotlib would draw aware ones at their UTC hour
+    dates = to_local_times(created_at, chart.user_tz).tolist()
+    return dates, list(values)
+
+
+async def generate_mood_chart(user_id: int, period: str) -> io.BytesIO | None:
+    """
+    Generates a mood chart for the specified period
+    ('day', 'week', 'month' or 'year').
+    Returns a BytesIO object containing the image, or None if no data.
+    """
+    user = await get_user(user_id)
+    if not user:
+        return None
+
+    chart = await prepare_mood_chart(user, period)
+    if not chart:
+        return None
+    return await render_mood_chart(chart)
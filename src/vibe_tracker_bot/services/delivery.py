@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+
+from src.vibe_tracker_bot.database.models import User
+from src.vibe_tracker_bot.services.user_cache import invalidate_users
+
+logger = logging.getLogger(__name__)
+
+# Telegram allows ~30 messages/sec overall and ~1 message/sec per chat.
+# Defaults stay slightly below the documented limits.
+DELIVERY_WORKERS = int(os.getenv("DELIVERY_WORKERS", "16"))
+DELIVERY_GLOBAL_RATE = float(os.getenv("DELIVERY_GLOBAL_RATE", "25"))
+DELIVERY_PER_CHAT_RATE = float(os.getenv("DELIVERY_PER_CHAT_RATE", "1"))
+DELIVERY_MAX_RETRIES = int(os.getenv("DELIVERY_MAX_RETRIES", "3"))
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens are added per second up to `capacity`.
+    `acquire()` waits until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class DeliveryReport:
+    sent: int = 0
+    failed: int = 0
+    delivered: list[int] = field(default_factory=list)
+    blocked: list[int] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Delivered messages per second."""
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+
+class MessageDelivery:
+    """
+    Sends one text to many chats through a bounded pool of workers.
+    Respects global and per-chat rate limits, waits on flood control
+    (`TelegramRetryAfter`) and marks users who blocked the bot.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        workers: int = DELIVERY_WORKERS,
+        global_rate: float = DELIVERY_GLOBAL_RATE,
+        per_chat_rate: float = DELIVERY_PER_CHAT_RATE,
+        max_retries: int = DELIVERY_MAX_RETRIES,
+    ):
+        self.bot = bot
+        self.workers = workers
+        self.per_chat_rate = per_chat_rate
+        self.max_retries = max_retries
+        self._global_bucket = TokenBucket(global_rate)
+        self._chat_buckets: dict[int, TokenBucket] = {}
+        # Set while the whole bot is paused by Telegram flood control
+        self._resume_at = 0.0
+
+    async def _wait_flood_control(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, chat_id: int) -> None:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.per_chat_rate)
+        await bucket.acquire()
+        await self._global_bucket.acquire()
+
+    async def _send_one(self, chat_id: int, text: str, report: DeliveryReport):
+        for attempt in range(self.max_retries + 1):
+            await self._wait_flood_control()
+            await self._acquire(chat_id)
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text)
+                report.sent += 1
+                report.delivered.append(chat_id)
+                return
+            except TelegramRetryAfter as e:
+                logger.warning(f"Flood control hit, pausing for {e.retry_after}s")
+                self._resume_at = max(
+                    self._resume_at, time.monotonic() + e.retry_after
+                )
+            except TelegramForbiddenError:
+                report.blocked.append(chat_id)
+                return
+            except (TelegramNetworkError, TelegramServerError) as e:
+                logger.warning(f"Temporary error sending to {chat_id}: {e}")
+                await asyncio.sleep(2**attempt)
+            except Exception as e:
+                logger.error(f"Failed to send message to user {chat_id}: {e}")
+                report.failed += 1
+                return
+
+        logger.error(f"Giving up sending to user {chat_id} after retries")
+        report.failed += 1
+
+    async def _worker(self, queue: asyncio.Queue, text: str, report: DeliveryReport):
+        while True:
+            chat_id = await queue.get()
+            try:
+                await self._send_one(chat_id, text, report)
+            finally:
+                queue.task_done()
+
+    async def send(
+        self,
+        chat_ids: Iterable[int],
+        text: str,
+        report: DeliveryReport | None = None,
+    ) -> DeliveryReport:
+        """
+        Sends `text` to every chat. A `report` passed in is filled as
+        messages go out, so the caller sees progress even if this fails.
+        """
+        report = report if report is not None else DeliveryReport()
+        started_at = time.monotonic()
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for chat_id in chat_ids:
+            queue.put_nowait(chat_id)
+
+        workers = [
+            asyncio.create_task(self._worker(queue, text, report))
+            for _ in range(min(self.workers, queue.qsize()))
+        ]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._chat_buckets.clear()
+            report.elapsed = time.monotonic() - started_at
+
+        if report.blocked:
+            await mark_blocked(report.blocked)
+        return report
+
+
+async def mark_blocked(telegram_ids: list[int]) -> None:
+    """Excludes users who blocked the bot from future reminder scans."""
+    try:
+        await User.filter(telegram_id__in=telegram_ids).update(
+            is_blocked=True, next_reminder_at=None
+        )
+        invalidate_users(*telegram_ids)
+        logger.info(f"Marked {len(telegram_ids)} users as blocked")
+    except Exception as e:
+        logger.error(f"Error marking blocked users: {e}")
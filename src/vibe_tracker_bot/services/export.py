@@ -0,0 +1,117 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, Optional
+from uuid import UUID
+
+from tortoise import BaseDBAsyncClient
+from tortoise.expressions import Q
+
+from ..database.core import get_read_db
+from ..database.models import MoodLog, User
+from .timezones import get_timezone, to_local_times
+
+logger = logging.getLogger(__name__)
+
+# Logs read per query and written per chunk; memory use depends only on this
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+
+EXPORT_FORMATS = ("csv", "json")
+# Same columns as accepted by /import, time is local to the user
+EXPORT_COLUMNS = ("time", "value", "note")
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+Row = tuple[UUID, datetime, int, str | None]
+
+
+async def iter_mood_log_chunks(
+    user: User,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    after: tuple[datetime, UUID] | None = None,
+    using_db: Optional[BaseDBAsyncClient] = None,
+) -> AsyncIterator[list[Row]]:
+    """
+    All logs of the user in (created_at, id) order, chunk by chunk, or only
+    those after the (created_at, id) of `after`. Read through the read
+    connection unless `using_db` is given.
+    Keyset pagination: every query continues after the last row of the
+    previous one through the (user_id, created_at) index, so late chunks
+    cost the same as the first (OFFSET would rescan everything before).
+    """
+    last = after
+    while True:
+        query = MoodLog.filter(user=user).using_db(using_db or get_read_db())
+        if last is not None:
+            created_at, log_id = last
+            query = query.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=log_id)
+            )
+        rows = (
+            await query.order_by("created_at", "id")
+            .limit(chunk_size)
+            .values_list("id", "created_at", "value", "note")
+        )
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1][1], rows[-1][0]
+
+
+class _ExportWriter:
+    """Formats chunks of logs into a gzip stream, blocking calls."""
+
+    def __init__(self, output: BinaryIO, fmt: str, tz):
+        self.tz = tz
+        self.fmt = fmt
+        self.count = 0
+        self._gzip = gzip.GzipFile(fileobj=output, mode="wb")
+        self._text = io.TextIOWrapper(self._gzip, encoding="utf-8", newline="")
+        if fmt == "csv":
+            self._csv = csv.writer(self._text)
+            self._csv.writerow(EXPORT_COLUMNS)
+        else:
+            self._text.write("[")
+
+    def write_chunk(self, rows: list[Row]) -> None:
+        local_times = to_local_times([row[1] for row in rows], self.tz).tolist()
+        for (_, _, value, note), local_time in zip(rows, local_times):
+            time_text = local_time.strftime(TIME_FORMAT)
+            if self.fmt == "csv":
+                self._csv.writerow((time_text, value, note or ""))
+            else:
+                item = {"time": time_text, "value": value, "note": note}
+                separator = ",\n" if self.count else "\n"
+                self._text.write(separator + json.dumps(item, ensure_ascii=False))
+            self.count += 1
+
+    def close(self) -> None:
+        if self.fmt == "json":
+            self._text.write("\n]\n")
+        # Flushes the text layer and writes the gzip trailer
+        self._text.close()
+
+
+async def export_mood_logs(user: User, output: BinaryIO, fmt: str = "csv") -> int:
+    """
+    Writes all logs of the user to `output` as gzipped CSV or JSON, with
+    times in the user's timezone. Only one chunk is in memory at a time;
+    formatting and compression run in a thread. Returns the number of logs.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    writer = _ExportWriter(output, fmt, get_timezone(user.timezone))
+    try:
+        async for rows in iter_mood_log_chunks(user):
+            await asyncio.to_thread(writer.write_chunk, rows)
+    finally:
+        await asyncio.to_thread(writer.close)
+    logger.info(f"Exported {writer.count} logs of user {user.telegram_id} as {fmt}")
+    return writer.count
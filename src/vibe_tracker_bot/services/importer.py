@@ -0,0 +1,236 @@
+import asyncio
+import csv
+import gzip
+import io
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+
+from tortoise.transactions import in_transaction
+
+from ..database.models import MoodLog, User
+from .export import EXPORT_COLUMNS
+from .summaries import add_to_daily_summaries
+from .timezones import get_timezone
+
+logger = logging.getLogger(__name__)
+
+# Rows parsed and inserted per transaction; memory use depends only on this
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+# Telegram doesn't let bots download larger files
+IMPORT_MAX_FILE_SIZE = 20 * 1024 * 1024
+# Rows read from one file, valid or not. A small gzip file can unpack into
+# gigabytes, the size limit alone doesn't bound the work.
+IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", "1000000"))
+# Invalid rows listed in the report, the rest are only counted
+IMPORT_ERRORS_SHOWN = 5
+
+MIN_VALUE, MAX_VALUE = 1, 10
+_GZIP_MAGIC = b"\x1f\x8b"
+
+Row = tuple[datetime, int, Optional[str]]
+
+
+class ImportFormatError(ValueError):
+    """
+    Raised when the file is not a CSV with time and value columns.
+    The message is shown to the user.
+    """
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    skipped: int = 0
+    # Rows already in the history (e.g. a re-imported export), not inserted
+    duplicates: int = 0
+    # "строка N: причина" for the first invalid rows, shown to the user
+    errors: list[str] = field(default_factory=list)
+
+
+class _ImportReader:
+    """
+    Reads a CSV file (plain or gzipped, as made by /export) chunk by chunk
+    and turns rows into UTC logs. Blocking calls.
+    """
+
+    def __init__(self, path: str, tz, result: ImportResult):
+        self.tz = tz
+        self.result = result
+        self._rows_read = 0
+        self._last_moment: Optional[datetime] = None
+        with open(path, "rb") as probe:
+            gzipped = probe.read(2) == _GZIP_MAGIC
+        raw = gzip.open(path, "rb") if gzipped else open(path, "rb")
+        # utf-8-sig: spreadsheets often save CSV with a BOM
+        self._text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        self._csv = csv.reader(self._text)
+        try:
+            header = [name.strip().lower() for name in next(self._csv)]
+        except UnicodeDecodeError as e:
+            self.close()
+            raise ImportFormatError("файл не в кодировке UTF-8") from e
+        except (StopIteration, csv.Error) as e:
+            self.close()
+            raise ImportFormatError("файл пустой или это не CSV") from e
+
+        time_column, value_column, note_column = EXPORT_COLUMNS
+        if time_column not in header or value_column not in header:
+            self.close()
+            raise ImportFormatError(f"нет колонок {time_column} и {value_column}")
+        self._time = header.index(time_column)
+        self._value = header.index(value_column)
+        self._note = header.index(note_column) if note_column in header else None
+
+    def read_chunk(self, size: int) -> list[Row]:
+        rows: list[Row] = []
+        try:
+            for record in self._csv:
+                self._rows_read += 1
+                if self._rows_read > IMPORT_MAX_ROWS:
+                    raise ImportFormatError(
+                        f"в файле больше {IMPORT_MAX_ROWS} строк, раздели его на части"
+                    )
+                try:
+                    rows.append(self._parse(record))
+                except ValueError as e:
+                    self._skip(f"строка {self._csv.line_num}: {e}")
+                if len(rows) >= size:
+                    break
+        except UnicodeDecodeError as e:
+            raise ImportFormatError("файл не в кодировке UTF-8") from e
+        except csv.Error as e:
+            raise ImportFormatError(f"строка {self._csv.line_num}: {e}") from e
+        return rows
+
+    def _parse(self, record: list[str]) -> Row:
+        if not any(cell.strip() for cell in record):
+            raise ValueError("пустая строка")
+        try:
+            time_text = record[self._time].strip()
+            value_text = record[self._value].strip()
+        except IndexError:
+            raise ValueError("не хватает колонок")
+
+        try:
+            value = int(value_text)
+        except ValueError:
+            raise ValueError(f"оценка {value_text!r} — не число")
+        if not MIN_VALUE <= value <= MAX_VALUE:
+            raise ValueError(f"оценка {value} вне диапазона {MIN_VALUE}–{MAX_VALUE}")
+
+        try:
+            moment = datetime.fromisoformat(time_text)
+        except ValueError:
+            raise ValueError(f"время {time_text!r} не в формате ГГГГ-ММ-ДД ЧЧ:ММ")
+        if moment.tzinfo is None:
+            moment = self._local_to_utc(moment)
+        moment = moment.astimezone(timezone.utc)
+        self._last_moment = moment
+
+        note = None
+        if self._note is not None and self._note < len(record):
+            note = record[self._note].strip() or None
+        return moment, value, note
+
+    def _local_to_utc(self, moment: datetime) -> datetime:
+        """
+        Local time of the user to UTC. A time repeated by a DST change is
+        taken at its first occurrence, as in reminders, unless the rows
+        before it are already past that (exported files are in time order).
+        """
+        first = moment.replace(tzinfo=self.tz).astimezone(timezone.utc)
+        second = moment.replace(tzinfo=self.tz, fold=1).astimezone(timezone.utc)
+        # For a time skipped by DST the second one is the earlier
+        if second > first and self._last_moment and self._last_moment > first:
+            return second
+        return first
+
+    def _skip(self, error: str) -> None:
+        self.result.skipped += 1
+        if len(self.result.errors) < IMPORT_ERRORS_SHOWN:
+            self.result.errors.append(error)
+
+    def close(self) -> None:
+        self._text.close()
+
+
+def _log_key(created_at: datetime, value: int) -> tuple[datetime, int]:
+    # Exports keep whole seconds, stored logs have microseconds
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.astimezone(timezone.utc).replace(microsecond=0), value
+
+
+async def _insert_chunk(user: User, rows: list[Row]) -> int:
+    """
+    Inserts the rows that are not in the history yet, with their summaries.
+    A row is a duplicate if a log with the same value exists in the same
+    second. Returns the number of rows inserted.
+    """
+    moments = [created_at for created_at, _, _ in rows]
+    async with in_transaction("default") as conn:
+        existing = await (
+            MoodLog.filter(
+                user=user,
+                created_at__gte=min(moments),
+                created_at__lt=max(moments) + timedelta(seconds=1),
+            )
+            .using_db(conn)
+            .values_list("created_at", "value")
+        )
+        seen = {_log_key(created_at, value) for created_at, value in existing}
+        new_rows = []
+        for row in rows:
+            key = _log_key(row[0], row[1])
+            if key not in seen:
+                seen.add(key)
+                new_rows.append(row)
+        if not new_rows:
+            return 0
+
+        logs = [
+            MoodLog(user=user, value=value, note=note, created_at=created_at)
+            for created_at, value, note in new_rows
+        ]
+        await MoodLog.bulk_create(logs, using_db=conn)
+        await add_to_daily_summaries(
+            user, [(value, created_at) for created_at, value, _ in new_rows], conn
+        )
+    return len(new_rows)
+
+
+async def import_mood_logs(
+    user: User,
+    path: str,
+    on_progress: Optional[Callable[[ImportResult], Awaitable[None]]] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportResult:
+    """
+    Imports logs from a CSV file with time, value and note columns (the
+    layout of /export), times in the user's timezone unless they carry an
+    offset. Invalid rows are skipped and reported, rows already in the
+    history are not inserted again. The file is parsed in a thread one
+    chunk at a time, each chunk is inserted with its daily summaries in its
+    own transaction, so a failure keeps earlier chunks.
+    """
+    result = ImportResult()
+    reader = await asyncio.to_thread(
+        _ImportReader, path, get_timezone(user.timezone), result
+    )
+    try:
+        while rows := await asyncio.to_thread(reader.read_chunk, chunk_size):
+            inserted = await _insert_chunk(user, rows)
+            result.imported += inserted
+            result.duplicates += len(rows) - inserted
+            if on_progress:
+                await on_progress(result)
+    finally:
+        await asyncio.to_thread(reader.close)
+    logger.info(
+        f"Imported {result.imported} logs of user {user.telegram_id}, "
+        f"skipped {result.skipped}, duplicates {result.duplicates}"
+    )
+    return result
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import os
+import uuid
+from typing import Awaitable, Protocol
+
+logger = logging.getLogger(__name__)
+
+# The leader renews it at the start of every tick and every third of it while
+# a tick runs, so it only has to outlive the gap between two ticks
+LEADER_LEASE_TTL = int(os.getenv("LEADER_LEASE_TTL", "90"))
+# Ticks start every minute, a shorter lease would lapse between them
+MIN_LEADER_LEASE_TTL = 75
+LEADER_LEASE_KEY = os.getenv("LEADER_LEASE_KEY", "vibe_tracker:scheduler:leader")
+
+# Extends the lease only if it is still held by us
+_RENEW_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Deletes the lease only if it is still held by us
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class Lease(Protocol):
+    # Seconds between renewals while the leader runs a job
+    renew_interval: float
+
+    async def acquire_or_renew(self) -> bool: ...
+
+    async def release(self) -> None: ...
+
+
+class LocalLease:
+    """Single-process setup: this process is always the leader."""
+
+    renew_interval = 60.0
+
+    async def acquire_or_renew(self) -> bool:
+        return True
+
+    async def release(self) -> None:
+        pass
+
+
+class RedisLease:
+    """
+    Leader election through a Redis key with expiry. The replica that owns
+    the key is the leader and renews it on every call. If it dies, the key
+    expires and the next replica to call `acquire_or_renew` takes over.
+    """
+
+    def __init__(
+        self, redis, key: str = LEADER_LEASE_KEY, ttl: int = LEADER_LEASE_TTL
+    ):
+        if ttl < MIN_LEADER_LEASE_TTL:
+            raise ValueError(
+                f"Leader lease TTL must be at least {MIN_LEADER_LEASE_TTL}s, "
+                f"got {ttl}s"
+            )
+        self.redis = redis
+        self.key = key
+        self.ttl_ms = ttl * 1000
+        self.renew_interval = ttl / 3
+        self.token = uuid.uuid4().hex
+        self._is_leader = False
+
+    async def acquire_or_renew(self) -> bool:
+        try:
+            renewed = await self.redis.eval(
+                _RENEW_SCRIPT, 1, self.key, self.token, self.ttl_ms
+            )
+            if renewed:
+                is_leader = True
+            else:
+                acquired = await self.redis.set(
+                    self.key, self.token, nx=True, px=self.ttl_ms
+                )
+                is_leader = bool(acquired)
+        except Exception as e:
+            # Without Redis we can't prove leadership, so better skip a tick
+            logger.error(f"Leader lease check failed: {e}")
+            is_leader = False
+
+        if is_leader != self._is_leader:
+            logger.info("Became scheduler leader" if is_leader else "Lost leadership")
+        self._is_leader = is_leader
+        return is_leader
+
+    async def release(self) -> None:
+        try:
+            await self.redis.eval(_RELEASE_SCRIPT, 1, self.key, self.token)
+        except Exception as e:
+            logger.warning(f"Failed to release leader lease: {e}")
+        self._is_leader = False
+
+
+async def run_as_leader(lease: Lease, job: Awaitable) -> bool:
+    """
+    Runs `job` while renewing the lease every `lease.renew_interval`
+    seconds, so a long job can't outlive it. If the lease is lost, another
+    replica may take over, so the job is cancelled. Returns False then.
+    """
+    task = asyncio.ensure_future(job)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=lease.renew_interval)
+            if done:
+                task.result()
+                return True
+            if not await lease.acquire_or_renew():
+                logger.warning("Leader lease lost during a job, cancelling it")
+                return False
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
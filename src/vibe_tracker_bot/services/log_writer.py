@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+from tortoise.transactions import in_transaction
+
+from ..database.models import MoodLog, User
+from .metrics import registry
+from .summaries import add_to_daily_summaries, record_mood_log
+
+logger = logging.getLogger(__name__)
+
+# How long the writer waits for more logs before committing a batch
+LOG_WRITE_BATCH_DELAY_MS = int(os.getenv("LOG_WRITE_BATCH_DELAY_MS", "5"))
+LOG_WRITE_BATCH_SIZE = int(os.getenv("LOG_WRITE_BATCH_SIZE", "200"))
+
+
+@dataclass
+class _PendingLog:
+    log: MoodLog
+    done: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class MoodLogWriter:
+    """
+    Write-behind queue for mood logs. Logs arriving within a few milliseconds
+    of each other are inserted with one bulk_create and one commit, together
+    with their daily summaries, so a burst of /log answers after the evening
+    reminder doesn't turn into hundreds of separate write transactions.
+
+    `write` returns only after the batch with the log is committed, so the
+    handler confirms exactly what is stored. A failed batch is retried log
+    by log, so only the writes that fail on their own raise.
+    """
+
+    def __init__(
+        self,
+        batch_delay_ms: int = LOG_WRITE_BATCH_DELAY_MS,
+        batch_size: int = LOG_WRITE_BATCH_SIZE,
+    ):
+        self.batch_delay = batch_delay_ms / 1000
+        self.batch_size = batch_size
+        self._queue: Optional[asyncio.Queue[_PendingLog]] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.batches = 0
+        self.written = 0
+        self.failed = 0
+        self.batch_size_max = 0
+
+    def start(self) -> None:
+        if self._task:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Mood log writer started")
+
+    async def stop(self) -> None:
+        """Commits everything still queued and stops the writer."""
+        if not self._task:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+
+    async def write(self, user: User, value: int, note: Optional[str]) -> MoodLog:
+        if not self._task:
+            # Not started (scripts, one-off tools): write right away
+            return await record_mood_log(user, value, note)
+
+        pending = _PendingLog(MoodLog(user=user, value=value, note=note))
+        self._queue.put_nowait(pending)
+        return await pending.done
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: list[_PendingLog]) -> None:
+        try:
+            await self._commit([pending.log for pending in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                self._fail(batch[0], e)
+                return
+            # One bad log (e.g. its user was just deleted) would fail all the
+            # others, so the rolled back batch is written again log by log
+            logger.warning(
+                f"Failed to write a batch of {len(batch)} mood logs, "
+                f"retrying one by one: {e}"
+            )
+            for pending in batch:
+                await self._flush([pending])
+            return
+
+        self.batches += 1
+        self.written += len(batch)
+        self.batch_size_max = max(self.batch_size_max, len(batch))
+        for pending in batch:
+            if not pending.done.done():
+                pending.done.set_result(pending.log)
+
+    def _fail(self, pending: _PendingLog, error: Exception) -> None:
+        logger.error(
+            f"Failed to write a mood log of user {pending.log.user.telegram_id}: "
+            f"{error}"
+        )
+        self.failed += 1
+        if not pending.done.done():
+            pending.done.set_exception(error)
+
+    async def _commit(self, logs: list[MoodLog]) -> None:
+        by_user: dict[int, list[MoodLog]] = {}
+        for log in logs:
+            by_user.setdefault(log.user.pk, []).append(log)
+
+        async with in_transaction("default") as conn:
+            # Fills created_at of every log, summaries below need it
+            await MoodLog.bulk_create(logs, using_db=conn)
+            for user_logs in by_user.values():
+                await add_to_daily_summaries(
+                    user_logs[0].user,
+                    [(log.value, log.created_at) for log in user_logs],
+                    conn,
+                )
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "batches": self.batches,
+            "written": self.written,
+            "failed": self.failed,
+            "batch_size_avg": self.written / self.batches if self.batches else 0.0,
+            "batch_size_max": self.batch_size_max,
+        }
+
+
+mood_log_writer = MoodLogWriter()
+
+registry.gauge(
+    "bot_log_writer_queue_depth",
+    "Mood logs waiting for the next batch",
+    lambda: mood_log_writer.stats()["queue_depth"],
+)
+registry.gauge(
+    "bot_log_writer_batches",
+    "Batches committed by the mood log writer",
+    lambda: mood_log_writer.batches,
+)
+registry.gauge(
+    "bot_log_writer_logs",
+    "Mood logs by outcome: written, or failed on their own",
+    lambda: {"written": mood_log_writer.written, "failed": mood_log_writer.failed},
+    ["result"],
+)
+registry.gauge(
+    "bot_log_writer_batch_size",
+    "Average and largest number of logs in one batch",
+    lambda: {
+        "avg": mood_log_writer.stats()["batch_size_avg"],
+        "max": mood_log_writer.batch_size_max,
+    },
+    ["stat"],
+)
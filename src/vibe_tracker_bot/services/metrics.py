@@ -0,0 +1,385 @@
+import contextvars
+import functools
+import logging
+import math
+import os
+import time
+from typing import Callable, Iterable, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Local endpoint for Prometheus scraping, port 0 disables it. Replicas on
+# one host need a port each, a busy port is logged and the bot runs without it.
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple, object] = {}
+
+    def labels(self, *values):
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for key, child in self._children.items():
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class _HistogramChild:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.child.observe(time.perf_counter() - self.started_at)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def _samples(self):
+        for key, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, child.counts):
+                cumulative += count
+                labels = _format_labels(
+                    self.labelnames + ("le",), key + (_format_value(bound),)
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {child.count}"
+
+
+class CallbackGauge(_Metric):
+    """
+    Gauge read from a callback at scrape time, for values that already live
+    elsewhere (queue depths, cache sizes). The callback returns one value,
+    or a dict of label values -> value.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], float | dict],
+        labelnames: tuple = (),
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _samples(self):
+        try:
+            values = self.callback()
+        except Exception as e:
+            logger.warning(f"Failed to collect {self.name}: {e}")
+            return
+        if not isinstance(values, dict):
+            values = {(): values}
+        for key, value in values.items():
+            key = key if isinstance(key, tuple) else (key,)
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, tuple(labelnames)))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(
+            Histogram(name, documentation, tuple(labelnames), buckets)
+        )
+
+    def gauge(
+        self, name: str, documentation: str, callback, labelnames=()
+    ) -> CallbackGauge:
+        return self._register(
+            CallbackGauge(name, documentation, callback, tuple(labelnames))
+        )
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
+
+updates_total = registry.counter(
+    "bot_updates_total", "Updates handled, by event type", ["event"]
+)
+handler_errors_total = registry.counter(
+    "bot_handler_errors_total", "Handlers that raised an exception", ["handler"]
+)
+callbacks_total = registry.counter(
+    "bot_callbacks_total", "Callback queries by callback_data prefix", ["prefix"]
+)
+handler_duration = registry.histogram(
+    "bot_handler_duration_seconds", "Time spent in handlers", ["handler"]
+)
+db_query_duration = registry.histogram(
+    "bot_db_query_duration_seconds",
+    "Database calls by client method",
+    ["operation"],
+    buckets=DB_BUCKETS,
+)
+chart_render_duration = registry.histogram(
+    "bot_chart_render_duration_seconds", "Chart rendering time"
+)
+scheduler_tick_duration = registry.histogram(
+    "bot_scheduler_tick_duration_seconds", "Duration of scheduler jobs", ["job"]
+)
+
+
+# --- In-process caches ---
+
+# Cache name -> TTLCache, added by the modules that own the caches
+_caches: dict[str, object] = {}
+
+
+def register_cache(name: str, cache) -> None:
+    """Exports hits, misses, entries and size of the cache, labeled by name."""
+    _caches[name] = cache
+
+
+def _cache_stat(stat: str) -> Callable[[], dict]:
+    return lambda: {name: cache.stats()[stat] for name, cache in _caches.items()}
+
+
+for _stat, _documentation in (
+    ("hits", "Cache lookups that found a fresh entry"),
+    ("misses", "Cache lookups that found nothing or an expired entry"),
+    ("items", "Entries in the cache"),
+    ("size", "Total size of cached values, for caches that track it"),
+):
+    registry.gauge(
+        f"bot_cache_{_stat}", _documentation, _cache_stat(_stat), ["cache"]
+    )
+
+
+# --- Database instrumentation ---
+
+_DB_METHODS = (
+    "execute_insert",
+    "execute_many",
+    "execute_query",
+    "execute_query_dict",
+    "execute_script",
+)
+# Set while a DB call is measured, so nested calls (e.g. a transaction
+# wrapper calling its parent class) are counted once
+_in_db_call: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "in_db_call", default=False
+)
+
+
+def _timed_db_method(method, operation: str):
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if _in_db_call.get():
+            return await method(self, *args, **kwargs)
+        token = _in_db_call.set(True)
+        started_at = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            _in_db_call.reset(token)
+            db_query_duration.labels(operation).observe(
+                time.perf_counter() - started_at
+            )
+
+    wrapper.__metrics_wrapped__ = True
+    return wrapper
+
+
+def _subclasses(cls: type) -> Iterable[type]:
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _subclasses(subclass)
+
+
+def instrument_db_client(client) -> None:
+    """
+    Times every query of the client's backend, including its transaction
+    wrappers. Tortoise has no query hooks, so the client methods are wrapped
+    where they are defined: in the client class, its bases and subclasses.
+    """
+    classes = set(type(client).__mro__) | set(_subclasses(type(client)))
+    for cls in classes:
+        for name in _DB_METHODS:
+            method = cls.__dict__.get(name)
+            if method is None or getattr(method, "__metrics_wrapped__", False):
+                continue
+            setattr(cls, name, _timed_db_method(method, name[len("execute_"):]))
+
+
+# --- HTTP endpoint ---
+
+# Set once the DB is initialized and the bot is registered with Telegram
+_ready = False
+
+
+def set_ready(ready: bool) -> None:
+    global _ready
+    _ready = ready
+
+
+registry.gauge("bot_ready", "1 when the bot takes updates", lambda: int(_ready))
+
+
+async def _handle_metrics(request: web.Request) -> web.Response:
+    return web.Response(
+        text=registry.render(), content_type="text/plain", charset="utf-8"
+    )
+
+
+async def _handle_ready(request: web.Request) -> web.Response:
+    """Readiness probe: 200 when ready, 503 while starting or stopping."""
+    if _ready:
+        return web.Response(text="ready")
+    return web.Response(status=503, text="not ready")
+
+
+async def start_metrics_server(
+    host: str = METRICS_HOST, port: int = METRICS_PORT
+) -> Optional[web.AppRunner]:
+    """
+    Serves GET /metrics and GET /ready on a local port.
+    Returns None when disabled or the port can't be bound.
+    """
+    if not port:
+        return None
+    app = web.Application()
+    app.router.add_get("/metrics", _handle_metrics)
+    app.router.add_get("/ready", _handle_ready)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except OSError as e:
+        # E.g. a second replica on the same host: the bot works without metrics
+        logger.error(f"Metrics server not started on {host}:{port}: {e}")
+        await runner.cleanup()
+        return None
+    logger.info(f"Metrics available at http://{host}:{port}/metrics")
+    return runner
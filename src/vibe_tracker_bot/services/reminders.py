@@ -0,0 +1,99 @@
+import datetime
+from typing import Optional, Tuple
+
+from ..database.models import User
+from .timezones import get_timezone
+
+SLOT_MORNING = "morning"
+SLOT_EVENING = "evening"
+
+
+def as_utc(dt: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+    """
+    Normalizes a datetime to aware UTC, the form Tortoise (use_tz) stores
+    and returns. Naive values are taken as UTC.
+    """
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.astimezone(datetime.timezone.utc)
+
+
+def compute_next_reminder_slot(
+    user: User, since: datetime.datetime
+) -> Optional[Tuple[datetime.datetime, str]]:
+    """
+    Returns the first reminder moment (aware UTC) at or after `since` together
+    with its slot name ("morning" / "evening"), or None if the user has no
+    reminder times configured.
+    The occurrence is recomputed in the user's timezone every time,
+    so DST changes are picked up automatically.
+    """
+    slots = [
+        (slot, t)
+        for slot, t in (
+            (SLOT_MORNING, user.reminder_morning_time),
+            (SLOT_EVENING, user.reminder_evening_time),
+        )
+        if t
+    ]
+    if not slots:
+        return None
+
+    tz = get_timezone(user.timezone)
+    since_utc = as_utc(since)
+    local_date = since_utc.astimezone(tz).date()
+
+    candidates = []
+    # Yesterday..tomorrow in local time always covers the next occurrence
+    for day_offset in (-1, 0, 1, 2):
+        day = local_date + datetime.timedelta(days=day_offset)
+        for slot, t in slots:
+            # A time skipped by a DST jump fires right after the jump,
+            # a time that repeats fires at its first occurrence
+            local_dt = datetime.datetime.combine(day, t.replace(tzinfo=None), tz)
+            occurrence = local_dt.astimezone(datetime.timezone.utc).replace(
+                second=0, microsecond=0
+            )
+            if occurrence >= since_utc:
+                candidates.append((occurrence, slot))
+
+    return min(candidates)
+
+
+def compute_next_reminder(
+    user: User, since: datetime.datetime
+) -> Optional[datetime.datetime]:
+    """Same as `compute_next_reminder_slot`, but returns only the moment."""
+    next_slot = compute_next_reminder_slot(user, since)
+    return next_slot[0] if next_slot else None
+
+
+def refresh_next_reminder(user: User) -> None:
+    """
+    Recalculates `user.next_reminder_at` after settings change.
+    Does not save the user, the caller is expected to do it.
+    """
+    if not user.reminders_enabled or user.is_blocked:
+        user.next_reminder_at = None
+        return
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    user.next_reminder_at = compute_next_reminder(user, now)
+
+
+async def rebuild_reminder_index() -> int:
+    """
+    Fills `next_reminder_at` for enabled users that don't have it yet
+    (e.g. right after the column was added). Returns the number of users updated.
+    """
+    users = await User.filter(
+        reminders_enabled=True, is_blocked=False, next_reminder_at__isnull=True
+    )
+    for user in users:
+        refresh_next_reminder(user)
+
+    if users:
+        await User.bulk_update(users, fields=["next_reminder_at"])
+    return len(users)
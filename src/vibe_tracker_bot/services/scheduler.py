@@ -1,81 +1,231 @@
 import datetime
 import logging
-import pytz
+import os
+import uuid
 from aiogram import Bot
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-
-from src.vibe_tracker_bot.database.models import User
+from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
+
+from src.vibe_tracker_bot.database.core import (
+    SQLITE_MAINTENANCE_MINUTES,
+    sqlite_maintenance,
+)
+from src.vibe_tracker_bot.database.models import OutboxStatus, ReminderOutbox, User
+from src.vibe_tracker_bot.services.delivery import DeliveryReport, MessageDelivery
+from src.vibe_tracker_bot.services.leader import Lease, LocalLease, run_as_leader
+from src.vibe_tracker_bot.services.metrics import scheduler_tick_duration
+from src.vibe_tracker_bot.services.reminders import (
+    as_utc,
+    compute_next_reminder,
+    compute_next_reminder_slot,
+    rebuild_reminder_index,
+)
+from src.vibe_tracker_bot.services.user_cache import invalidate_users
 
 logger = logging.getLogger(__name__)
 
+REMINDER_TEXT = "👋 Привет! Как твое настроение? Давай затрекаем вайб! /log"
 
-async def send_reminders(bot: Bot):
-    # Get current UTC time
-    utc_now = datetime.datetime.now(pytz.utc)
+# Reminders missed by up to this many minutes (slow tick, restart) are still sent
+REMINDER_GRACE_MINUTES = int(os.getenv("REMINDER_GRACE_MINUTES", "15"))
+# Delivered/expired outbox rows are kept this long for debugging
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+
+
+def _utc_now() -> datetime.datetime:
+    # Aware UTC: Tortoise runs with use_tz, naive values are ambiguous to it
+    return datetime.datetime.now(datetime.timezone.utc)
 
-    # Fetch all users with reminders enabled
-    # In MVP with few users, fetching all is fine.
-    # For scale, we would need to batch or optimize queries.
-    try:
-        users = await User.filter(reminders_enabled=True).all()
-    except Exception as e:
-        logger.error(f"Error querying users for reminders: {e}")
-        return
 
-    logger.debug(f"Scheduler run at {utc_now}. Checking {len(users)} users.")
+async def enqueue_due_reminders(now: datetime.datetime) -> int:
+    """
+    Moves due reminders from `users.next_reminder_at` into the outbox.
+    Occurrences older than the grace window are skipped.
+    Returns the number of outbox rows created.
+    """
+    grace_start = now - datetime.timedelta(minutes=REMINDER_GRACE_MINUTES)
 
-    users_to_notify = []
+    # Only users whose next reminder is due are fetched (indexed lookup)
+    users = await User.filter(
+        reminders_enabled=True, is_blocked=False, next_reminder_at__lte=now
+    ).all()
+    if not users:
+        return 0
 
+    entries = []
     for user in users:
         try:
-            # Get user's timezone (default to UTC if invalid)
-            try:
-                tz = pytz.timezone(user.timezone)
-            except pytz.UnknownTimeZoneError:
-                tz = pytz.utc
-
-            # Convert UTC now to user's local time
-            user_now = utc_now.astimezone(tz)
-
-            # Check morning reminder
-            if user.reminder_morning_time:
-                # We check if current time matches the reminder time (ignoring seconds)
-                if (
-                    user_now.hour == user.reminder_morning_time.hour
-                    and user_now.minute == user.reminder_morning_time.minute
-                ):
-                    users_to_notify.append(user.telegram_id)
-                    continue  # Don't send double reminder if times overlap (unlikely)
-
-            # Check evening reminder
-            if user.reminder_evening_time:
-                if (
-                    user_now.hour == user.reminder_evening_time.hour
-                    and user_now.minute == user.reminder_evening_time.minute
-                ):
-                    users_to_notify.append(user.telegram_id)
+            next_at = as_utc(user.next_reminder_at)
+            # Reminder was missed for too long (e.g. bot was offline) - skip it
+            if next_at < grace_start:
+                next_at = compute_next_reminder(user, grace_start)
+
+            while next_at is not None and next_at <= now:
+                _, slot = compute_next_reminder_slot(user, next_at)
+                entries.append(
+                    ReminderOutbox(user=user, slot=slot, scheduled_utc=next_at)
+                )
+                next_at = compute_next_reminder(
+                    user, next_at + datetime.timedelta(minutes=1)
+                )
+            user.next_reminder_at = next_at
         except Exception as e:
             logger.error(f"Error processing user {user.telegram_id}: {e}")
-            continue
+            user.next_reminder_at = None
+
+    # Outbox rows and the moved index are committed together, and the unique
+    # (user, slot, scheduled_utc) constraint makes a concurrent enqueue a no-op
+    async with in_transaction("default") as conn:
+        if entries:
+            await ReminderOutbox.bulk_create(
+                entries, ignore_conflicts=True, using_db=conn
+            )
+        await User.bulk_update(users, fields=["next_reminder_at"], using_db=conn)
+    invalidate_users(*(user.telegram_id for user in users))
+
+    return len(entries)
+
+
+async def claim_pending_reminders(now: datetime.datetime) -> list[dict]:
+    """
+    Atomically takes pending outbox rows inside the grace window.
+    Rows are tagged with a unique claim token, so each row is claimed
+    by at most one tick even if several run at the same time.
+    """
+    # Stored as `claimed_at` and compared with it, so aware like the column
+    now = as_utc(now)
+    grace_start = now - datetime.timedelta(minutes=REMINDER_GRACE_MINUTES)
+
+    # Whatever fell out of the grace window is not worth sending anymore
+    await ReminderOutbox.filter(
+        status=OutboxStatus.PENDING, scheduled_utc__lt=grace_start
+    ).update(status=OutboxStatus.EXPIRED)
+    # Rows claimed by a tick that crashed before marking them. They may have
+    # been sent already, so they are expired rather than sent again.
+    await ReminderOutbox.filter(
+        Q(claimed_at__lt=grace_start) | Q(claimed_at__isnull=True),
+        status=OutboxStatus.SENDING,
+    ).update(status=OutboxStatus.EXPIRED)
+
+    token = uuid.uuid4()
+    await ReminderOutbox.filter(
+        status=OutboxStatus.PENDING,
+        scheduled_utc__gte=grace_start,
+        scheduled_utc__lte=now,
+    ).update(status=OutboxStatus.SENDING, claim_token=token, claimed_at=now)
+
+    return await ReminderOutbox.filter(claim_token=token).values(
+        "id", "user__telegram_id"
+    )
+
+
+async def cleanup_outbox(now: datetime.datetime) -> None:
+    """
+    Removes outbox rows older than the retention period, including ones
+    left in sending by a crashed tick.
+    """
+    await ReminderOutbox.filter(
+        scheduled_utc__lt=now - datetime.timedelta(days=OUTBOX_RETENTION_DAYS),
+        status__in=[
+            OutboxStatus.SENT,
+            OutboxStatus.FAILED,
+            OutboxStatus.EXPIRED,
+            OutboxStatus.SENDING,
+        ],
+    ).delete()
+
+
+async def send_reminders(delivery: MessageDelivery):
+    now = _utc_now()
 
-    if not users_to_notify:
+    try:
+        created = await enqueue_due_reminders(now)
+        claimed = await claim_pending_reminders(now)
+    except Exception as e:
+        logger.error(f"Error preparing reminders: {e}")
         return
 
-    logger.info(f"Sending reminders to {len(users_to_notify)} users.")
+    logger.debug(f"Scheduler run at {now}. {created} queued, {len(claimed)} claimed.")
 
-    for telegram_id in users_to_notify:
-        try:
-            await bot.send_message(
-                chat_id=telegram_id,
-                text="👋 Привет! Как твое настроение? Давай затрекаем вайб! /log",
+    if not claimed:
+        return
+
+    # A user may have several missed slots, one message is enough
+    chat_ids = list({row["user__telegram_id"] for row in claimed})
+    logger.info(f"Sending reminders to {len(chat_ids)} users.")
+
+    # Filled as messages go out, so a failed send still reports what was sent
+    report = DeliveryReport()
+    try:
+        await delivery.send(chat_ids, REMINDER_TEXT, report=report)
+    finally:
+        await _mark_claimed(claimed, report, now)
+    logger.info(
+        f"Reminders delivered: {report.sent} sent, {report.failed} failed, "
+        f"{len(report.blocked)} blocked in {report.elapsed:.2f}s "
+        f"({report.rate:.1f} msg/s)"
+    )
+
+
+async def _mark_claimed(
+    claimed: list[dict], report: DeliveryReport, now: datetime.datetime
+) -> None:
+    """Moves claimed rows out of sending: delivered ones to sent, others failed."""
+    delivered = set(report.delivered)
+    sent_ids = [r["id"] for r in claimed if r["user__telegram_id"] in delivered]
+    failed_ids = [r["id"] for r in claimed if r["user__telegram_id"] not in delivered]
+    try:
+        if sent_ids:
+            await ReminderOutbox.filter(id__in=sent_ids).update(
+                status=OutboxStatus.SENT
             )
-        except Exception as e:
-            logger.error(f"Failed to send reminder to user {telegram_id}: {e}")
+        if failed_ids:
+            await ReminderOutbox.filter(id__in=failed_ids).update(
+                status=OutboxStatus.FAILED
+            )
+        await cleanup_outbox(now)
+    except Exception as e:
+        logger.error(f"Error updating reminder outbox: {e}")
+
+
+async def run_reminders_tick(delivery: MessageDelivery, lease: Lease):
+    """Scheduler job: only the leader replica sends reminders."""
+    if not await lease.acquire_or_renew():
+        logger.debug("Not the scheduler leader, skipping reminders tick")
+        return
+    with scheduler_tick_duration.labels("reminders").time():
+        # Renewed while sending, a large tick takes longer than the lease TTL
+        await run_as_leader(lease, send_reminders(delivery))
+
 
+async def start_scheduler(bot: Bot, lease: Lease | None = None) -> AsyncIOScheduler:
+    # Make sure every enabled user has a precomputed next reminder
+    updated = await rebuild_reminder_index()
+    if updated:
+        logger.info(f"Computed next reminder time for {updated} users")
 
-def start_scheduler(bot: Bot):
     scheduler = AsyncIOScheduler()
-    # Check every minute
-    scheduler.add_job(send_reminders, "interval", minutes=1, args=[bot])
+    # Check every minute. Runs never overlap, missed runs are merged into one,
+    # and the first run happens right away to catch up after a restart.
+    scheduler.add_job(
+        run_reminders_tick,
+        "interval",
+        minutes=1,
+        args=[MessageDelivery(bot), lease or LocalLease()],
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=REMINDER_GRACE_MINUTES * 60,
+        next_run_time=datetime.datetime.now(datetime.timezone.utc),
+    )
+    # No-op for other databases
+    scheduler.add_job(
+        sqlite_maintenance,
+        "interval",
+        minutes=SQLITE_MAINTENANCE_MINUTES,
+        max_instances=1,
+        coalesce=True,
+    )
     scheduler.start()
     logger.info("Scheduler started")
+    return scheduler
@@ -1,8 +1,11 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from typing import TypedDict, Optional
-import pytz
 
-from ..database.models import MoodLog, User
+from ..database.core import get_read_db
+from ..database.models import DailyMoodSummary, User
+from .timezones import get_timezone
+
+STATS_DAYS = 7
 
 
 class StatsResult(TypedDict):
@@ -10,44 +13,32 @@ class StatsResult(TypedDict):
     min_val: int
     max_val: int
     count: int
-    best_day_date: Optional[datetime]
-    worst_day_date: Optional[datetime]
+    best_day_date: Optional[date]
+    worst_day_date: Optional[date]
 
 
-async def get_weekly_stats(telegram_id: int) -> Optional[StatsResult]:
+async def get_weekly_stats(user: User) -> StatsResult:
     """
-    Calculates statistics for the last 7 days for a given user.
+    Calculates statistics for the last 7 days (today included) for a given user.
     Respects user's timezone for the day boundary.
+    Reads daily summaries, so at most 7 rows are fetched.
     """
-    user = await User.get_or_none(telegram_id=telegram_id)
-    if not user:
-        return None
-
     # Resolve User Timezone
-    try:
-        user_tz = pytz.timezone(user.timezone)
-    except (pytz.UnknownTimeZoneError, AttributeError):
-        user_tz = pytz.utc
-
-    # Calculate time window (last 7 days) relative to user's "now"
-    now_utc = datetime.now(pytz.utc)
-    now_user = now_utc.astimezone(user_tz)
-
-    # Start of 7 days ago in user time
-    seven_days_ago_user = now_user - timedelta(days=7)
-
-    # Convert back to UTC for DB query (assuming DB stores naive UTC or we strip info)
-    start_time_utc = seven_days_ago_user.astimezone(pytz.utc)
-
-    # Tortoise/SQLite usually work with naive UTC.
-    start_time_naive = start_time_utc.replace(tzinfo=None)
-
-    # Fetch logs
-    logs = await MoodLog.filter(user=user, created_at__gte=start_time_naive).order_by(
-        "-created_at"
+    user_tz = get_timezone(user.timezone)
+
+    # First local day of the window
+    today_user = datetime.now(timezone.utc).astimezone(user_tz).date()
+    start_date = today_user - timedelta(days=STATS_DAYS - 1)
+
+    # Newest day first, so ties resolve to the most recent day
+    days = (
+        await DailyMoodSummary.filter(user=user, local_date__gte=start_date)
+        .using_db(get_read_db())
+        .order_by("-local_date")
+        .values("local_date", "count", "total", "min_value", "max_value")
     )
 
-    if not logs:
+    if not days:
         return {
             "average": 0.0,
             "min_val": 0,
@@ -57,28 +48,19 @@ async def get_weekly_stats(telegram_id: int) -> Optional[StatsResult]:
             "worst_day_date": None,
         }
 
-    values = [log.value for log in logs]
-
-    # Calculate metrics
-    avg_val = sum(values) / len(values)
-    min_val = min(values)
-    max_val = max(values)
-
-    # Find specific logs for dates
-    best_log = next((log for log in logs if log.value == max_val), None)
-    worst_log = next((log for log in logs if log.value == min_val), None)
+    count = sum(day["count"] for day in days)
+    total = sum(day["total"] for day in days)
+    min_val = min(day["min_value"] for day in days)
+    max_val = max(day["max_value"] for day in days)
 
-    # Helper to convert log time to user timezone
-    def to_user_tz(dt: datetime) -> datetime:
-        if dt.tzinfo is None:
-            dt = pytz.utc.localize(dt)
-        return dt.astimezone(user_tz)
+    best_day = next(day for day in days if day["max_value"] == max_val)
+    worst_day = next(day for day in days if day["min_value"] == min_val)
 
     return {
-        "average": round(avg_val, 1),
+        "average": round(total / count, 1),
         "min_val": min_val,
         "max_val": max_val,
-        "count": len(logs),
-        "best_day_date": to_user_tz(best_log.created_at) if best_log else None,
-        "worst_day_date": to_user_tz(worst_log.created_at) if worst_log else None,
+        "count": count,
+        "best_day_date": best_day["local_date"],
+        "worst_day_date": worst_day["local_date"],
     }
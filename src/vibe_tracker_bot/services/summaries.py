@@ -0,0 +1,172 @@
+import logging
+from datetime import date, datetime, timezone
+from typing import Iterable, Optional
+from tortoise import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+from ..database.models import DailyMoodSummary, MoodLog, User
+from .export import EXPORT_CHUNK_SIZE, iter_mood_log_chunks
+from .timezones import get_timezone, to_local_times
+
+logger = logging.getLogger(__name__)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _group_by_local_date(
+    user: User,
+    entries: Iterable[tuple[int, datetime]],
+    days: dict[date, DailyMoodSummary],
+) -> None:
+    """Adds (value, created_at) pairs to unsaved per-day summaries in `days`."""
+    entries = list(entries)
+    if not entries:
+        return
+    tz = get_timezone(user.timezone)
+    local_dates = (
+        to_local_times([created_at for _, created_at in entries], tz)
+        .astype("datetime64[D]")
+        .tolist()
+    )
+
+    for (value, created_at), local_date in zip(entries, local_dates):
+        created_at = _as_utc(created_at)
+        day = days.get(local_date)
+        if day is None:
+            days[local_date] = DailyMoodSummary(
+                user=user,
+                local_date=local_date,
+                count=1,
+                total=value,
+                min_value=value,
+                max_value=value,
+                first_at=created_at,
+                last_at=created_at,
+            )
+        else:
+            day.count += 1
+            day.total += value
+            day.min_value = min(day.min_value, value)
+            day.max_value = max(day.max_value, value)
+            day.first_at = min(day.first_at, created_at)
+            day.last_at = max(day.last_at, created_at)
+
+
+async def _lock_user(user: User, using_db: Optional[BaseDBAsyncClient]) -> None:
+    """
+    Locks the user row until the transaction ends (no-op on SQLite, where
+    write transactions are serialized anyway). Taken by everything that
+    changes the user's summaries, so a rebuild never swaps them while
+    a log is being added.
+    """
+    await (
+        User.filter(id=user.pk)
+        .select_for_update()
+        .using_db(using_db)
+        .values_list("id", flat=True)
+    )
+
+
+async def add_to_daily_summaries(
+    user: User,
+    entries: Iterable[tuple[int, datetime]],
+    using_db: Optional[BaseDBAsyncClient] = None,
+) -> None:
+    """
+    Adds (value, created_at) pairs to the user's daily summaries.
+    Must be called in the same transaction as the inserts of the logs.
+    """
+    # Group by local day first, so a batch touches every summary row once
+    days: dict[date, DailyMoodSummary] = {}
+    _group_by_local_date(user, entries, days)
+    if not days:
+        return
+
+    await _lock_user(user, using_db)
+    existing = {
+        summary.local_date: summary
+        for summary in await DailyMoodSummary.filter(
+            user=user, local_date__in=list(days)
+        )
+        .select_for_update()
+        .using_db(using_db)
+    }
+
+    to_create = []
+    for local_date, day in days.items():
+        summary = existing.get(local_date)
+        if summary is None:
+            to_create.append(day)
+            continue
+
+        summary.count += day.count
+        summary.total += day.total
+        summary.min_value = min(summary.min_value, day.min_value)
+        summary.max_value = max(summary.max_value, day.max_value)
+        summary.first_at = min(_as_utc(summary.first_at), day.first_at)
+        summary.last_at = max(_as_utc(summary.last_at), day.last_at)
+        await summary.save(using_db=using_db)
+
+    if to_create:
+        await DailyMoodSummary.bulk_create(to_create, using_db=using_db)
+
+
+async def record_mood_log(user: User, value: int, note: Optional[str]) -> MoodLog:
+    """Creates a MoodLog and updates the daily summary in one transaction."""
+    async with in_transaction("default") as conn:
+        log = await MoodLog.create(user=user, value=value, note=note, using_db=conn)
+        await add_to_daily_summaries(user, [(log.value, log.created_at)], conn)
+    return log
+
+
+async def rebuild_user_summaries(
+    user: User, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> None:
+    """
+    Recomputes all daily summaries of the user from raw logs.
+    Needed after the timezone changes (local days shift) and for backfill.
+    Logs are streamed in keyset chunks outside of a transaction, so memory
+    depends on the number of days, not logs. The summaries are swapped in
+    one short transaction, which also adds logs written in the meantime:
+    the newer ones are read after the last streamed log, anything else
+    (a backdated import, a deleted log) makes it read all logs again.
+    """
+    days: dict[date, DailyMoodSummary] = {}
+    last = None
+
+    async def add_chunks(**kwargs) -> None:
+        nonlocal last
+        async for rows in iter_mood_log_chunks(user, chunk_size, last, **kwargs):
+            _group_by_local_date(
+                user, [(value, created_at) for _, created_at, value, _ in rows], days
+            )
+            last = rows[-1][1], rows[-1][0]
+
+    await add_chunks()
+    async with in_transaction("default") as conn:
+        # Writers wait for the swap from here on, see add_to_daily_summaries
+        await _lock_user(user, conn)
+        await add_chunks(using_db=conn)
+        count = await MoodLog.filter(user=user).using_db(conn).count()
+        if count != sum(day.count for day in days.values()):
+            days.clear()
+            last = None
+            await add_chunks(using_db=conn)
+        await DailyMoodSummary.filter(user=user).using_db(conn).delete()
+        if days:
+            await DailyMoodSummary.bulk_create(list(days.values()), using_db=conn)
+
+
+async def backfill_summaries() -> int:
+    """Rebuilds summaries for every user. Returns the number of users processed."""
+    user_ids = await User.all().values_list("id", flat=True)
+    for processed, user_id in enumerate(user_ids, start=1):
+        user = await User.get(id=user_id)
+        await rebuild_user_summaries(user)
+        if processed % 100 == 0:
+            logger.info(f"Backfilled summaries for {processed} users")
+    return len(user_ids)
@@ -0,0 +1,224 @@
+import difflib
+import re
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Optional, Sequence
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+import numpy as np
+
+# Short names people type instead of a city
+TIMEZONE_ALIASES = {
+    "moscow": "Europe/Moscow",
+    "msk": "Europe/Moscow",
+    "warsaw": "Europe/Warsaw",
+    "poland": "Europe/Warsaw",
+    "minsk": "Europe/Minsk",
+    "kiev": "Europe/Kyiv",
+    "kyiv": "Europe/Kyiv",
+    "london": "Europe/London",
+    "utc": "UTC",
+    "gmt": "UTC",
+}
+
+SUGGESTIONS_LIMIT = 5
+
+# "UTC+3", "GMT-5", "+03:00": whole-hour offsets, the ones with an Etc/ zone
+_OFFSET_RE = re.compile(r"(?:utc|gmt)?\s*([+-])\s*(\d{1,2})(?::?00)?")
+
+# Current names live under these areas. Old aliases like "US/Eastern",
+# "W-SU" or "Etc/GMT+3" stay valid, but are not suggested.
+_PRIMARY_AREAS = (
+    "Africa/",
+    "America/",
+    "Antarctica/",
+    "Asia/",
+    "Atlantic/",
+    "Australia/",
+    "Europe/",
+    "Indian/",
+    "Pacific/",
+)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.strip().lower().replace("_", " ").split())
+
+
+def _is_primary(name: str) -> bool:
+    return name == "UTC" or name.startswith(_PRIMARY_AREAS)
+
+
+def _build_index() -> tuple[dict[str, str], dict[str, list[str]]]:
+    """
+    Full name -> canonical name, and city -> timezones with that city.
+    Names under the main areas come first, so old aliases never win.
+    """
+    by_name: dict[str, str] = {}
+    by_city: dict[str, list[str]] = {}
+    names = available_timezones() - {"localtime"}
+    for name in sorted(names, key=lambda tz: (not _is_primary(tz), tz)):
+        by_name.setdefault(name.lower(), name)
+        city = _normalize(name.rsplit("/", 1)[-1])
+        by_city.setdefault(city, []).append(name)
+    return by_name, by_city
+
+
+# Built once at import, the input handler only does dict lookups
+_BY_NAME, _BY_CITY = _build_index()
+# Suggested cities: only those with a current name (primary names go first)
+_CITIES = [city for city, names in _BY_CITY.items() if _is_primary(names[0])]
+_PRIMARY = [(name, _normalize(name)) for name in _BY_NAME.values() if _is_primary(name)]
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name: Optional[str]):
+    """
+    Timezone object for the name, UTC for unknown names.
+    Cached: services resolve the user's timezone on every request.
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        return timezone.utc
+
+
+def resolve_timezone(text: str) -> Optional[str]:
+    """Timezone name for an exact alias, full name or city, otherwise None."""
+    query = text.strip().lower()
+    if not query:
+        return None
+
+    tz_name = TIMEZONE_ALIASES.get(query) or _BY_NAME.get(query)
+    if tz_name:
+        return tz_name
+
+    # Before the cities: "gmt+3" is also the "city" of Etc/GMT+3 (UTC-3)
+    offset = _OFFSET_RE.fullmatch(query)
+    if offset:
+        return _offset_timezone(offset.group(1), int(offset.group(2)))
+
+    cities = _BY_CITY.get(_normalize(query))
+    if cities:
+        return cities[0]
+
+    # A part of the name that matches only one timezone (e.g. "york")
+    matches = _substring_matches(_normalize(query))
+    if len(matches) == 1:
+        return matches[0]
+    return None
+
+
+def suggest_timezones(text: str, limit: int = SUGGESTIONS_LIMIT) -> list[str]:
+    """
+    Ranked guesses for input that didn't resolve: cities starting with the
+    input, then names containing it, then cities with a similar spelling.
+    """
+    query = _normalize(text)
+    if not query:
+        return []
+
+    suggestions: list[str] = []
+
+    def add(names) -> None:
+        for name in names:
+            if name not in suggestions:
+                suggestions.append(name)
+
+    add(_BY_CITY[city][0] for city in _CITIES if city.startswith(query))
+    add(_substring_matches(query))
+    add(
+        _BY_CITY[city][0]
+        for city in difflib.get_close_matches(query, _CITIES, n=limit, cutoff=0.7)
+    )
+    return suggestions[:limit]
+
+
+def _substring_matches(query: str) -> list[str]:
+    return [name for name, normalized in _PRIMARY if query in normalized]
+
+
+def _offset_timezone(sign: str, hours: int) -> Optional[str]:
+    """Fixed-offset zone for UTC+hours. Etc/ names have the sign inverted."""
+    if hours == 0:
+        return "UTC"
+    name = f"Etc/GMT{'-' if sign == '+' else '+'}{hours}"
+    return _BY_NAME.get(name.lower())
+
+
+# --- Batch conversion to local time ---
+
+UTC = timezone.utc
+
+_OFFSET_PROBE_STEP = timedelta(days=1)
+
+
+def _utc_offset(tz: tzinfo, moment: datetime) -> timedelta:
+    return moment.replace(tzinfo=UTC).astimezone(tz).utcoffset()
+
+
+def _offset_segments(
+    tz: tzinfo, start: datetime, end: datetime
+) -> tuple[list[datetime], list[timedelta]]:
+    """
+    Splits [start, end] (naive UTC) into segments with a constant UTC offset.
+    Returns the UTC moments where a new offset starts and the offsets, one
+    more than moments. Offsets are probed daily and each change is narrowed
+    down to the second, so a year costs a few hundred tz lookups.
+    """
+    start = start.replace(microsecond=0)
+    bounds: list[datetime] = []
+    offsets = [_utc_offset(tz, start)]
+    probe = start
+    while probe < end:
+        next_probe = min(probe + _OFFSET_PROBE_STEP, end)
+        offset = _utc_offset(tz, next_probe)
+        if offset != offsets[-1]:
+            # Offset at lo is the old one, at hi the new one
+            lo, hi = probe, next_probe
+            while hi - lo > timedelta(seconds=1):
+                mid = lo + timedelta(seconds=(hi - lo).total_seconds() // 2)
+                if _utc_offset(tz, mid) == offsets[-1]:
+                    lo = mid
+                else:
+                    hi = mid
+            bounds.append(hi)
+            offsets.append(offset)
+        probe = next_probe
+    return bounds, offsets
+
+
+def to_local_times(
+    timestamps: Sequence[datetime] | np.ndarray, tz: tzinfo
+) -> np.ndarray:
+    """
+    Converts UTC timestamps (aware datetimes, naive UTC datetimes or a
+    datetime64 array) to naive local times of `tz` in one pass: the offset
+    of every timestamp is looked up by its DST segment instead of calling
+    astimezone per item. Returns a datetime64[us] array in input order;
+    `.tolist()` gives datetimes, `.astype("datetime64[D]")` local dates.
+    """
+    if isinstance(timestamps, np.ndarray):
+        utc = timestamps.astype("datetime64[us]")
+    else:
+        # timestamp() is the cheapest way out of an aware datetime;
+        # naive ones are UTC (not local time of this machine)
+        seconds = np.fromiter(
+            (
+                ts.timestamp() if ts.tzinfo else ts.replace(tzinfo=UTC).timestamp()
+                for ts in timestamps
+            ),
+            dtype="float64",
+            count=len(timestamps),
+        )
+        utc = np.round(seconds * 1e6).astype("int64").astype("datetime64[us]")
+    if not len(utc):
+        return utc
+
+    bounds, offsets = _offset_segments(tz, utc.min().item(), utc.max().item())
+    offset_values = np.array(
+        [offset // timedelta(microseconds=1) for offset in offsets],
+        dtype="timedelta64[us]",
+    )
+    segment = np.searchsorted(np.array(bounds, dtype="datetime64[us]"), utc, "right")
+    return utc + offset_values[segment]
@@ -0,0 +1,38 @@
+import os
+from typing import Optional
+
+from ..database.models import User
+from .cache import TTLCache
+from .metrics import register_cache
+
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_MAX_ITEMS = int(os.getenv("USER_CACHE_MAX_ITEMS", "10000"))
+
+# telegram_id -> User. Handlers mutate and save the cached instance itself,
+# code that changes users in bulk must call `invalidate_users`. Other
+# replicas and the scheduler may have changed the row since it was cached,
+# so handlers save only the fields they set (`update_fields`).
+_user_cache: TTLCache[User] = TTLCache(
+    max_items=USER_CACHE_MAX_ITEMS, ttl=USER_CACHE_TTL
+)
+register_cache("users", _user_cache)
+
+
+async def get_user(telegram_id: int) -> Optional[User]:
+    """Returns the user from cache or DB, None if the user doesn't exist."""
+    user = _user_cache.get(telegram_id)
+    if user is None:
+        user = await User.get_or_none(telegram_id=telegram_id)
+        if user is not None:
+            _user_cache.set(telegram_id, user)
+    return user
+
+
+def remember_user(user: User) -> None:
+    """Puts a freshly created/saved user into the cache."""
+    _user_cache.set(user.telegram_id, user)
+
+
+def invalidate_users(*telegram_ids: int) -> None:
+    for telegram_id in telegram_ids:
+        _user_cache.discard(telegram_id)
@@ -0,0 +1,70 @@
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    """
+    Durations of the startup steps, counted from the import of this module
+    (main.py imports it before anything heavy). Only measures: settings are
+    read by main.py after .env is loaded, this module is imported before.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.steps: dict[str, float] = {}
+        self.ready_after: float | None = None
+        self.first_update_after: float | None = None
+
+    def mark(self, name: str) -> None:
+        """Records the time since the start, e.g. for module imports."""
+        self.steps[name] = time.perf_counter() - self.started_at
+
+    @contextmanager
+    def step(self, name: str):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = time.perf_counter() - started_at
+
+    async def run(self, name: str, awaitable):
+        """Awaits a step, so steps can be timed while run concurrently."""
+        with self.step(name):
+            return await awaitable
+
+    def ready(self, budget: float, detailed: bool = False) -> None:
+        """
+        Called once the bot can take updates. Logs the time it took, a warning
+        when it is over budget, and every step when detailed.
+        """
+        if self.ready_after is not None:
+            return
+        self.ready_after = time.perf_counter() - self.started_at
+
+        if detailed:
+            for name, duration in self.steps.items():
+                logger.info(f"Startup step {name}: {duration:.3f}s")
+        if self.ready_after > budget:
+            slowest = max(self.steps, key=self.steps.get, default="-")
+            logger.warning(
+                f"Startup took {self.ready_after:.2f}s, over the {budget:.1f}s "
+                f"budget (slowest step: {slowest})"
+            )
+        else:
+            logger.info(f"Ready to take updates {self.ready_after:.2f}s after start")
+
+    def update_processed(self) -> None:
+        """
+        Called after every update, records the first one: the time a user
+        waits for the first answer after a restart (if an update was waiting).
+        """
+        if self.first_update_after is not None:
+            return
+        self.first_update_after = after = time.perf_counter() - self.started_at
+        logger.info(f"First update processed {after:.2f}s after start")
+
+
+startup_profile = StartupProfile()
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import os
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Public HTTPS address Telegram sends updates to, e.g. https://bot.example.com
+WEBHOOK_BASE_URL = os.getenv("WEBHOOK_BASE_URL", "")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+# Telegram passes it back in X-Telegram-Bot-Api-Secret-Token (A-Z, a-z, 0-9, _, -)
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+WEBAPP_HOST = os.getenv("WEBAPP_HOST", "0.0.0.0")
+WEBAPP_PORT = int(os.getenv("WEBAPP_PORT", "8080"))
+# Max updates processed at the same time
+UPDATE_CONCURRENCY = int(os.getenv("UPDATE_CONCURRENCY", "64"))
+
+
+class BoundedRequestHandler(SimpleRequestHandler):
+    """
+    Answers Telegram right away and processes updates in background tasks,
+    like SimpleRequestHandler, but with a limit on how many updates are
+    processed at once. When all slots are busy the request waits, so
+    Telegram slows down instead of us piling up unbounded tasks.
+    """
+
+    def __init__(self, *args: Any, max_concurrency: int, **kwargs: Any):
+        super().__init__(*args, handle_in_background=True, **kwargs)
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def _handle_request_background(
+        self, bot: Bot, request: web.Request
+    ) -> web.Response:
+        await self._slots.acquire()
+        try:
+            return await super()._handle_request_background(bot, request)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def _background_feed_update(self, bot: Bot, update: dict[str, Any]) -> None:
+        try:
+            await super()._background_feed_update(bot, update)
+        finally:
+            self._slots.release()
+
+
+async def on_webhook_startup(dispatcher: Dispatcher, bot: Bot):
+    await bot.set_webhook(
+        url=f"{WEBHOOK_BASE_URL.rstrip('/')}{WEBHOOK_PATH}",
+        secret_token=WEBHOOK_SECRET or None,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+    )
+    logger.info(f"Webhook set to {WEBHOOK_BASE_URL}{WEBHOOK_PATH}")
+
+
+def create_app(dp: Dispatcher, bot: Bot) -> web.Application:
+    """Builds the aiohttp app; dispatcher startup/shutdown run with the app."""
+    app = web.Application()
+    BoundedRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=WEBHOOK_SECRET or None,
+        max_concurrency=UPDATE_CONCURRENCY,
+    ).register(app, path=WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot):
+    """
+    Serves the webhook until the task is cancelled (e.g. Ctrl+C).
+    on_webhook_startup must be registered as a dispatcher startup hook.
+    """
+    if not WEBHOOK_BASE_URL:
+        raise RuntimeError("WEBHOOK_BASE_URL is required in webhook mode")
+    if not WEBHOOK_SECRET:
+        logger.warning("WEBHOOK_SECRET is not set, webhook requests are not verified")
+
+    app = create_app(dp, bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, WEBAPP_HOST, WEBAPP_PORT)
+    await site.start()
+    logger.info(f"Webhook server listening on {WEBAPP_HOST}:{WEBAPP_PORT}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        # Runs app.on_shutdown -> dispatcher shutdown hooks
+        await runner.cleanup()
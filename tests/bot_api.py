@@ -0,0 +1,122 @@
+"""Stub of the Telegram Bot API and builders of incoming updates."""
+
+import asyncio
+import datetime
+import itertools
+import time
+
+from aiogram.client.session.base import BaseSession
+from aiogram.types import (
+    CallbackQuery,
+    Chat,
+    Document,
+    File,
+    Message,
+    Update,
+    User as TelegramUser,
+)
+
+_ids = itertools.count(1000)
+
+
+class StubSession(BaseSession):
+    """
+    Bot API session that records requests instead of sending them.
+    `errors[chat_id]` holds exceptions raised by the next requests to that
+    chat, `files[file_path]` the content served to `bot.download`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.requests: list[tuple[float, object]] = []
+        self.errors: dict[int, list[Exception]] = {}
+        self.files: dict[str, bytes] = {}
+        self.latency = 0.0
+
+    async def close(self) -> None:
+        pass
+
+    def sent(self, method_name: str) -> list:
+        return [m for _, m in self.requests if type(m).__name__ == method_name]
+
+    async def make_request(self, bot, method, timeout=None):
+        self.requests.append((time.monotonic(), method))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        chat_id = getattr(method, "chat_id", None)
+        if self.errors.get(chat_id):
+            raise self.errors[chat_id].pop(0)
+
+        name = type(method).__name__
+        if name in ("SendMessage", "SendPhoto", "SendDocument", "EditMessageText"):
+            chat = Chat(id=chat_id or 1, type="private")
+            message = Message(
+                message_id=next(_ids),
+                date=datetime.datetime.now(),
+                chat=chat,
+                text=getattr(method, "text", None),
+            )
+            return message.as_(bot)
+        if name == "GetMe":
+            return TelegramUser(id=42, is_bot=True, first_name="bot", username="bot")
+        if name == "GetFile":
+            return File(
+                file_id=method.file_id, file_unique_id="u", file_path=method.file_id
+            )
+        return True
+
+    async def stream_content(self, url, *args, **kwargs):
+        yield self.files[url.rsplit("/", 1)[-1]]
+
+
+def _sender(telegram_id: int) -> dict:
+    return {
+        "chat": Chat(id=telegram_id, type="private"),
+        "from_user": TelegramUser(id=telegram_id, is_bot=False, first_name="Test"),
+    }
+
+
+def message_update(telegram_id: int, text: str) -> Update:
+    return Update(
+        update_id=next(_ids),
+        message=Message(
+            message_id=next(_ids),
+            date=datetime.datetime.now(),
+            text=text,
+            **_sender(telegram_id),
+        ),
+    )
+
+
+def document_update(telegram_id: int, file_id: str, file_size: int) -> Update:
+    return Update(
+        update_id=next(_ids),
+        message=Message(
+            message_id=next(_ids),
+            date=datetime.datetime.now(),
+            document=Document(
+                file_id=file_id, file_unique_id=file_id, file_size=file_size
+            ),
+            **_sender(telegram_id),
+        ),
+    )
+
+
+def callback_update(telegram_id: int, data: str) -> Update:
+    sender = _sender(telegram_id)
+    message = Message(
+        message_id=next(_ids),
+        date=datetime.datetime.now(),
+        chat=sender["chat"],
+        text="...",
+    )
+    return Update(
+        update_id=next(_ids),
+        callback_query=CallbackQuery(
+            id=str(next(_ids)),
+            from_user=sender["from_user"],
+            chat_instance="test",
+            message=message,
+            data=data,
+        ),
+    )
@@ -0,0 +1,117 @@
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.fsm.storage.memory import MemoryStorage
+from tortoise.backends.base.config_generator import expand_db_url
+from tortoise.backends.base.executor import EXECUTOR_CACHE
+from tortoise.context import TortoiseContext
+
+from bot_api import StubSession
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations" / "models"
+
+# Server for the Postgres half of the parity tests, e.g.
+# postgres://postgres@127.0.0.1:5432/postgres. Every test gets a database
+# of its own, created and dropped by the fixture. Not set: those tests skip.
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+BACKENDS = ["sqlite", "postgres"]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(params=BACKENDS)
+def db_url(request, tmp_path) -> str:
+    if request.param == "sqlite":
+        return f"sqlite://{tmp_path}/test.sqlite3"
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    # "{}" is replaced with a random hex string by expand_db_url(testing=True)
+    return TEST_POSTGRES_URL.rsplit("/", 1)[0] + "/vibe_test_{}"
+
+
+def _migration_modules():
+    paths = sorted(
+        MIGRATIONS_DIR.glob("*.py"), key=lambda path: int(path.name.split("_")[0])
+    )
+    for path in paths:
+        spec = importlib.util.spec_from_file_location(f"migration_{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        yield module
+
+
+async def apply_migrations(conn) -> None:
+    """Builds the schema the way `aerich upgrade` does, from the migrations."""
+    for module in _migration_modules():
+        await conn.execute_script(await module.upgrade(conn))
+
+
+@pytest.fixture
+async def db(db_url):
+    """
+    Fresh database migrated to the latest version, on SQLite and Postgres.
+    Yields the default connection.
+    """
+    config = {
+        "connections": {"default": expand_db_url(db_url, testing=True)},
+        "apps": {
+            "models": {
+                "models": ["src.vibe_tracker_bot.database.models"],
+                "default_connection": "default",
+            }
+        },
+    }
+    # Tortoise caches insert SQL per connection name, which is "default" on
+    # both backends, so SQL of the other dialect could be reused
+    EXECUTOR_CACHE.clear()
+    async with TortoiseContext() as ctx:
+        await ctx.init(config=config, _create_db=True)
+        conn = ctx.db()
+        await apply_migrations(conn)
+        try:
+            yield conn
+        finally:
+            if conn.capabilities.dialect == "postgres":
+                await conn.close()
+                await conn.db_delete()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Per-process caches would leak users and charts between tests."""
+    from src.vibe_tracker_bot.services import charts, user_cache
+
+    caches = [user_cache._user_cache, charts._chart_cache, charts._file_id_cache]
+    for cache in caches:
+        cache.discard_where(lambda key: True)
+    yield
+    for cache in caches:
+        cache.discard_where(lambda key: True)
+
+
+@pytest.fixture
+def bot() -> Bot:
+    return Bot("42:TEST", session=StubSession())
+
+
+@pytest.fixture(scope="session")
+def _dispatcher() -> Dispatcher:
+    from src.vibe_tracker_bot.main import setup_dispatcher
+
+    dp = Dispatcher()
+    setup_dispatcher(dp)
+    return dp
+
+
+@pytest.fixture
+def dispatcher(_dispatcher) -> Dispatcher:
+    # Routers are attached once per process, FSM states are reset per test
+    _dispatcher.fsm.storage = MemoryStorage()
+    return _dispatcher
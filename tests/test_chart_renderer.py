@@ -0,0 +1,63 @@
+import logging
+import os
+import signal
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.vibe_tracker_bot.services import chart_renderer
+from src.vibe_tracker_bot.services.chart_renderer import ChartRenderService
+from src.vibe_tracker_bot.services.metrics import registry
+
+pytestmark = pytest.mark.anyio
+
+NOW = datetime(2024, 5, 1, 12)
+POINTS = ([NOW - timedelta(hours=2), NOW], [3, 8])
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Spawned workers read the backend from the environment
+    monkeypatch.setenv("CHART_BACKEND", "pillow")
+    service = ChartRenderService(workers=1)
+    service.start()
+    yield service
+    service.shutdown()
+
+
+async def test_pool_is_restarted_after_a_worker_dies(pool):
+    first = await pool.render("a", *POINTS, "", "day")
+    broken = pool._executor
+    for pid in list(broken._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    assert await pool.render("b", *POINTS, "", "day") == first
+    assert pool._executor is not broken
+    assert pool.rendered == 2
+    assert pool.stats()["restarts"] == 1
+
+
+async def test_render_stats_are_exported(monkeypatch):
+    service = ChartRenderService(workers=0, queue_size=1)
+    monkeypatch.setattr(chart_renderer, "chart_render_service", service)
+    monkeypatch.setattr(chart_renderer, "_render_in_thread", lambda *args: b"png")
+    await service.render("a", *POINTS, "", "day")
+    service.restarts = 2
+
+    text = registry.render()
+    assert 'bot_chart_render_requests{result="rendered"} 1' in text
+    assert 'bot_chart_render_requests{result="rejected"} 0' in text
+    assert "bot_chart_render_pool_restarts 2" in text
+
+
+async def test_thread_warm_up_errors_are_logged(monkeypatch, caplog):
+    def broken_backend():
+        raise ImportError("no backend")
+
+    monkeypatch.setattr(chart_renderer, "_warm_up_thread", broken_backend)
+    service = ChartRenderService(workers=0)
+    with caplog.at_level(logging.ERROR):
+        service.start()
+        with pytest.raises(ImportError):
+            await service._warm_up
+    assert "warm-up failed" in caplog.text
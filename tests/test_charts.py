@@ -0,0 +1,41 @@
+import math
+import random
+from datetime import date, timedelta
+
+import pytest
+from PIL import Image
+
+from src.vibe_tracker_bot.services import charts
+
+# Last local day of the window, the same for every test
+TODAY = date(2026, 10, 18)
+# Figure sizes at 100 dpi: a month is a calendar page, a year a 7-row strip
+HEATMAP_SIZES = {"month": (1000, 600), "year": (1000, 300)}
+
+
+def _window(period: str) -> list[date]:
+    days = charts.SUMMARY_PERIOD_DAYS[period]
+    return [TODAY - timedelta(days=days - 1 - i) for i in range(days)]
+
+
+def _sample(dates: list[date]) -> list[float]:
+    rng = random.Random(len(dates))
+    # Every third day without logs, the rest averages between 1 and 10
+    return [math.nan if i % 3 == 0 else rng.uniform(1, 10) for i in range(len(dates))]
+
+
+@pytest.mark.parametrize("backend", ["matplotlib", "pillow"])
+@pytest.mark.parametrize("period", sorted(charts.HEATMAP_PERIODS))
+@pytest.mark.parametrize("data", ["empty", "sample"])
+def test_heatmap_renders_a_png(backend, period, data, monkeypatch):
+    # Heatmaps are drawn with matplotlib whatever the line chart backend
+    monkeypatch.setattr(charts, "CHART_BACKEND", backend)
+    dates = _window(period)
+    values = [math.nan] * len(dates) if data == "empty" else _sample(dates)
+
+    buffer = charts._draw_chart(dates, values, charts.SUMMARY_TITLES[period], period)
+
+    with Image.open(buffer) as image:
+        image.load()
+        assert image.format == "PNG"
+        assert image.size == HEATMAP_SIZES[period]
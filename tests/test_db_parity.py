@@ -0,0 +1,469 @@
+"""
+The DB paths of the handlers, run on SQLite and on Postgres
+(see the `db` fixture). The same assertions must hold on both.
+"""
+
+import asyncio
+import datetime
+import io
+
+import pytest
+from tortoise.transactions import in_transaction
+
+from bot_api import callback_update, message_update
+from src.vibe_tracker_bot.database.models import (
+    DailyMoodSummary,
+    MoodLog,
+    OutboxStatus,
+    ReminderOutbox,
+    User,
+)
+from src.vibe_tracker_bot.services import (
+    charts,
+    export,
+    importer,
+    scheduler,
+    summaries,
+)
+from src.vibe_tracker_bot.services.delivery import MessageDelivery
+from src.vibe_tracker_bot.services.log_writer import MoodLogWriter
+from src.vibe_tracker_bot.services.stats import get_weekly_stats
+from src.vibe_tracker_bot.services.summaries import (
+    record_mood_log,
+    rebuild_user_summaries,
+)
+
+pytestmark = pytest.mark.anyio
+
+UTC = datetime.timezone.utc
+# Tortoise runs with use_tz: a naive datetime written to the DB is a bug
+no_naive_datetimes = pytest.mark.filterwarnings("error:DateTimeField:RuntimeWarning")
+
+
+def _utc_now() -> datetime.datetime:
+    return datetime.datetime.now(UTC).replace(microsecond=0)
+
+
+async def _add_logs(user: User, moments_and_values) -> None:
+    await MoodLog.bulk_create(
+        [
+            MoodLog(user=user, value=value, created_at=moment)
+            for moment, value in moments_and_values
+        ]
+    )
+    await rebuild_user_summaries(user)
+
+
+async def test_log_and_stats_through_handlers(db, dispatcher, bot):
+    await dispatcher.feed_update(bot, message_update(1, "/start"))
+    user = await User.get(telegram_id=1)
+
+    for update in (
+        message_update(1, "/log"),
+        callback_update(1, "rate:7"),
+        callback_update(1, "skip_note"),
+        message_update(1, "/log"),
+        callback_update(1, "rate:4"),
+        message_update(1, "тяжёлый день"),
+    ):
+        await dispatcher.feed_update(bot, update)
+
+    logs = await MoodLog.filter(user=user).order_by("created_at").values_list(
+        "value", "note"
+    )
+    assert logs == [(7, None), (4, "тяжёлый день")]
+    summary = await DailyMoodSummary.get(user=user)
+    assert (summary.count, summary.total) == (2, 11)
+    assert (summary.min_value, summary.max_value) == (4, 7)
+
+    await dispatcher.feed_update(bot, message_update(1, "/stats"))
+    stats_text = bot.session.sent("SendMessage")[-1].text
+    assert "Средний вайб: <b>5.5</b>" in stats_text
+    assert "Всего записей: 2" in stats_text
+
+
+@no_naive_datetimes
+async def test_reminder_settings_through_handlers(db, dispatcher, bot):
+    await dispatcher.feed_update(bot, message_update(2, "/start"))
+    for update in (
+        callback_update(2, "toggle_reminders"),
+        callback_update(2, "set_morning"),
+        message_update(2, "07:30"),
+        callback_update(2, "set_timezone"),
+        message_update(2, "Moscow"),
+    ):
+        await dispatcher.feed_update(bot, update)
+
+    user = await User.get(telegram_id=2)
+    assert user.reminders_enabled
+    assert user.reminder_morning_time.replace(tzinfo=None) == datetime.time(7, 30)
+    assert user.timezone == "Europe/Moscow"
+    assert user.next_reminder_at.utcoffset() == datetime.timedelta(0)
+
+
+async def test_stats_and_summaries_follow_the_timezone(db):
+    user = await User.create(telegram_id=3, timezone="UTC")
+    now = _utc_now()
+    # 22:30 UTC yesterday is already today in Moscow (UTC+3)
+    late = (now - datetime.timedelta(days=1)).replace(hour=22, minute=30)
+    await record_mood_log(user, 2, None)
+    await _add_logs(user, [(late, 9)])
+
+    stats = await get_weekly_stats(user)
+    assert (stats["count"], stats["min_val"], stats["max_val"]) == (2, 2, 9)
+
+    user.timezone = "Europe/Moscow"
+    await user.save()
+    await rebuild_user_summaries(user)
+    dates = await DailyMoodSummary.filter(user=user).values_list(
+        "local_date", flat=True
+    )
+    assert late.date() + datetime.timedelta(days=1) in dates
+    assert sum(
+        await DailyMoodSummary.filter(user=user).values_list("count", flat=True)
+    ) == 2
+
+
+async def test_rebuild_streams_logs_in_chunks(db):
+    from zoneinfo import ZoneInfo
+
+    user = await User.create(telegram_id=9, timezone="Australia/Lord_Howe")
+    start = datetime.datetime(2024, 3, 30, tzinfo=UTC)
+    logs = [
+        (start + datetime.timedelta(minutes=37 * i), 1 + i % 10) for i in range(300)
+    ]
+    await MoodLog.bulk_create(
+        [MoodLog(user=user, value=value, created_at=moment) for moment, value in logs]
+    )
+    expected = {}
+    for moment, value in logs:
+        day = moment.astimezone(ZoneInfo(user.timezone)).date()
+        count, total = expected.get(day, (0, 0))
+        expected[day] = (count + 1, total + value)
+
+    # Chunks end in the middle of days, the days must still add up
+    await rebuild_user_summaries(user, chunk_size=7)
+    summaries = await DailyMoodSummary.filter(user=user).values_list(
+        "local_date", "count", "total"
+    )
+    assert {day: (count, total) for day, count, total in summaries} == expected
+
+
+async def test_rebuild_keeps_logs_written_meanwhile(db, monkeypatch):
+    user = await User.create(telegram_id=8)
+    start = datetime.datetime(2024, 5, 1, tzinfo=UTC)
+    await _add_logs(
+        user, [(start + datetime.timedelta(days=i), 5) for i in range(1, 10)]
+    )
+    stream = summaries.iter_mood_log_chunks
+    written = []
+
+    async def write_during_the_stream(*args, **kwargs):
+        async for rows in stream(*args, **kwargs):
+            yield rows
+            if not written:
+                # A backdated log (an import) and a new one, committed
+                # with their summaries while the rebuild reads the logs
+                for moment, value in ((start, 1), (_utc_now(), 9)):
+                    async with in_transaction("default") as conn:
+                        await MoodLog.create(
+                            user=user, value=value, created_at=moment, using_db=conn
+                        )
+                        await summaries.add_to_daily_summaries(
+                            user, [(value, moment)], conn
+                        )
+                written.append(True)
+
+    monkeypatch.setattr(summaries, "iter_mood_log_chunks", write_during_the_stream)
+    await rebuild_user_summaries(user, chunk_size=3)
+
+    rows = await DailyMoodSummary.filter(user=user).values_list("count", "total")
+    assert (sum(c for c, _ in rows), sum(t for _, t in rows)) == (11, 55)
+    assert await DailyMoodSummary.exists(user=user, local_date=start.date())
+
+
+async def test_batched_writer_commits_every_log(db):
+    users = [await User.create(telegram_id=10 + i) for i in range(3)]
+    writer = MoodLogWriter(batch_delay_ms=20, batch_size=25)
+    writer.start()
+    try:
+        await asyncio.gather(
+            *(
+                writer.write(user, 1 + n % 10, f"note {n}")
+                for n in range(20)
+                for user in users
+            )
+        )
+    finally:
+        await writer.stop()
+
+    assert writer.written == 60
+    assert writer.batches < 60
+    for user in users:
+        assert await MoodLog.filter(user=user).count() == 20
+        summary = await DailyMoodSummary.get(user=user)
+        assert summary.count == 20
+        assert summary.total == sum(1 + n % 10 for n in range(20))
+
+
+async def test_batched_writer_fails_only_the_bad_write(db):
+    users = [await User.create(telegram_id=20 + i) for i in range(3)]
+    deleted = users[1]
+    await User.filter(id=deleted.id).delete()
+    writer = MoodLogWriter(batch_delay_ms=20, batch_size=25)
+    writer.start()
+    try:
+        results = await asyncio.gather(
+            *(writer.write(user, 5, None) for user in users),
+            return_exceptions=True,
+        )
+    finally:
+        await writer.stop()
+
+    assert isinstance(results[1], Exception)
+    assert [isinstance(r, MoodLog) for r in results] == [True, False, True]
+    assert (writer.written, writer.failed) == (2, 1)
+    for user in (users[0], users[2]):
+        assert await MoodLog.filter(user=user).count() == 1
+        assert (await DailyMoodSummary.get(user=user)).count == 1
+
+
+@no_naive_datetimes
+async def test_reminders_are_enqueued_and_claimed_once(db, bot):
+    now = scheduler._utc_now()
+    users = [
+        await User.create(
+            telegram_id=100 + i,
+            reminders_enabled=True,
+            next_reminder_at=now - datetime.timedelta(minutes=1),
+        )
+        for i in range(6)
+    ]
+    # Enqueueing the same occurrence twice is a no-op
+    assert await scheduler.enqueue_due_reminders(now) == 6
+    await User.filter(id__in=[u.id for u in users]).update(
+        next_reminder_at=now - datetime.timedelta(minutes=1)
+    )
+    assert await scheduler.enqueue_due_reminders(now) == 6
+    assert await ReminderOutbox.all().count() == 6
+
+    # Two overlapping ticks split the rows, nothing is claimed twice
+    first, second = await asyncio.gather(
+        scheduler.claim_pending_reminders(now),
+        scheduler.claim_pending_reminders(now),
+    )
+    claimed = [row["id"] for row in first + second]
+    assert len(claimed) == len(set(claimed)) == 6
+    claimed_at = await ReminderOutbox.all().values_list("claimed_at", flat=True)
+    assert set(claimed_at) == {now}
+
+    # The rows are claimed already, so the next tick has nothing to send
+    await scheduler.send_reminders(MessageDelivery(bot, global_rate=1000))
+    assert bot.session.sent("SendMessage") == []
+
+
+@no_naive_datetimes
+async def test_send_reminders_marks_sent_and_blocked(db, bot):
+    from aiogram.exceptions import TelegramForbiddenError
+    from aiogram.methods import SendMessage
+
+    now = scheduler._utc_now()
+    for telegram_id in (201, 202):
+        await User.create(
+            telegram_id=telegram_id,
+            reminders_enabled=True,
+            next_reminder_at=now - datetime.timedelta(minutes=1),
+        )
+    bot.session.errors[202] = [
+        TelegramForbiddenError(
+            SendMessage(chat_id=202, text="-"), "Forbidden: bot was blocked"
+        )
+    ]
+
+    await scheduler.send_reminders(MessageDelivery(bot, global_rate=1000))
+
+    statuses = dict(
+        await ReminderOutbox.all().values_list("user__telegram_id", "status")
+    )
+    assert statuses == {201: OutboxStatus.SENT, 202: OutboxStatus.FAILED}
+    blocked = await User.get(telegram_id=202)
+    assert blocked.is_blocked and blocked.next_reminder_at is None
+
+
+@no_naive_datetimes
+async def test_chart_queries(db):
+    user = await User.create(telegram_id=4, timezone="Europe/Berlin")
+    now = _utc_now()
+    await _add_logs(
+        user,
+        [(now - datetime.timedelta(minutes=m), 5) for m in (1, 2)]
+        + [(now - datetime.timedelta(days=3), 9)],
+    )
+
+    week = await charts.prepare_mood_chart(user, "week")
+    dates, values = await charts._load_daily_averages(week)
+    assert values[-1] == 5 and 9 in values
+
+    month = await charts.prepare_mood_chart(user, "month")
+    days, averages = await charts._load_calendar_days(month)
+    assert len(days) == 30
+    assert sorted(v for v in averages if v == v) == [5, 9]
+
+    day = await charts.prepare_mood_chart(user, "day")
+    if day is not None:  # empty right after the local midnight
+        dates, values = await charts._load_raw_points(day)
+        assert values and set(values) == {5}
+        assert all(d.tzinfo is None for d in dates)
+
+
+async def test_rejected_file_id_falls_back_to_the_busy_message(
+    db, dispatcher, bot, monkeypatch
+):
+    from aiogram.exceptions import TelegramBadRequest
+
+    from src.vibe_tracker_bot.handlers import tracking
+    from src.vibe_tracker_bot.services.chart_renderer import ChartQueueFull
+
+    await dispatcher.feed_update(bot, message_update(5, "/start"))
+    user = await User.get(telegram_id=5)
+    await record_mood_log(user, 6, None)
+    chart = await charts.prepare_mood_chart(user, "day")
+    charts.remember_chart_file_id(chart.key, "expired-file-id")
+
+    make_request = bot.session.make_request
+
+    async def reject_file_ids(bot, method, timeout=None):
+        if type(method).__name__ == "SendPhoto" and method.photo == "expired-file-id":
+            raise TelegramBadRequest(method, "Bad Request: wrong file identifier")
+        return await make_request(bot, method, timeout)
+
+    async def queue_full(chart):
+        raise ChartQueueFull()
+
+    monkeypatch.setattr(bot.session, "make_request", reject_file_ids)
+    monkeypatch.setattr(tracking, "render_mood_chart", queue_full)
+    await dispatcher.feed_update(bot, callback_update(5, "chart:day"))
+
+    assert bot.session.sent("SendMessage")[-1].text == tracking.CHART_BUSY_TEXT
+
+
+async def test_set_commands_is_sent_once(db, bot):
+    from src.vibe_tracker_bot.main import set_commands
+
+    await set_commands(bot)
+    await set_commands(bot)
+    assert len(bot.session.sent("SetMyCommands")) == 1
+
+
+async def test_export_import_roundtrip(db, tmp_path):
+    source = await User.create(telegram_id=5, timezone="Europe/Berlin")
+    target = await User.create(telegram_id=6, timezone="Europe/Berlin")
+    start = datetime.datetime(2024, 10, 26, 22, tzinfo=UTC)
+    await _add_logs(
+        source,
+        [(start + datetime.timedelta(minutes=17 * i), 1 + i % 10) for i in range(300)],
+    )
+
+    buffer = io.BytesIO()
+    assert await export.export_mood_logs(source, buffer, "csv") == 300
+    path = tmp_path / "history.csv.gz"
+    path.write_bytes(buffer.getvalue())
+
+    result = await importer.import_mood_logs(target, str(path), chunk_size=64)
+    assert (result.imported, result.skipped) == (300, 0)
+
+    def history(user):
+        return (
+            MoodLog.filter(user=user)
+            .order_by("created_at")
+            .values_list("created_at", "value")
+        )
+
+    assert await history(source) == await history(target)
+    summaries = [
+        await DailyMoodSummary.filter(user=user)
+        .order_by("local_date")
+        .values_list("local_date", "count", "total")
+        for user in (source, target)
+    ]
+    assert summaries[0] == summaries[1]
+
+    # Importing the same file again, or into its own source, adds nothing
+    for user in (target, source):
+        result = await importer.import_mood_logs(user, str(path), chunk_size=64)
+        assert (result.imported, result.duplicates) == (0, 300)
+    assert await MoodLog.filter(user=target).count() == 300
+    assert await DailyMoodSummary.filter(user=target).order_by(
+        "local_date"
+    ).values_list("local_date", "count", "total") == summaries[1]
+
+
+async def test_import_stops_at_the_row_limit(db, tmp_path, monkeypatch):
+    import gzip
+
+    user = await User.create(telegram_id=8)
+    monkeypatch.setattr(importer, "IMPORT_MAX_ROWS", 100)
+    path = tmp_path / "bomb.csv.gz"
+    # Empty lines are invalid rows, but they count towards the limit too
+    path.write_bytes(gzip.compress(b"time,value\n" + b",\n" * 10_000))
+
+    with pytest.raises(importer.ImportFormatError, match="больше 100 строк"):
+        await importer.import_mood_logs(user, str(path), chunk_size=64)
+
+
+@no_naive_datetimes
+async def test_stuck_sending_rows_are_expired_and_cleaned(db, bot):
+    now = scheduler._utc_now()
+    user = await User.create(telegram_id=301, reminders_enabled=True)
+    grace = datetime.timedelta(minutes=scheduler.REMINDER_GRACE_MINUTES)
+    # Claimed by a tick that crashed before marking it
+    stuck = await ReminderOutbox.create(
+        user=user,
+        slot="morning",
+        scheduled_utc=now - datetime.timedelta(minutes=1),
+        status=OutboxStatus.SENDING,
+        claimed_at=now - grace - datetime.timedelta(minutes=1),
+    )
+    await scheduler.claim_pending_reminders(now)
+    await stuck.refresh_from_db()
+    assert stuck.status == OutboxStatus.EXPIRED
+
+    old = now - datetime.timedelta(days=scheduler.OUTBOX_RETENTION_DAYS + 1)
+    await ReminderOutbox.filter(id=stuck.id).update(
+        status=OutboxStatus.SENDING, scheduled_utc=old
+    )
+    await scheduler.cleanup_outbox(now)
+    assert not await ReminderOutbox.exists(id=stuck.id)
+
+
+@no_naive_datetimes
+async def test_claimed_rows_are_marked_when_sending_fails(db, bot):
+    now = scheduler._utc_now()
+    await User.create(
+        telegram_id=302,
+        reminders_enabled=True,
+        next_reminder_at=now - datetime.timedelta(minutes=1),
+    )
+
+    class BrokenDelivery(MessageDelivery):
+        async def send(self, chat_ids, text, report=None):
+            raise RuntimeError("network is down")
+
+    with pytest.raises(RuntimeError):
+        await scheduler.send_reminders(BrokenDelivery(bot))
+    statuses = await ReminderOutbox.all().values_list("status", flat=True)
+    assert statuses == [OutboxStatus.FAILED]
+
+
+async def test_handlers_save_only_the_fields_they_change(db, dispatcher, bot):
+    await dispatcher.feed_update(bot, message_update(7, "/start"))
+    # Cached by the middleware, then changed behind its back (another
+    # replica, a bulk update) without invalidating this process
+    await dispatcher.feed_update(bot, message_update(7, "/reminders"))
+    await User.filter(telegram_id=7).update(username="renamed", is_blocked=True)
+
+    await dispatcher.feed_update(bot, callback_update(7, "toggle_reminders"))
+
+    user = await User.get(telegram_id=7)
+    assert user.reminders_enabled
+    assert (user.username, user.is_blocked) == ("renamed", True)
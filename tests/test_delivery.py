@@ -0,0 +1,76 @@
+import pytest
+from aiogram.exceptions import (
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+from aiogram.methods import SendMessage
+
+from src.vibe_tracker_bot.database.models import User
+from src.vibe_tracker_bot.services.delivery import MessageDelivery
+
+pytestmark = pytest.mark.anyio
+
+
+def _times(bot, chat_id=None) -> list[float]:
+    return [
+        moment
+        for moment, method in bot.session.requests
+        if chat_id is None or method.chat_id == chat_id
+    ]
+
+
+async def test_global_rate_is_respected(bot):
+    delivery = MessageDelivery(bot, workers=16, global_rate=50, per_chat_rate=100)
+    report = await delivery.send(range(1, 101), "hi")
+
+    assert sorted(report.delivered) == list(range(1, 101))
+    # A full bucket lets the first 50 through at once, the rest at 50/s
+    assert report.elapsed >= 0.95
+    times = _times(bot)
+    for start in times:
+        assert sum(start <= t < start + 0.5 for t in times) <= 50 + 25 + 1
+
+
+async def test_per_chat_rate_is_respected(bot):
+    delivery = MessageDelivery(bot, workers=4, global_rate=1000, per_chat_rate=4)
+    await delivery.send([7] * 8, "hi")
+
+    times = _times(bot, 7)
+    assert len(times) == 8
+    # 4 at once from the full bucket, then one every 0.25s
+    assert times[-1] - times[0] >= 0.95
+
+
+async def test_flood_control_pauses_every_worker(bot):
+    method = SendMessage(chat_id=3, text="hi")
+    bot.session.errors[3] = [TelegramRetryAfter(method, "Flood control", 1)]
+    delivery = MessageDelivery(bot, workers=1, global_rate=1000)
+    report = await delivery.send([3, 4, 5], "hi")
+
+    assert sorted(report.delivered) == [3, 4, 5]
+    flood_at, *later = _times(bot)
+    assert all(t - flood_at >= 0.95 for t in later)
+    assert len(bot.session.sent("SendMessage")) == 4
+
+
+async def test_temporary_errors_are_retried(bot):
+    method = SendMessage(chat_id=6, text="hi")
+    bot.session.errors[6] = [TelegramServerError(method, "Bad Gateway")] * 2
+    delivery = MessageDelivery(bot, global_rate=1000, per_chat_rate=1000)
+    report = await delivery.send([6], "hi")
+
+    assert report.delivered == [6]
+    assert len(bot.session.sent("SendMessage")) == 3
+
+
+async def test_users_who_blocked_the_bot_are_marked(db, bot):
+    for telegram_id in (11, 12):
+        await User.create(telegram_id=telegram_id, reminders_enabled=True)
+    method = SendMessage(chat_id=12, text="hi")
+    bot.session.errors[12] = [TelegramForbiddenError(method, "bot was blocked")]
+    report = await MessageDelivery(bot, global_rate=1000).send([11, 12], "hi")
+
+    assert (report.delivered, report.blocked, report.failed) == ([11], [12], 0)
+    assert not (await User.get(telegram_id=11)).is_blocked
+    assert (await User.get(telegram_id=12)).is_blocked
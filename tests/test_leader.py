@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from src.vibe_tracker_bot.services.leader import RedisLease, run_as_leader
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def redis():
+    return FakeAsyncRedis()
+
+
+def test_short_ttl_is_refused(redis):
+    with pytest.raises(ValueError):
+        RedisLease(redis, ttl=30)
+
+
+async def test_lease_is_renewed_while_the_job_runs(redis):
+    lease = RedisLease(redis, key="lease")
+    lease.renew_interval = 0.01
+    assert await lease.acquire_or_renew()
+
+    async def job():
+        # Expires unless renewed in the meantime
+        await redis.pexpire("lease", 30)
+        await asyncio.sleep(0.1)
+        return "done"
+
+    assert await run_as_leader(lease, job())
+    assert await redis.get("lease") == lease.token.encode()
+
+
+async def test_job_is_cancelled_when_the_lease_is_lost(redis):
+    lease = RedisLease(redis, key="lease")
+    lease.renew_interval = 0.01
+    other = RedisLease(redis, key="lease")
+    assert await lease.acquire_or_renew()
+    cancelled = asyncio.Event()
+
+    async def job():
+        await redis.set("lease", other.token)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    assert not await run_as_leader(lease, job())
+    assert cancelled.is_set()
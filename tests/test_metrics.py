@@ -0,0 +1,54 @@
+import socket
+
+import pytest
+
+from src.vibe_tracker_bot.services import charts  # noqa: F401
+from src.vibe_tracker_bot.services import log_writer
+from src.vibe_tracker_bot.services.cache import TTLCache
+from src.vibe_tracker_bot.services.metrics import (
+    register_cache,
+    registry,
+    start_metrics_server,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_busy_port_does_not_stop_the_bot(caplog):
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        port = taken.getsockname()[1]
+
+        assert await start_metrics_server("127.0.0.1", port) is None
+    assert "Metrics server not started" in caplog.text
+
+
+def test_cache_stats_are_exported():
+    cache = TTLCache(max_items=10, ttl=60, sizeof=len)
+    register_cache("test", cache)
+    cache.set("key", b"png")
+    cache.get("key")
+    cache.get("other")
+
+    text = registry.render()
+    assert 'bot_cache_hits{cache="test"} 1' in text
+    assert 'bot_cache_misses{cache="test"} 1' in text
+    assert 'bot_cache_items{cache="test"} 1' in text
+    assert 'bot_cache_size{cache="test"} 3' in text
+    # Registered on import by the modules that own them
+    assert 'bot_cache_hits{cache="users"}' in text
+    assert 'bot_cache_hits{cache="chart_images"}' in text
+
+
+def test_log_writer_stats_are_exported(monkeypatch):
+    writer = log_writer.MoodLogWriter()
+    writer.batches, writer.written, writer.batch_size_max = 4, 10, 6
+    monkeypatch.setattr(log_writer, "mood_log_writer", writer)
+
+    text = registry.render()
+    assert "bot_log_writer_batches 4" in text
+    assert 'bot_log_writer_logs{result="written"} 10' in text
+    assert 'bot_log_writer_batch_size{stat="avg"} 2.5' in text
+    assert 'bot_log_writer_batch_size{stat="max"} 6' in text
+    assert "bot_log_writer_queue_depth 0" in text
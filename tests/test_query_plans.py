@@ -0,0 +1,87 @@
+"""
+The stats and chart queries must be served by the (user_id, created_at)
+index on mood_logs and the (user_id, local_date) one on the summaries,
+not by a scan of the whole table. Checked with EXPLAIN on both backends.
+"""
+
+import datetime
+
+import pytest
+
+from src.vibe_tracker_bot.database.models import MoodLog, User
+from src.vibe_tracker_bot.services import charts
+from src.vibe_tracker_bot.services.stats import get_weekly_stats
+from src.vibe_tracker_bot.services.summaries import rebuild_user_summaries
+
+pytestmark = pytest.mark.anyio
+
+# Table -> (index name in Postgres, second column of the index)
+INDEXES = {
+    "mood_logs": ("idx_mood_logs_user_id_c365f1", "created_at"),
+    # SQLite names the index of a UNIQUE constraint sqlite_autoindex_*
+    "daily_mood_summaries": ("uid_daily_mood__user_id_fc5328", "local_date"),
+}
+
+
+@pytest.fixture
+def recorded_selects(db, monkeypatch):
+    """SELECTs the code under test sends, with their parameters."""
+    queries = []
+    client = type(db)
+    for name in ("execute_query", "execute_query_dict"):
+        original = getattr(client, name)
+
+        def record(self, query, values=None, _original=original):
+            if query.lstrip().upper().startswith("SELECT"):
+                queries.append((query, values))
+            return _original(self, query, values)
+
+        monkeypatch.setattr(client, name, record)
+    return queries
+
+
+async def _uses_index(db, table: str, query: str, values) -> bool:
+    name, column = INDEXES[table]
+    if db.capabilities.dialect == "postgres":
+        # Tiny test tables are cheaper to scan, only the index choice matters
+        async with db._in_transaction() as conn:
+            await conn.execute_script("SET LOCAL enable_seqscan = off")
+            _, rows = await conn.execute_query("EXPLAIN " + query, values)
+        plan = "\n".join(row["QUERY PLAN"] for row in rows)
+        # Index Scan [Backward] using, Bitmap Index Scan on, Index Only Scan
+        return "Index" in plan and name in plan
+    _, rows = await db.execute_query("EXPLAIN QUERY PLAN " + query, values)
+    plan = "\n".join(row["detail"] for row in rows)
+    return "INDEX" in plan and f"(user_id=? AND {column}" in plan
+
+
+async def test_stats_and_chart_queries_use_the_indexes(db, recorded_selects):
+    user = await User.create(telegram_id=1, timezone="Europe/Berlin")
+    other = await User.create(telegram_id=2)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    await MoodLog.bulk_create(
+        [
+            MoodLog(user=owner, value=5, created_at=now - datetime.timedelta(hours=h))
+            for owner in (user, other)
+            for h in range(0, 24 * 40, 7)
+        ]
+    )
+    await rebuild_user_summaries(user)
+    recorded_selects.clear()
+
+    await get_weekly_stats(user)
+    for period, load in (
+        ("day", charts._load_raw_points),
+        ("week", charts._load_daily_averages),
+        ("month", charts._load_calendar_days),
+    ):
+        await load(await charts.prepare_mood_chart(user, period))
+
+    checked = set()
+    for query, values in recorded_selects:
+        table = next((t for t in INDEXES if f'FROM "{t}"' in query), None)
+        if table is None:
+            continue
+        assert await _uses_index(db, table, query, values), query
+        checked.add(table)
+    assert checked == set(INDEXES)
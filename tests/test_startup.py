@@ -0,0 +1,102 @@
+import asyncio
+import socket
+
+import pytest
+
+from bot_api import message_update
+from src.vibe_tracker_bot import main
+from src.vibe_tracker_bot.services import metrics
+from src.vibe_tracker_bot.services.chart_renderer import ChartRenderService
+from src.vibe_tracker_bot.services.leader import LocalLease
+from src.vibe_tracker_bot.startup_profile import StartupProfile
+
+pytestmark = pytest.mark.anyio
+
+# A slow Telegram and a slow database, each answer takes this long
+TELEGRAM_LATENCY = 0.3
+DB_CONNECT_LATENCY = 0.3
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class RecordingLease(LocalLease):
+    def __init__(self):
+        self.released_while_scheduling = None
+
+    async def release(self) -> None:
+        scheduler = self.dispatcher["scheduler"]
+        self.released_while_scheduling = scheduler.running
+
+
+@pytest.fixture
+def startup(db, dispatcher, monkeypatch):
+    """
+    Startup hooks with the test database: connecting only waits (the `db`
+    fixture has connected already) and closing is left to the fixture.
+    """
+    profile = StartupProfile()
+    monkeypatch.setattr(main, "startup_profile", profile)
+    # Render workers are spawned for real, with the quick backend
+    monkeypatch.setenv("CHART_BACKEND", "pillow")
+    monkeypatch.setattr(main, "chart_render_service", ChartRenderService(workers=1))
+
+    async def connect_db():
+        await asyncio.sleep(DB_CONNECT_LATENCY)
+
+    async def close_db():
+        pass
+
+    monkeypatch.setattr(main, "init_db", connect_db)
+    monkeypatch.setattr(main, "close_db", close_db)
+    port = _free_port()
+    monkeypatch.setattr(
+        main,
+        "start_metrics_server",
+        lambda: metrics.start_metrics_server("127.0.0.1", port),
+    )
+    yield profile
+    # The dispatcher is shared by the tests of the session
+    for key in ("scheduler", "metrics_runner"):
+        dispatcher.workflow_data.pop(key, None)
+
+
+async def test_startup_takes_updates_within_the_budget(
+    startup, dispatcher, bot, caplog
+):
+    bot.session.latency = TELEGRAM_LATENCY
+    lease = LocalLease()
+    try:
+        await main.on_startup(dispatcher, bot, lease)
+        await main.on_ready()
+        # The first user waits for the startup and for this answer
+        await dispatcher.feed_update(bot, message_update(1, "/start"))
+    finally:
+        await main.on_shutdown(dispatcher, lease)
+
+    assert bot.session.sent("SendMessage")
+    assert startup.ready_after < startup.first_update_after
+    assert startup.first_update_after < main.STARTUP_BUDGET_SECONDS
+    assert "over the" not in caplog.text
+    # The metrics server starts while the DB connects, the command list is
+    # sent while the scheduler starts, and nothing waits for chart workers
+    assert startup.ready_after < DB_CONNECT_LATENCY + TELEGRAM_LATENCY + 0.5
+    assert bot.session.sent("SetMyCommands")
+    assert set(startup.steps) >= {"init_db", "metrics_server", "set_commands"}
+
+
+async def test_shutdown_stops_the_scheduler_before_releasing_the_lease(
+    startup, dispatcher, bot
+):
+    lease = RecordingLease()
+    lease.dispatcher = dispatcher
+    await main.on_startup(dispatcher, bot, lease)
+    scheduler = dispatcher["scheduler"]
+    assert scheduler.running
+
+    await main.on_shutdown(dispatcher, lease)
+    assert lease.released_while_scheduling is False
+    assert not scheduler.running
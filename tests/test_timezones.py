@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from src.vibe_tracker_bot.services.timezones import (
+    SUGGESTIONS_LIMIT,
+    resolve_timezone,
+    suggest_timezones,
+    to_local_times,
+)
+
+UTC = timezone.utc
+
+# DST shifts of an hour both ways, by 30 minutes (Lord Howe), at 02:45
+# (Chatham), around Ramadan (Casablanca) and in the southern hemisphere
+ZONES = [
+    "Europe/Berlin",
+    "America/New_York",
+    "Australia/Sydney",
+    "America/Santiago",
+    "Australia/Lord_Howe",
+    "Pacific/Chatham",
+    "Africa/Casablanca",
+    "Asia/Kolkata",
+]
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+END = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _expected(moments, tz):
+    return [moment.astimezone(tz).replace(tzinfo=None) for moment in moments]
+
+
+def _transitions(tz) -> list[datetime]:
+    """UTC moments where the offset changes, found by a brute-force scan."""
+    found = []
+    moment = START
+    offset = moment.astimezone(tz).utcoffset()
+    while moment < END:
+        step = moment + timedelta(minutes=15)
+        if step.astimezone(tz).utcoffset() != offset:
+            while step.astimezone(tz).utcoffset() != offset:
+                step -= timedelta(seconds=1)
+            found.append(step + timedelta(seconds=1))
+            offset = found[-1].astimezone(tz).utcoffset()
+            step = found[-1]
+        moment = step
+    return found
+
+
+@pytest.mark.parametrize("name", ZONES)
+def test_matches_astimezone_around_every_transition(name):
+    tz = ZoneInfo(name)
+    transitions = _transitions(tz)
+    if name != "Asia/Kolkata":
+        assert transitions
+    moments = [
+        transition + timedelta(seconds=delta)
+        for transition in transitions
+        for delta in (-3601, -1, -0.5, 0, 0.5, 1, 1799, 3600)
+    ]
+    # And a sweep over the whole range, unsorted
+    moments += [START + timedelta(minutes=97 * i) for i in range(11_000)][::-1]
+
+    expected = _expected(moments, tz)
+    assert to_local_times(moments, tz).tolist() == expected
+
+    naive = [moment.replace(tzinfo=None) for moment in moments]
+    assert to_local_times(naive, tz).tolist() == expected
+
+    array = np.array(naive, dtype="datetime64[us]")
+    assert to_local_times(array, tz).tolist() == expected
+
+
+def test_empty_input():
+    assert to_local_times([], ZoneInfo("Europe/Berlin")).tolist() == []
+
+
+# --- Resolving typed timezones ---
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Europe/Berlin", "Europe/Berlin"),
+        ("  europe/berlin ", "Europe/Berlin"),
+        ("America/Argentina/Buenos_Aires", "America/Argentina/Buenos_Aires"),
+        ("UTC", "UTC"),
+        # Old aliases stay valid when typed in full
+        ("US/Eastern", "US/Eastern"),
+        ("Etc/GMT-3", "Etc/GMT-3"),
+    ],
+)
+def test_exact_names(text, expected):
+    assert resolve_timezone(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("msk", "Europe/Moscow"),
+        ("Moscow", "Europe/Moscow"),
+        ("kiev", "Europe/Kyiv"),
+        ("gmt", "UTC"),
+        ("new york", "America/New_York"),
+        ("New_York", "America/New_York"),
+        ("buenos aires", "America/Argentina/Buenos_Aires"),
+        # A part of a name that matches only one timezone
+        ("york", "America/New_York"),
+    ],
+)
+def test_city_aliases(text, expected):
+    assert resolve_timezone(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, hours",
+    [
+        ("UTC+3", 3),
+        ("GMT+3", 3),
+        ("gmt + 3", 3),
+        ("+3", 3),
+        ("UTC+03:00", 3),
+        ("utc-5", -5),
+        ("UTC-12", -12),
+        ("UTC+14", 14),
+        ("UTC+0", 0),
+    ],
+)
+def test_utc_offsets(text, hours):
+    name = resolve_timezone(text)
+    assert name is not None
+    # Etc/GMT+3 is UTC-3, the offset must be the one typed
+    assert ZoneInfo(name).utcoffset(datetime(2025, 1, 1)) == timedelta(hours=hours)
+
+
+@pytest.mark.parametrize("text", ["UTC+5:30", "UTC+15", "+0530"])
+def test_offsets_without_a_fixed_zone(text):
+    assert resolve_timezone(text) is None
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Berln", "Europe/Berlin"),
+        ("Moskow", "Europe/Moscow"),
+        ("Londn", "Europe/London"),
+        ("Warsw", "Europe/Warsaw"),
+    ],
+)
+def test_typos_are_suggested(text, expected):
+    assert resolve_timezone(text) is None
+    assert expected in suggest_timezones(text)
+
+
+def test_suggestions_are_current_names_and_limited():
+    suggestions = suggest_timezones("a")
+    assert len(suggestions) == SUGGESTIONS_LIMIT
+    # "msk" is close to Omsk and Tomsk, never to old aliases like W-SU
+    assert all("/" in name or name == "UTC" for name in suggest_timezones("msk"))
+
+
+@pytest.mark.parametrize("text", ["", "   ", "qwertyzz", "Atlantis"])
+def test_unknown_input(text):
+    assert resolve_timezone(text) is None
+    assert suggest_timezones(text) == []
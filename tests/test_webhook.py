@@ -0,0 +1,106 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from aiogram import Dispatcher
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.vibe_tracker_bot.webhook import BoundedRequestHandler
+
+pytestmark = pytest.mark.anyio
+
+SECRET = "s3cret"
+# Updates as Telegram posts them: a command, a button press, a text reply
+RECORDED_UPDATES = json.loads(
+    (Path(__file__).parent / "data" / "webhook_updates.json").read_text("utf-8")
+)
+
+
+class Recorder:
+    """Dispatcher handlers that record updates and the peak concurrency."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.received: list[str] = []
+        self.active = self.peak = 0
+        self.dispatcher = Dispatcher()
+        self.dispatcher.message()(self._handle)
+        self.dispatcher.callback_query()(self._handle)
+
+    async def _handle(self, event) -> None:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            self.received.append(getattr(event, "text", None) or event.data)
+        finally:
+            self.active -= 1
+
+    async def wait_for(self, count: int) -> None:
+        while len(self.received) < count:
+            await asyncio.sleep(0.01)
+
+
+async def _client(recorder: Recorder, bot, max_concurrency: int) -> TestClient:
+    app = web.Application()
+    BoundedRequestHandler(
+        dispatcher=recorder.dispatcher,
+        bot=bot,
+        secret_token=SECRET,
+        max_concurrency=max_concurrency,
+    ).register(app, path="/webhook")
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    return client
+
+
+def _post(client: TestClient, update: dict, secret: str | None = SECRET):
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret else {}
+    return client.post("/webhook", json=update, headers=headers)
+
+
+async def test_recorded_updates_are_dispatched(bot):
+    recorder = Recorder()
+    client = await _client(recorder, bot, max_concurrency=4)
+    try:
+        for update in RECORDED_UPDATES:
+            response = await _post(client, update)
+            assert response.status == 200
+        await asyncio.wait_for(recorder.wait_for(len(RECORDED_UPDATES)), 5)
+    finally:
+        await client.close()
+
+    assert sorted(recorder.received) == sorted(["/log", "rate:7", "выспалась наконец"])
+
+
+@pytest.mark.parametrize("secret", [None, "wrong"])
+async def test_requests_without_the_secret_are_rejected(bot, secret):
+    recorder = Recorder()
+    client = await _client(recorder, bot, max_concurrency=4)
+    try:
+        response = await _post(client, RECORDED_UPDATES[0], secret)
+        await asyncio.sleep(0.05)
+    finally:
+        await client.close()
+
+    assert response.status == 401
+    assert recorder.received == []
+
+
+async def test_concurrency_is_bounded(bot):
+    recorder = Recorder(delay=0.1)
+    client = await _client(recorder, bot, max_concurrency=2)
+    updates = [
+        {**RECORDED_UPDATES[2], "update_id": RECORDED_UPDATES[2]["update_id"] + i}
+        for i in range(8)
+    ]
+    try:
+        responses = await asyncio.gather(*(_post(client, u) for u in updates))
+        await asyncio.wait_for(recorder.wait_for(len(updates)), 5)
+    finally:
+        await client.close()
+
+    assert [r.status for r in responses] == [200] * 8
+    assert recorder.peak == 2